@@ -0,0 +1,96 @@
+"""
+Memory per edge of ArrayGraph against nx.DiGraph on the synthetic datasets.
+
+For each dataset, builds the graph with create_graph_from_df(engine="columnar")
+and with ArrayGraph.from_dataframe, and reports the memory held by the result
+and the peak while building it (both from tracemalloc), per edge, along with
+build and networkx_to_jsonl export times.
+
+    python benchmarks/bench_array_graph.py --rows 1000000
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import tempfile
+import time
+import tracemalloc
+
+from generators import GENERATORS
+
+from turingdb_examples.graph import ArrayGraph, create_graph_from_df, networkx_to_jsonl
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        graph = build()
+    seconds = time.perf_counter() - start
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return graph, seconds, held, peak
+
+
+def export_seconds(graph, spec):
+    with tempfile.TemporaryDirectory() as data_dir:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            networkx_to_jsonl(
+                graph,
+                "bench",
+                node_type_key=spec["node_type_key"],
+                edge_type_key=spec["edge_type_key"],
+                data_dir=data_dir,
+            )
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--datasets", nargs="+", choices=GENERATORS, default=list(GENERATORS)
+    )
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{'dataset':<12}{'graph':<12}{'edges':>12}{'B/edge':>10}"
+        f"{'peak B/edge':>13}{'build (s)':>11}{'export (s)':>12}"
+    )
+    for dataset in args.datasets:
+        df, spec = GENERATORS[dataset](args.rows, seed=args.seed)
+        builders = {
+            "networkx": lambda df=df, spec=spec: create_graph_from_df(
+                df, engine="columnar", **spec["graph_kwargs"]
+            ),
+            "array": lambda df=df, spec=spec: ArrayGraph.from_dataframe(
+                df, **spec["graph_kwargs"]
+            ),
+        }
+        for name, build in builders.items():
+            graph, seconds, held, peak = measure(build)
+            n_edges = max(graph.number_of_edges(), 1)
+            print(
+                f"{dataset:<12}{name:<12}{graph.number_of_edges():>12,}"
+                f"{held / n_edges:>10,.0f}{peak / n_edges:>13,.0f}"
+                f"{seconds:>11.2f}{export_seconds(graph, spec):>12.2f}"
+            )
+            if isinstance(graph, ArrayGraph):
+                usage = graph.memory_usage()
+                print(
+                    "    "
+                    + ", ".join(
+                        f"{part} {size / 1e6:,.1f} MB"
+                        for part, size in usage.items()
+                        if part not in ("total", "bytes_per_edge")
+                    )
+                )
+            del graph
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Per-edge vs bulk edge statements from build_create_command_from_networkx.
+
+Builds a seeded random graph (100k edges by default) with a few node labels and
+relationship types, then reports build time, statement count and text size of
+the edge statements in both modes.
+
+    python benchmarks/bench_create_command.py --edges 100000
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+import networkx as nx
+import numpy as np
+
+from turingdb_examples.graph import build_create_command_from_networkx
+
+
+def make_graph(n_nodes, n_edges, seed=0):
+    rng = np.random.default_rng(seed)
+    labels = np.array(["person", "company", "bank_account"])
+    rel_types = np.array(["owns", "works_for", "transfers_to"])
+
+    G = nx.DiGraph()
+    node_labels = rng.choice(labels, size=n_nodes)
+    for i, label in enumerate(node_labels.tolist()):
+        G.add_node(f"node_{i}", kind=label, score=float(i % 97))
+
+    while G.number_of_edges() < n_edges:
+        missing = n_edges - G.number_of_edges()
+        sources = rng.integers(0, n_nodes, size=missing)
+        targets = rng.integers(0, n_nodes, size=missing)
+        kinds = rng.choice(rel_types, size=missing)
+        amounts = rng.random(size=missing) * 1000
+        for s, t, kind, amount in zip(
+            sources.tolist(), targets.tolist(), kinds.tolist(), amounts.tolist()
+        ):
+            if s != t:
+                G.add_edge(f"node_{s}", f"node_{t}", rel=kind, amount=round(amount, 2))
+    return G
+
+
+def measure(G, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        commands = build_create_command_from_networkx(
+            G, node_type_key="kind", edge_type_key="rel", **kwargs
+        )
+    elapsed = time.perf_counter() - start
+    edge_lines = [line for line in commands.split("\n") if line.startswith("MATCH")]
+    return {
+        "seconds": elapsed,
+        "statements": len(edge_lines),
+        "megabytes": sum(len(line.encode("utf-8")) for line in edge_lines) / 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=20_000)
+    parser.add_argument("--edges", type=int, default=100_000)
+    parser.add_argument("--max-size-mb", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    G = make_graph(args.nodes, args.edges, seed=args.seed)
+    print(f"Graph: {G.number_of_nodes():,} nodes, {G.number_of_edges():,} edges")
+
+    per_edge = measure(G)
+    bulk = measure(G, bulk_edges=True, max_size_mb=args.max_size_mb)
+
+    print(f"{'mode':<10}{'build (s)':>12}{'statements':>14}{'edge MB':>12}")
+    for mode, result in (("per-edge", per_edge), ("bulk", bulk)):
+        print(
+            f"{mode:<10}{result['seconds']:>12.2f}{result['statements']:>14,}"
+            f"{result['megabytes']:>12.1f}"
+        )
+    print(
+        f"Statements: {per_edge['statements'] / max(bulk['statements'], 1):,.0f}x fewer, "
+        f"text: {per_edge['megabytes'] / max(bulk['megabytes'], 1e-9):.1f}x smaller"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+encode_parallel against a single-process model.encode.
+
+Embeds synthetic sentences of varied lengths (5 to 200 words, log-normal) with
+one model.encode(texts, batch_size=...) call in this process, then with
+encode_parallel for each number of workers, and reports sentences/s, the
+speedup and the largest difference between the two sets of embeddings.
+
+Without --model, the model is StandInModel: a CPU-bound stand-in for a
+SentenceTransformer (hashed token embeddings, two dense layers over the padded
+batch, mean pooling), which sorts its input by length like
+SentenceTransformer.encode does. It runs on NumPy alone, so the benchmark does
+not need sentence_transformers or a model download. Its BLAS threads are not
+capped per worker the way _init_encode_worker caps torch's.
+
+    python benchmarks/bench_encode.py --texts 20k --workers 1 2 4
+    python benchmarks/bench_encode.py --model all-MiniLM-L6-v2 --texts 20k
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import os
+import time
+import zlib
+
+import numpy as np
+
+from bench_graph import parse_size
+
+
+class StandInModel:
+    """
+    NumPy stand-in for a SentenceTransformer, with the same encode signature
+    and a cost that grows with batch size times the longest text of the batch.
+    """
+
+    def __init__(
+        self, dimension=384, hidden=1536, vocab_size=8192, max_tokens=256, seed=0
+    ):
+        rng = np.random.default_rng(seed)
+        self.max_tokens = max_tokens
+        self.vocab_size = vocab_size
+        self.embeddings = rng.standard_normal((vocab_size, dimension), np.float32)
+        self.w1 = rng.standard_normal((dimension, hidden), np.float32)
+        self.w1 /= np.sqrt(dimension)
+        self.w2 = rng.standard_normal((hidden, dimension), np.float32)
+        self.w2 /= np.sqrt(hidden)
+
+    def _token_ids(self, text):
+        # crc32 rather than hash(): the same in every worker process
+        return [
+            zlib.crc32(word.encode()) % self.vocab_size
+            for word in text.split()[: self.max_tokens]
+        ]
+
+    def encode(self, texts, batch_size=32):
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        out = np.empty((len(texts), self.embeddings.shape[1]), np.float32)
+        for start in range(0, len(texts), batch_size):
+            rows = order[start : start + batch_size]
+            tokens = [self._token_ids(texts[i]) for i in rows]
+            width = max(1, max(len(ids) for ids in tokens))
+            ids = np.zeros((len(rows), width), np.int64)
+            mask = np.zeros((len(rows), width), np.float32)
+            for i, token_ids in enumerate(tokens):
+                ids[i, : len(token_ids)] = token_ids
+                mask[i, : len(token_ids)] = 1
+            hidden = np.maximum(self.embeddings[ids] @ self.w1, 0) @ self.w2
+            pooled = (hidden * mask[..., None]).sum(axis=1)
+            pooled /= np.maximum(mask.sum(axis=1, keepdims=True), 1)
+            norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+            out[rows] = pooled / np.maximum(norms, 1e-12)
+        return out
+
+
+def make_texts(n_texts, seed=0):
+    """Sentences of 5 to 200 words drawn from a 20,000-word vocabulary."""
+    rng = np.random.default_rng(seed)
+    words = np.array([f"w{i}" for i in range(20_000)])
+    lengths = np.clip(rng.lognormal(3.0, 0.8, n_texts).astype(int), 5, 200)
+    return [" ".join(rng.choice(words, length)) for length in lengths]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--texts", default="10k")
+    parser.add_argument(
+        "--workers", nargs="+", type=int, default=sorted({1, os.cpu_count() or 1})
+    )
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from turingdb_examples.embeddings import _load_model, encode_parallel
+
+    texts = make_texts(parse_size(args.texts), args.seed)
+    model = args.model or functools.partial(StandInModel, seed=args.seed)
+    name = args.model or "StandInModel"
+    print(f"{len(texts):,} texts, {name}, {os.cpu_count()} CPUs")
+
+    encoder = _load_model(model, "cpu")
+    start = time.perf_counter()
+    expected = np.asarray(encoder.encode(texts, batch_size=args.batch_size))
+    baseline = time.perf_counter() - start
+
+    print(
+        f"{'method':<24}{'seconds':>10}{'sentences/s':>14}"
+        f"{'speedup':>10}{'max diff':>10}"
+    )
+    print(
+        f"{'model.encode':<24}{baseline:>10.2f}"
+        f"{len(texts) / baseline:>14,.0f}{1:>9.1f}x"
+    )
+    for n_workers in args.workers:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            vectors = encode_parallel(
+                texts, model, n_workers=n_workers, batch_size=args.batch_size
+            )
+        elapsed = time.perf_counter() - start
+        diff = float(np.abs(vectors - expected).max())
+        print(
+            f"{f'encode_parallel({n_workers})':<24}{elapsed:>10.2f}"
+            f"{len(texts) / elapsed:>14,.0f}{baseline / elapsed:>9.1f}x{diff:>10.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+create_graph_from_df: the columnar engine against the row-by-row one.
+
+Builds the graph of each dataset and size from generators.py with
+engine="rows" and engine="columnar", each in a fresh process, and reports the
+best wall time, peak RSS and speedup. With --check, the two graphs are also
+compared (node and edge order, attributes) in this process.
+
+    python benchmarks/bench_engines.py --datasets paysim healthcare --sizes 100k 1M
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+
+from bench_graph import _measure_in_child, parse_size
+from generators import GENERATORS
+
+ENGINES = ("rows", "columnar")
+
+
+def same_graph(dataset, n_rows, seed=0):
+    """Whether both engines build the same graph, orders and attributes included."""
+    from turingdb_examples.graph import create_graph_from_df
+
+    df, spec = GENERATORS[dataset](n_rows, seed=seed)
+    graphs = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for engine in ENGINES:
+            graphs.append(
+                create_graph_from_df(df, engine=engine, **spec["graph_kwargs"])
+            )
+    rows, columnar = graphs
+    return list(rows.nodes(data=True)) == list(columnar.nodes(data=True)) and list(
+        rows.edges(data=True)
+    ) == list(columnar.edges(data=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--datasets", nargs="+", choices=GENERATORS, default=["paysim", "healthcare"]
+    )
+    parser.add_argument("--sizes", nargs="+", default=["100k"])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(
+        f"{'dataset':<12}{'rows':>12}{'engine':>10}{'seconds':>10}"
+        f"{'peak MB':>10}{'speedup':>10}"
+    )
+    for dataset in args.datasets:
+        for size in args.sizes:
+            n_rows = parse_size(size)
+            seconds = {}
+            for engine in ENGINES:
+                job = (
+                    dataset,
+                    n_rows,
+                    "create_graph_from_df",
+                    engine,
+                    args.repeat,
+                    args.seed,
+                )
+                with context.Pool(1, maxtasksperchild=1) as pool:
+                    result = pool.apply(_measure_in_child, (job,))
+                seconds[engine] = result["seconds"]
+                print(
+                    f"{dataset:<12}{n_rows:>12,}{engine:>10}"
+                    f"{result['seconds']:>10.2f}{result['peak_rss_mb']:>10,.0f}"
+                    f"{seconds['rows'] / result['seconds']:>9.1f}x"
+                )
+            if args.check:
+                same = same_graph(dataset, n_rows, args.seed)
+                print(f"{dataset:<12}{n_rows:>12,}  identical graphs: {same}")
+
+
+if __name__ == "__main__":
+    main()
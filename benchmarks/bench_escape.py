@@ -0,0 +1,101 @@
+"""
+Cypher string escaping: the shared translate-table encoder against the
+per-value escaping it replaced.
+
+Escapes n values (10M by default) of a low-cardinality column (blood types,
+transaction types) and of a unique-valued one (IDs and free text with quotes),
+value by value and as a whole pd.Series, and reports values/s.
+
+    python benchmarks/bench_escape.py --values 10000000
+"""
+
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from turingdb_examples.escaping import escape_series, escape_value
+
+
+def replace_chain(value):
+    """utils.escape_for_cypher before the shared encoder."""
+    if pd.isna(value):
+        return ""
+    if not isinstance(value, str):
+        return str(value)
+    value = value.replace("\\", "\\\\")
+    value = value.replace('"', '\\"')
+    value = value.replace("\n", "\\n")
+    value = value.replace("\r", "\\r")
+    value = value.replace("\t", "\\t")
+    return value
+
+
+def regex_sanitize(value):
+    """escape_value of build_create_command_from_networkx before the shared encoder."""
+    value_str = str(value)
+    value_str = value_str.replace('"', '\\"')
+    value_str = value_str.replace("\n", " ")
+    value_str = value_str.replace("\r", " ")
+    value_str = value_str.replace("\t", " ")
+    value_str = value_str.replace("\\", "")
+    value_str = re.sub(
+        r"[^\w\s\-\.\,\:\;\(\)\[\]\{\}\/\@\#\$\%\&\*\+\=\<\>\?\!\~\`\|\\]",
+        " ",
+        value_str,
+    )
+    return re.sub(r"\s+", " ", value_str).strip()
+
+
+def make_columns(n_values, seed=0):
+    rng = np.random.default_rng(seed)
+    categories = np.array(
+        ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-", "CASH_IN", "TRANSFER"]
+    )
+    category = pd.Series(categories[rng.integers(0, len(categories), n_values)])
+    notes = np.array(['said "hi"', "line\nbreak", "C:\\path", "plain text"])
+    unique = (
+        "ID"
+        + pd.Series(np.arange(n_values)).astype(str)
+        + " "
+        + notes[rng.integers(0, len(notes), n_values)]
+    )
+    return {"category": category.astype(object), "unique": unique.astype(object)}
+
+
+def rate(func, values):
+    start = time.perf_counter()
+    func(values)
+    return len(values) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--values", type=int, default=10_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    columns = make_columns(args.values, args.seed)
+    encoders = {
+        "replace chain": lambda s: [replace_chain(v) for v in s.tolist()],
+        "regex sanitize": lambda s: [regex_sanitize(v) for v in s.tolist()],
+        "escape_value": lambda s: [escape_value(v) for v in s.tolist()],
+        "escape_series": escape_series,
+    }
+
+    print(f"{'column':<12}{'encoder':<18}{'values/s':>16}{'speedup':>10}")
+    for name, values in columns.items():
+        baseline = None
+        for encoder, func in encoders.items():
+            per_second = rate(func, values)
+            baseline = baseline or per_second
+            print(
+                f"{name:<12}{encoder:<18}{per_second:>16,.0f}"
+                f"{per_second / baseline:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
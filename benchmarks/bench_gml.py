@@ -0,0 +1,113 @@
+"""
+GML to JSONL: the streaming gml_to_jsonl against nx.read_gml + networkx_to_jsonl.
+
+Writes a synthetic Reactome-like GML file (pathway entities and reactions with
+string attributes, like reactome/entities_pairwise.gml) of each size, then
+converts it both ways, each in a fresh process, and reports the time and the
+peak RSS of the conversion.
+
+    python benchmarks/bench_gml.py --sizes 10k 100k 1M
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from bench_graph import _peak_rss_mb, _reset_peak_rss, parse_size
+
+SCHEMA_CLASSES = (
+    "Reaction",
+    "Complex",
+    "BlackBoxEvent",
+    "EntityWithAccessionedSequence",
+)
+CATEGORIES = ("binding", "transition", "omitted", "dissociation")
+
+
+def write_gml(path, n_nodes, seed=0):
+    """Reactome-like multigraph of n_nodes nodes and 1.5 * n_nodes edges."""
+    rng = np.random.default_rng(seed)
+    classes = rng.integers(0, len(SCHEMA_CLASSES), n_nodes)
+    categories = rng.integers(0, len(CATEGORIES), n_nodes)
+    n_edges = n_nodes + n_nodes // 2
+    sources = rng.integers(0, n_nodes, n_edges)
+    targets = rng.integers(0, n_nodes, n_edges)
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("graph [\n  multigraph 1\n")
+        for i in range(n_nodes):
+            name = f"Entity {i} binds the promoter [nucleoplasm]"
+            f.write(
+                "  node [\n"
+                f"    id {i}\n"
+                f'    label "{name}"\n'
+                f'    schemaClass "{SCHEMA_CLASSES[classes[i]]}"\n'
+                f'    stId "R-HSA-{i}"\n'
+                f'    releaseDate "2016-03-23"\n'
+                f"    name \"['{name}']\"\n"
+                f'    stIdVersion "R-HSA-{i}.1"\n'
+                f'    speciesName "Homo sapiens"\n'
+                f'    category "{CATEGORIES[categories[i]]}"\n'
+                f'    displayName "{name}"\n'
+                "  ]\n"
+            )
+        for source, target in zip(sources.tolist(), targets.tolist()):
+            f.write(f"  edge [\n    source {source}\n    target {target}\n  ]\n")
+        f.write("]\n")
+
+
+def convert(method, path, out_dir):
+    """Run one conversion; returns (seconds, peak RSS in MB, relationships written)."""
+    import networkx as nx
+
+    from turingdb_examples.graph import gml_to_jsonl, networkx_to_jsonl
+
+    _reset_peak_rss()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if method == "read_gml":
+            G = nx.read_gml(path)
+            networkx_to_jsonl(G, method, node_type_key="schemaClass", data_dir=out_dir)
+        else:
+            gml_to_jsonl(path, method, node_type_key="schemaClass", data_dir=out_dir)
+    elapsed = time.perf_counter() - start
+    with open(os.path.join(out_dir, f"{method}.jsonl"), encoding="utf-8") as f:
+        n_edges = sum('"type": "relationship"' in line for line in f)
+    return elapsed, _peak_rss_mb(), n_edges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="+", default=["10k", "100k"])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'nodes':>10}{'method':>14}{'seconds':>10}{'peak MB':>10}{'speedup':>10}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for size in args.sizes:
+            n_nodes = parse_size(size)
+            path = os.path.join(out_dir, "graph.gml")
+            write_gml(path, n_nodes, args.seed)
+            baseline = None
+            for method in ("read_gml", "gml_to_jsonl"):
+                with context.Pool(1) as pool:
+                    elapsed, peak, n_edges = pool.apply(
+                        convert, (method, path, out_dir)
+                    )
+                baseline = baseline or elapsed
+                print(
+                    f"{n_nodes:>10,}{method:>14}{elapsed:>10.2f}{peak:>10.0f}"
+                    f"{baseline / elapsed:>9.1f}x"
+                )
+            assert n_edges == n_nodes + n_nodes // 2
+
+
+if __name__ == "__main__":
+    main()
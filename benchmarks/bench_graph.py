@@ -0,0 +1,257 @@
+"""
+Throughput and memory of the graph module on synthetic datasets.
+
+Runs create_graph_from_df, networkx_to_jsonl, build_create_command_from_networkx
+and split_cypher_commands on the PaySim, ORBITAAL and healthcare generators from
+generators.py, at each size. Every (dataset, size, stage) is measured in a fresh
+process, so peak RSS is that of the stage alone (plus its inputs). Results are
+written as JSON; with --baseline, they are compared to a stored run and the
+script exits with status 1 if any stage got slower or bigger than the tolerance.
+
+    python benchmarks/bench_graph.py --sizes 10k 100k --output results.json
+    python benchmarks/bench_graph.py --sizes 10k 100k --baseline results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+from generators import GENERATORS
+
+STAGES = (
+    "create_graph_from_df",
+    "networkx_to_jsonl",
+    "build_create_command_from_networkx",
+    "split_cypher_commands",
+)
+SIZES = ("10k", "100k", "1M", "10M")
+
+
+def parse_size(size):
+    """'10k' -> 10_000, '1M' -> 1_000_000, '2500' -> 2500."""
+    multipliers = {"k": 1_000, "m": 1_000_000}
+    suffix = size[-1].lower()
+    if suffix in multipliers:
+        return int(float(size[:-1]) * multipliers[suffix])
+    return int(size)
+
+
+def _reset_peak_rss():
+    """Reset the kernel's peak RSS counter; False where not supported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _run_stage(stage, df, spec, G, commands, out_dir, engine):
+    from turingdb_examples import graph
+
+    if stage == "create_graph_from_df":
+        return graph.create_graph_from_df(df, engine=engine, **spec["graph_kwargs"])
+    if stage == "networkx_to_jsonl":
+        return graph.networkx_to_jsonl(
+            G,
+            "bench",
+            node_type_key=spec["node_type_key"],
+            edge_type_key=spec["edge_type_key"],
+            data_dir=out_dir,
+        )
+    if stage == "build_create_command_from_networkx":
+        return graph.build_create_command_from_networkx(
+            G,
+            node_type_key=spec["node_type_key"],
+            edge_type_key=spec["edge_type_key"],
+        )
+    return graph.split_cypher_commands(commands)
+
+
+def measure(dataset, n_rows, stage, engine="columnar", repeat=1, seed=0):
+    """Best wall time and peak RSS of one stage; run it in a fresh process."""
+    from turingdb_examples import graph
+
+    df, spec = GENERATORS[dataset](n_rows, seed=seed)
+    G = commands = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        if stage != "create_graph_from_df":
+            G = graph.create_graph_from_df(df, engine=engine, **spec["graph_kwargs"])
+        if stage == "split_cypher_commands":
+            commands = graph.build_create_command_from_networkx(
+                G,
+                node_type_key=spec["node_type_key"],
+                edge_type_key=spec["edge_type_key"],
+            )
+
+    rss_before = _peak_rss_mb()
+    peak_reset = _reset_peak_rss()
+    timings = []
+    with tempfile.TemporaryDirectory() as out_dir:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = _run_stage(stage, df, spec, G, commands, out_dir, engine)
+            timings.append(time.perf_counter() - start)
+            del result
+    seconds = min(timings)
+
+    if stage == "create_graph_from_df":
+        with contextlib.redirect_stdout(io.StringIO()):
+            G = graph.create_graph_from_df(df, engine=engine, **spec["graph_kwargs"])
+    return {
+        "dataset": dataset,
+        "size": n_rows,
+        "stage": stage,
+        "seconds": seconds,
+        "rows": len(df),
+        "rows_per_s": len(df) / max(seconds, 1e-9),
+        "nodes": G.number_of_nodes(),
+        "edges": G.number_of_edges(),
+        "peak_rss_mb": _peak_rss_mb(),
+        # Without a resettable counter the peak may predate the stage
+        "peak_rss_includes_setup": not peak_reset,
+        "setup_rss_mb": rss_before,
+    }
+
+
+def _measure_in_child(args):
+    return measure(*args)
+
+
+def compare(results, baseline, time_tolerance, rss_tolerance, min_seconds=0.05):
+    """
+    Regressions of results against baseline, as printable strings.
+
+    Slowdowns smaller than min_seconds are ignored: short stages are too noisy
+    for a relative tolerance alone.
+    """
+    previous = {(r["dataset"], r["size"], r["stage"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = previous.get((result["dataset"], result["size"], result["stage"]))
+        if old is None:
+            continue
+        name = f"{result['dataset']}/{result['size']:,}/{result['stage']}"
+        time_ratio = result["seconds"] / max(old["seconds"], 1e-9)
+        slower_by = result["seconds"] - old["seconds"]
+        if time_ratio > 1 + time_tolerance and slower_by >= min_seconds:
+            regressions.append(
+                f"{name}: {old['seconds']:.2f}s -> {result['seconds']:.2f}s "
+                f"({time_ratio:.2f}x)"
+            )
+        rss_ratio = result["peak_rss_mb"] / max(old["peak_rss_mb"], 1e-9)
+        if rss_ratio > 1 + rss_tolerance:
+            regressions.append(
+                f"{name}: peak RSS {old['peak_rss_mb']:,.0f} MB -> "
+                f"{result['peak_rss_mb']:,.0f} MB ({rss_ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--datasets", nargs="+", choices=GENERATORS, default=list(GENERATORS)
+    )
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES))
+    parser.add_argument("--engine", choices=("rows", "columnar"), default="columnar")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_graph_results.json")
+    parser.add_argument(
+        "--baseline", help="Results JSON of a previous run to compare to"
+    )
+    parser.add_argument("--time-tolerance", type=float, default=0.2)
+    parser.add_argument("--rss-tolerance", type=float, default=0.2)
+    parser.add_argument("--min-seconds", type=float, default=0.05)
+    args = parser.parse_args()
+
+    jobs = [
+        (dataset, parse_size(size), stage, args.engine, args.repeat, args.seed)
+        for dataset in args.datasets
+        for size in args.sizes
+        for stage in args.stages
+    ]
+    context = multiprocessing.get_context("spawn")
+    results = []
+    print(
+        f"{'dataset':<12}{'rows':>12}  {'stage':<36}{'seconds':>10}"
+        f"{'rows/s':>14}{'peak MB':>10}"
+    )
+    for job in jobs:
+        # One short-lived process per measurement, so peaks do not add up
+        with context.Pool(1, maxtasksperchild=1) as pool:
+            result = pool.apply(_measure_in_child, (job,))
+        results.append(result)
+        print(
+            f"{result['dataset']:<12}{result['size']:>12,}  {result['stage']:<36}"
+            f"{result['seconds']:>10.2f}{result['rows_per_s']:>14,.0f}"
+            f"{result['peak_rss_mb']:>10,.0f}"
+        )
+
+    import networkx
+    import numpy
+    import pandas
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "numpy": numpy.__version__,
+            "pandas": pandas.__version__,
+            "networkx": networkx.__version__,
+            "engine": args.engine,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(
+            results,
+            baseline,
+            args.time_tolerance,
+            args.rss_tolerance,
+            min_seconds=args.min_seconds,
+        )
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regression against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Seeded synthetic datasets shaped like the example notebooks' workloads.
+
+Each generator takes a number of rows and a seed and returns (df, spec): the
+DataFrame and the arguments the benchmarks pass to the graph functions.
+spec["graph_kwargs"] goes to create_graph_from_df, spec["node_type_key"] and
+spec["edge_type_key"] to the exporters. The same (n_rows, seed) always gives the
+same DataFrame.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _prefixed_ids(prefix, values):
+    return prefix + pd.Series(values).astype(str)
+
+
+def paysim(n_rows, seed=0):
+    """
+    PaySim-style mobile money transactions.
+
+    Bipartite Account/Transaction graph: every row is a Transaction node linked
+    to its origin and destination Account. Origins are customers, destinations
+    customers or merchants, as in the PaySim log.
+    """
+    rng = np.random.default_rng(seed)
+    n_accounts = max(n_rows // 4, 10)
+    types = np.array(["CASH_IN", "CASH_OUT", "DEBIT", "PAYMENT", "TRANSFER"])
+
+    kind = rng.choice(types, size=n_rows, p=[0.22, 0.35, 0.01, 0.34, 0.08])
+    amount = np.round(rng.lognormal(mean=10, sigma=1.5, size=n_rows), 2)
+    old_orig = np.round(rng.lognormal(mean=9, sigma=2, size=n_rows), 2)
+    old_dest = np.round(rng.lognormal(mean=9, sigma=2, size=n_rows), 2)
+    is_merchant = kind == "PAYMENT"
+    dest_ids = rng.integers(0, n_accounts, size=n_rows)
+
+    df = pd.DataFrame(
+        {
+            "step": rng.integers(1, 744, size=n_rows),
+            "type": kind,
+            "amount": amount,
+            "nameOrig": _prefixed_ids("C", rng.integers(0, n_accounts, size=n_rows)),
+            "oldbalanceOrg": old_orig,
+            "newbalanceOrig": np.maximum(old_orig - amount, 0),
+            "nameDest": np.where(is_merchant, "M", "C")
+            + pd.Series(dest_ids).astype(str),
+            "oldbalanceDest": old_dest,
+            "newbalanceDest": np.where(is_merchant, 0, old_dest + amount),
+            "isFraud": (rng.random(n_rows) < 0.0013).astype(np.int64),
+            "isFlaggedFraud": np.zeros(n_rows, dtype=np.int64),
+            "txn_id": _prefixed_ids("TX", np.arange(n_rows)),
+            # Optional node types must be columns, or default to the set name
+            "account_label": "Account",
+        }
+    )
+    spec = {
+        "graph_kwargs": {
+            "source_node_col": {"id": "txn_id", "type": "Transaction"},
+            "attributes_source_node_cols": ["amount", "type", "step", "isFraud"],
+            "optional_nodes_cols": {
+                "origin": {
+                    "id": "nameOrig",
+                    "type": "account_label",
+                    "link_to_source": True,
+                    "edge_type_to_source": "SENT_BY",
+                    "edge_attributes": ["oldbalanceOrg", "newbalanceOrig"],
+                },
+                "destination": {
+                    "id": "nameDest",
+                    "type": "account_label",
+                    "link_to_source": True,
+                    "edge_type_to_source": "RECEIVED_BY",
+                    "edge_attributes": ["oldbalanceDest", "newbalanceDest"],
+                },
+            },
+        },
+        "node_type_key": "type",
+        "edge_type_key": "type",
+    }
+    return df, spec
+
+
+def orbitaal(n_rows, seed=0):
+    """
+    ORBITAAL-style bitcoin transfer stream.
+
+    Entity-to-entity transfers whose endpoints follow a power law, so a few hub
+    entities take part in a large share of the transfers.
+    """
+    rng = np.random.default_rng(seed)
+    n_entities = max(n_rows // 5, 10)
+    # Log-uniform ranks (P(rank) ~ 1/rank) mapped to shuffled IDs, so hubs are
+    # not simply the lowest IDs
+    permutation = rng.permutation(n_entities)
+
+    def power_law_ids():
+        ranks = np.floor(n_entities ** rng.random(n_rows)).astype(np.int64) - 1
+        return permutation[ranks]
+
+    src = power_law_ids()
+    dst = power_law_ids()
+    satoshi = rng.lognormal(mean=16, sigma=2.5, size=n_rows).astype(np.int64)
+
+    df = pd.DataFrame(
+        {
+            "SRC_ID": src,
+            "DST_ID": dst,
+            "TIMESTAMP": 1467331200 + np.sort(rng.integers(0, 86400 * 30, size=n_rows)),
+            "VALUE_SATOSHI": satoshi,
+            "VALUE_USD": np.round(satoshi * 6.5e-6, 2),
+        }
+    )
+    spec = {
+        "graph_kwargs": {
+            "source_node_col": {"id": "SRC_ID", "type": "Entity"},
+            "target_node_col": {"id": "DST_ID", "type": "Entity"},
+            "attributes_edges": ["TIMESTAMP", "VALUE_SATOSHI", "VALUE_USD"],
+        },
+        "node_type_key": "type",
+        "edge_type_key": "TRANSFER",
+    }
+    return df, spec
+
+
+def healthcare(n_rows, seed=0):
+    """
+    Healthcare-style star schema, as in healthcare_dataset.ipynb.
+
+    One Patient per row, linked through optional_nodes_cols to low-cardinality
+    dimension nodes (gender, blood type, doctor, hospital, ...).
+    """
+    rng = np.random.default_rng(seed)
+    n_doctors = max(n_rows // 50, 5)
+    n_hospitals = max(n_rows // 100, 3)
+
+    def pick(values, size=n_rows):
+        return np.asarray(values)[rng.integers(0, len(values), size=size)]
+
+    admission = np.datetime64("2019-01-01") + rng.integers(0, 5 * 365, size=n_rows)
+    df = pd.DataFrame(
+        {
+            "Patient ID": _prefixed_ids("P", np.arange(n_rows)),
+            "Name": _prefixed_ids("Patient ", rng.integers(0, n_rows, size=n_rows)),
+            "Age": rng.integers(13, 90, size=n_rows),
+            "Gender": pick(["Male", "Female"]),
+            "Blood Type": pick(["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]),
+            "Medical Condition": pick(
+                ["Cancer", "Obesity", "Diabetes", "Asthma", "Hypertension", "Arthritis"]
+            ),
+            "Date of Admission": pd.to_datetime(admission).strftime("%Y-%m-%d"),
+            "Doctor": _prefixed_ids("Dr. ", rng.integers(0, n_doctors, size=n_rows)),
+            "Hospital": _prefixed_ids(
+                "Hospital ", rng.integers(0, n_hospitals, size=n_rows)
+            ),
+            "Insurance Provider": pick(
+                ["Aetna", "Blue Cross", "Cigna", "Medicare", "UnitedHealthcare"]
+            ),
+            "Billing Amount": np.round(rng.uniform(100, 50_000, size=n_rows), 2),
+            "Room Number": rng.integers(101, 500, size=n_rows),
+            "Admission Type": pick(["Elective", "Emergency", "Urgent"]),
+            "Discharge Date": pd.to_datetime(
+                admission + rng.integers(1, 30, size=n_rows)
+            ).strftime("%Y-%m-%d"),
+            "Medication": pick(
+                ["Aspirin", "Ibuprofen", "Lipitor", "Paracetamol", "Penicillin"]
+            ),
+            "Test Results": pick(["Normal", "Abnormal", "Inconclusive"]),
+        }
+    )
+    spec = {
+        "graph_kwargs": {
+            "source_node_col": {
+                "id": "Patient ID",
+                "displayName": "Name",
+                "type": "Patient",
+            },
+            "attributes_source_node_cols": [
+                "Age",
+                "Date of Admission",
+                "Discharge Date",
+                "Billing Amount",
+            ],
+            "optional_nodes_cols": {
+                "Gender": {"link_to_source": True, "edge_type_to_source": "is"},
+                "Blood Type": {"link_to_source": True, "edge_type_to_source": "is"},
+                "Medical Condition": {
+                    "link_to_source": True,
+                    "edge_type_to_source": "has",
+                },
+                "Doctor": {
+                    "link_to_source": True,
+                    "edge_type_to_source": "is_treated_by",
+                },
+                "Hospital": {
+                    "attributes": ["Room Number"],
+                    "link_to_source": True,
+                    "edge_type_to_source": "is_treated_in",
+                },
+                "Insurance Provider": {
+                    "link_to_source": True,
+                    "edge_type_to_source": "is_client_of",
+                },
+                "Admission Type": {"link_to_source": True},
+                "Medication": {
+                    "link_to_source": True,
+                    "edge_type_to_source": "took_medication",
+                },
+                "Test Results": {
+                    "link_to_source": True,
+                    "edge_type_to_source": "has_result",
+                },
+            },
+        },
+        "node_type_key": "type",
+        "edge_type_key": "type",
+    }
+    return df, spec
+
+
+GENERATORS = {
+    "paysim": paysim,
+    "orbitaal": orbitaal,
+    "healthcare": healthcare,
+}
@@ -0,0 +1,302 @@
+"""
+Skip-if-unchanged graph builds.
+
+A build is keyed on a hash of its source data (DataFrames, NetworkX graphs,
+files), the arguments of create_graph_from_df / networkx_to_jsonl and the
+versions of turingdb_examples and the turingdb client. The registry
+{data_dir}/graph_builds.json maps each key and server to the TuringDB graph it
+was loaded as, so an unchanged dataset is reused with load_graph / set_graph
+instead of being exported and loaded again:
+
+    >>> graph_name = build_graph_from_df(
+    ...     client,
+    ...     "healthcare",
+    ...     df,
+    ...     source_node_col={"id": "Patient ID", "type": "Patient"},
+    ...     optional_nodes_cols={...},
+    ...     node_type_key="type",
+    ...     edge_type_key="type",
+    ... )
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import __version__
+from .graph import create_graph_from_df, networkx_to_jsonl
+
+# Bumped when the way builds are hashed changes
+_BUILD_KEY_VERSION = 1
+_REGISTRY_NAME = "graph_builds.json"
+
+
+def _hash_pandas(digest, value):
+    try:
+        hashes = pd.util.hash_pandas_object(value, index=True).to_numpy()
+    except TypeError:
+        # Unhashable cells (lists, dicts): fall back on their repr
+        hashes = pd.util.hash_pandas_object(value.astype(str), index=True)
+        hashes = hashes.to_numpy()
+    digest.update(hashes)
+
+
+def _hash_update(digest, value):
+    """Feed value to digest: data structures by content, anything else by repr."""
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr((list(value.columns), list(value.dtypes))).encode())
+        _hash_pandas(digest, value)
+    elif isinstance(value, pd.Series):
+        digest.update(repr((value.name, value.dtype)).encode())
+        _hash_pandas(digest, value)
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif hasattr(value, "nodes") and hasattr(value, "edges"):
+        # NetworkX graph or ArrayGraph; order matters, it gives the integer IDs
+        digest.update(repr((type(value).__name__, value.is_directed())).encode())
+        for node in value.nodes(data=True):
+            digest.update(repr(node).encode())
+        for edge in value.edges(data=True):
+            digest.update(repr(edge).encode())
+    elif isinstance(value, dict):
+        digest.update(b"{")
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode())
+            _hash_update(digest, value[key])
+        digest.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"[")
+        for item in value:
+            _hash_update(digest, item)
+        digest.update(b"]")
+    else:
+        digest.update(repr(value).encode())
+    digest.update(b"\0")
+
+
+def _hash_file(digest, path):
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(b"\0")
+
+
+def _client_version():
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("turingdb")
+    except PackageNotFoundError:
+        return None
+
+
+def build_key(*sources, **arguments):
+    """
+    Hash of a graph build.
+
+    Parameters
+    ----------
+    *sources
+        Source data: DataFrames, Series, arrays and graphs are hashed by
+        content, str and os.PathLike values as the bytes of the file they name.
+    **arguments
+        Build arguments (column spec, node_type_key, ...), hashed by content,
+        including DataFrames such as node_attributes_df.
+
+    Returns
+    -------
+    str
+        Hex digest, also covering the versions of turingdb_examples and of the
+        turingdb client.
+    """
+    digest = hashlib.sha256()
+    _hash_update(digest, (_BUILD_KEY_VERSION, __version__, _client_version()))
+    for source in sources:
+        if isinstance(source, (str, os.PathLike)):
+            _hash_file(digest, source)
+        else:
+            _hash_update(digest, source)
+    _hash_update(digest, arguments)
+    return digest.hexdigest()
+
+
+def next_graph_name(prefix, available):
+    """
+    prefix followed by one more than the highest number already used after it
+    in available, with "-" replaced by "_": "healthcare3" after "healthcare2".
+    """
+    numbers = [
+        int(name[len(prefix) :])
+        for name in available
+        if name.startswith(prefix) and name[len(prefix) :].isdigit()
+    ]
+    return re.sub("-", "_", f"{prefix}{max(numbers, default=0) + 1}")
+
+
+def _server_identity(client):
+    """
+    Host and instance ID of the server client is connected to, as far as the
+    client exposes them (on itself, or on its transport for newer turingdb
+    versions), "unknown" otherwise.
+    """
+    objects = [client, getattr(client, "impl", None)]
+    parts = []
+    for name in ("host", "instance_id"):
+        for obj in objects:
+            value = getattr(obj, name, None) or getattr(obj, f"_{name}", None)
+            if isinstance(value, str) and value:
+                parts.append(f"{name}={value}")
+                break
+    return " ".join(parts) or "unknown"
+
+
+def _registry_path(data_dir):
+    if data_dir is None:
+        data_dir = os.path.expanduser("~/.turing/data")
+    return os.path.join(data_dir, _REGISTRY_NAME)
+
+
+def _read_registry(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_registry(path, registry):
+    """Write the registry atomically, so a failed write keeps the previous one."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(registry, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def ensure_graph(client, graph_prefix, key, build, data_dir=None):
+    """
+    Make the graph built for key the current graph, building it only if needed.
+
+    Parameters
+    ----------
+    client : turingdb.TuringDB
+        Connected client.
+    graph_prefix : str
+        Base name of the graph; a new build is loaded as next_graph_name of it.
+    key : str
+        Hash of the build, from build_key.
+    build : callable
+        build(graph_name) writes the JSONL file of the graph to data_dir and
+        returns its filename, e.g. a networkx_to_jsonl call. Only called on a
+        miss.
+    data_dir : str or None
+        Directory of the JSONL files and of the registry. Defaults to
+        ~/.turing/data.
+
+    Returns
+    -------
+    str
+        Name of the graph, now set on client.
+
+    Notes
+    -----
+    Entries are per server (host and instance ID of client), so the same build
+    on another server is a miss. A hit is only trusted if it was recorded for
+    this server and its graph is still in list_available_graphs() and loads;
+    otherwise the entry is dropped and the graph built again.
+    """
+    from turingdb import TuringDBException
+
+    start_time = time.perf_counter()
+    path = _registry_path(data_dir)
+    registry = _read_registry(path)
+    available = client.list_available_graphs()
+    server = _server_identity(client)
+    entry_key = f"{key}@{server}"
+
+    entry = registry.get(entry_key)
+    if (
+        entry is not None
+        and entry.get("server") == server
+        and entry["graph"] in available
+    ):
+        graph_name = entry["graph"]
+        try:
+            client.load_graph(graph_name, raise_if_loaded=False)
+        except TuringDBException as exc:
+            print(f"Graph {graph_name!r} failed to load, rebuilding: {exc}")
+        else:
+            client.set_graph(graph_name)
+            print(
+                f"Reusing graph {graph_name!r} (unchanged build) in "
+                f"{time.perf_counter() - start_time:.2f}s"
+            )
+            return graph_name
+    registry.pop(entry_key, None)
+
+    graph_name = next_graph_name(graph_prefix, available)
+    jsonl_filename = build(graph_name)
+    client.query(f"LOAD JSONL '{jsonl_filename}' AS {graph_name}")
+    client.set_graph(graph_name)
+
+    registry[entry_key] = {
+        "graph": graph_name,
+        "server": server,
+        "created": time.time(),
+    }
+    _write_registry(path, registry)
+    print(
+        f"Graph {graph_name!r} built and loaded in "
+        f"{time.perf_counter() - start_time:.2f}s"
+    )
+    return graph_name
+
+
+def build_graph_from_df(
+    client,
+    graph_prefix,
+    df,
+    *,
+    node_type_key=None,
+    edge_type_key=None,
+    data_dir=None,
+    **create_kwargs,
+):
+    """
+    create_graph_from_df, networkx_to_jsonl and LOAD JSONL, skipped when df and
+    the arguments are those of a graph already built.
+
+    Parameters
+    ----------
+    client : turingdb.TuringDB
+        Connected client.
+    graph_prefix : str
+        As in ensure_graph.
+    df : pd.DataFrame
+        As in create_graph_from_df.
+    node_type_key, edge_type_key, data_dir :
+        As in networkx_to_jsonl.
+    **create_kwargs
+        Other create_graph_from_df arguments.
+
+    Returns
+    -------
+    str
+        Name of the graph, now set on client.
+    """
+    type_keys = {"node_type_key": node_type_key, "edge_type_key": edge_type_key}
+    key = build_key(df, **create_kwargs, **type_keys)
+
+    def build(graph_name):
+        G = create_graph_from_df(df, **create_kwargs)
+        return networkx_to_jsonl(G, graph_name, data_dir=data_dir, **type_keys)
+
+    return ensure_graph(client, graph_prefix, key, build, data_dir=data_dir)
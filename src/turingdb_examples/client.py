@@ -0,0 +1,768 @@
+import bisect
+import hashlib
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from .tracing import span
+
+# Quoted strings are kept as is, any other run of whitespace becomes one space
+_QUERY_TOKENS = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`[^`]*`)|\s+""")
+_WRITE_KEYWORDS = re.compile(
+    r"\b(CREATE|MERGE|DELETE|DETACH|SET|REMOVE|LOAD|COMMIT|CHANGE|DROP|IMPORT)\b",
+    re.IGNORECASE,
+)
+_READ_PREFIXES = ("MATCH ", "CALL DB.", "RETURN ")
+
+
+def normalize_query(query):
+    """Query text with whitespace collapsed outside string literals and no trailing ;"""
+    query = _QUERY_TOKENS.sub(
+        lambda m: m.group(1) if m.group(1) is not None else " ", query
+    )
+    return query.strip().rstrip(";").strip()
+
+
+def _is_write(query):
+    """Whether a normalized query has a write clause outside string literals."""
+    unquoted = _QUERY_TOKENS.sub(
+        lambda m: " " if m.group(1) is not None else m.group(0), query
+    )
+    return _WRITE_KEYWORDS.search(unquoted) is not None
+
+
+def _head_commit(client):
+    """HEAD commit of the current graph, from CALL db.history(); None if empty."""
+    history = client.query("CALL db.history()")
+    if not len(history) or "commit" not in history.columns:
+        return None
+    commits = history["commit"].astype(str)
+    head = commits[commits.str.endswith("(HEAD)")]
+    commit = head.iloc[0] if len(head) else commits.iloc[0]
+    return commit.removesuffix("(HEAD)")
+
+
+class CachedTuringDB:
+    """
+    TuringDB client wrapper caching the results of read-only queries.
+
+    Results are keyed on (graph name, commit, normalized query text), so a cached
+    result is only returned for the exact version of the graph it was computed
+    on. They are kept in an in-memory LRU and, if cache_dir is given, as Parquet
+    files evicted least recently used first once they exceed max_disk_mb.
+
+    Writes (CREATE, SET, DELETE, LOAD, COMMIT, CHANGE, ...) go straight to the
+    client and invalidate the current graph. So do set_graph, load_graph,
+    checkout, set_change, set_commit and new_change. Queries made while working
+    on a change see uncommitted data and are never cached. Every other method
+    and attribute is the wrapped client's.
+
+    Parameters
+    ----------
+    client : turingdb.TuringDB
+        Client to wrap, e.g. from create_turingdb_client().
+    max_entries : int, default=256
+        Results kept in memory.
+    cache_dir : str or None
+        Directory for the Parquet cache (needs pyarrow). None keeps results in
+        memory only.
+    max_disk_mb : float, default=1024
+        Size cap of the Parquet cache.
+    commit_ttl : float, default=5.0
+        Seconds the HEAD commit from CALL db.history() is trusted before being
+        looked up again, to pick up writes made by other clients.
+
+    Notes
+    -----
+    Results are returned as shallow copies: adding columns is safe, but editing
+    values in place would change the cached frame.
+    """
+
+    def __init__(
+        self,
+        client,
+        max_entries=256,
+        cache_dir=None,
+        max_disk_mb=1024,
+        commit_ttl=5.0,
+    ):
+        self.client = client
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_mb = max_disk_mb
+        self.commit_ttl = commit_ttl
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0}
+        self._memory = OrderedDict()
+        self._commits = {}
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def query(self, query):
+        normalized = normalize_query(query)
+        if _is_write(normalized):
+            self.stats["bypassed"] += 1
+            is_load = normalized[:5].upper() == "LOAD "
+            name = "turingdb.load" if is_load else "turingdb.write"
+            with span(name, bytes=len(query)):
+                result = self.client.query(query)
+            self.invalidate()
+            return result
+        if (
+            not normalized.upper().startswith(_READ_PREFIXES)
+            or self.client.current_change != "main"
+        ):
+            self.stats["bypassed"] += 1
+            with span("turingdb.query", bytes=len(query)):
+                return self.client.query(query)
+
+        key = (self.client.current_graph, self._commit(), normalized)
+        result = self._memory.get(key)
+        if result is not None:
+            self._memory.move_to_end(key)
+            self.stats["hits"] += 1
+            with span("turingdb.query", cache_hits=1, rows=len(result)):
+                return result.copy(deep=False)
+
+        with span("turingdb.query", bytes=len(query)) as query_span:
+            result = self._read_disk(key)
+            if result is not None:
+                self.stats["disk_hits"] += 1
+                query_span.add("disk_hits")
+            else:
+                self.stats["misses"] += 1
+                query_span.add("cache_misses")
+                result = self.client.query(query)
+                self._write_disk(key, result)
+            query_span.add("rows", len(result))
+        self._remember(key, result)
+        return result.copy(deep=False)
+
+    def invalidate(self, graph_name=None):
+        """Forget the commit and in-memory results of graph_name (default: current)."""
+        graph_name = graph_name or self.client.current_graph
+        self._commits.pop(graph_name, None)
+        for key in [key for key in self._memory if key[0] == graph_name]:
+            del self._memory[key]
+
+    def clear(self):
+        """Drop every cached result, in memory and on disk."""
+        self._memory.clear()
+        self._commits.clear()
+        for path, _, _ in self._disk_entries():
+            os.remove(path)
+
+    def set_graph(self, graph_name):
+        self.client.set_graph(graph_name)
+        self._commits.pop(graph_name, None)
+
+    def load_graph(self, graph_name, *args, **kwargs):
+        result = self.client.load_graph(graph_name, *args, **kwargs)
+        self.invalidate(graph_name)
+        return result
+
+    def checkout(self, *args, **kwargs):
+        self.client.checkout(*args, **kwargs)
+        self.invalidate()
+
+    def set_change(self, change):
+        self.client.set_change(change)
+        self.invalidate()
+
+    def set_commit(self, commit):
+        self.client.set_commit(commit)
+        self.invalidate()
+
+    def new_change(self):
+        change = self.client.new_change()
+        self.invalidate()
+        return change
+
+    def _commit(self):
+        """Commit the current graph is read at: the checked out one, or HEAD."""
+        if self.client.current_commit != "HEAD":
+            return self.client.current_commit
+        graph_name = self.client.current_graph
+        cached = self._commits.get(graph_name)
+        now = time.monotonic()
+        if cached is not None and now - cached[1] < self.commit_ttl:
+            return cached[0]
+
+        commit = _head_commit(self.client)
+        self._commits[graph_name] = (commit, now)
+        return commit
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key):
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".parquet")
+
+    def _read_disk(self, key):
+        if self.cache_dir is None:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        import pandas as pd
+
+        try:
+            result = pd.read_parquet(path)
+        except Exception:
+            return None
+        # Touch the file so eviction drops the least recently used
+        os.utime(path)
+        return result
+
+    def _write_disk(self, key, result):
+        if self.cache_dir is None:
+            return
+        path = self._disk_path(key)
+        tmp_path = path + ".tmp"
+        try:
+            result.to_parquet(tmp_path)
+        except Exception:
+            # Columns of mixed Python objects (nodes, paths) may not convert;
+            # such results are only cached in memory
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        os.replace(tmp_path, path)
+        self._evict_disk()
+
+    def _disk_entries(self):
+        """(path, size, mtime) of every Parquet entry."""
+        if self.cache_dir is None or not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".parquet"):
+                stat = entry.stat()
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict_disk(self):
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_disk_mb * 1e6:
+                break
+            os.remove(path)
+            total -= size
+
+
+# Upper bounds in seconds of the latency histogram buckets; the last is open
+_LATENCY_BUCKETS = (
+    0.001,
+    0.002,
+    0.005,
+    0.01,
+    0.02,
+    0.05,
+    0.1,
+    0.2,
+    0.5,
+    1.0,
+    2.0,
+    5.0,
+    10.0,
+    float("inf"),
+)
+
+
+class _LatencyHistogram:
+    """Bucketed latencies of one query, with their count, sum and maximum."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * len(_LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.counts[bisect.bisect_left(_LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (max for the last)."""
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(_LATENCY_BUCKETS, self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(bound, self.max)
+        return self.max
+
+
+class TuringDBPool:
+    """
+    Pool of warmed-up TuringDB clients, running read queries concurrently.
+
+    The clients are created up front, each warmed up once and set on
+    graph_name, and reused for every query: query() borrows one, map_queries()
+    spreads a batch of read queries over all of them from a thread pool. Each
+    query's latency is recorded in a histogram per normalized query text.
+
+    Parameters
+    ----------
+    client_factory : callable or None
+        Returns a new connected client, e.g. ``lambda: TuringDB(host=url)``.
+        None uses ``TuringDB()``.
+    size : int, default=8
+        Number of clients, and of queries in flight. A batch finishes in about
+        the time of its slowest query when it has at most size queries.
+    graph_name : str or None
+        If given, set_graph(graph_name) is called on every client.
+    warmup : bool, default=True
+        Call warmup() on every client when it is created.
+
+    Examples
+    --------
+    >>> with TuringDBPool(lambda: TuringDB(host=url), size=16, graph_name=name) as pool:
+    ...     counts = pool.map_queries(
+    ...         [f"MATCH (n:{label}) RETURN count(n)" for label in labels]
+    ...     )
+    >>> pool.latency_stats()
+    """
+
+    def __init__(self, client_factory=None, size=8, graph_name=None, warmup=True):
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1, got {size}")
+        if client_factory is None:
+            from turingdb import TuringDB
+
+            client_factory = TuringDB
+        self.size = size
+        self.graph_name = graph_name
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._executor = None
+
+        start_time = time.perf_counter()
+        with span("turingdb.pool_start", clients=size):
+            for _ in range(size):
+                client = client_factory()
+                if warmup:
+                    client.warmup()
+                if graph_name is not None:
+                    client.set_graph(graph_name)
+                self._idle.put(client)
+        print(
+            f"Started {size} TuringDB clients in "
+            f"{time.perf_counter() - start_time:.2f}s"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    @contextmanager
+    def client(self):
+        """Borrow an idle client, waiting for one if all are busy."""
+        client = self._idle.get()
+        try:
+            yield client
+        finally:
+            self._idle.put(client)
+
+    def query(self, query):
+        """Run one query on an idle client, recording its latency."""
+        with self.client() as client:
+            with span("turingdb.query", bytes=len(query)):
+                start = time.perf_counter()
+                result = client.query(query)
+                elapsed = time.perf_counter() - start
+        self._record(normalize_query(query), elapsed)
+        return result
+
+    def map_queries(self, queries, return_exceptions=False):
+        """
+        Run read queries concurrently, one per client at a time.
+
+        Parameters
+        ----------
+        queries : list of str
+            Read-only queries; a write (CREATE, SET, LOAD, ...) raises ValueError
+            before anything runs, as concurrent writes would race.
+        return_exceptions : bool, default=False
+            Return the exception of a failed query in its place instead of
+            raising the first one, as in asyncio.gather.
+
+        Returns
+        -------
+        list of pd.DataFrame
+            Results in the order of queries.
+        """
+        queries = list(queries)
+        for query in queries:
+            if _is_write(normalize_query(query)):
+                raise ValueError(f"map_queries only runs read queries, got: {query}")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.size, thread_name_prefix="turingdb-pool"
+            )
+
+        start_time = time.perf_counter()
+        futures = [self._executor.submit(self.query, query) for query in queries]
+        results = []
+        for future in futures:
+            exc = future.exception()
+            if exc is not None and not return_exceptions:
+                for pending in futures:
+                    pending.cancel()
+                raise exc
+            results.append(exc if exc is not None else future.result())
+        wall_time = time.perf_counter() - start_time
+        print(f"Ran {len(queries):,} queries in {wall_time:.2f}s")
+        return results
+
+    def set_graph(self, graph_name):
+        """Set graph_name on every client, once they are all idle."""
+        clients = [self._idle.get() for _ in range(self.size)]
+        try:
+            for client in clients:
+                client.set_graph(graph_name)
+            self.graph_name = graph_name
+        finally:
+            for client in clients:
+                self._idle.put(client)
+
+    def close(self):
+        """Wait for running queries, then close every client that can be."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for _ in range(self.size):
+            client = self._idle.get()
+            close = getattr(client, "close", None)
+            if close is not None:
+                close()
+
+    def _record(self, query, seconds):
+        with self._lock:
+            histogram = self._histograms.get(query)
+            if histogram is None:
+                histogram = self._histograms[query] = _LatencyHistogram()
+            histogram.add(seconds)
+
+    def latency_histogram(self, query=None):
+        """
+        Latency histogram of one query (normalized text), or of all of them.
+
+        Returns
+        -------
+        pd.DataFrame
+            le (bucket upper bound in seconds) and count columns.
+        """
+        import pandas as pd
+
+        with self._lock:
+            if query is not None:
+                histogram = self._histograms.get(normalize_query(query))
+                histograms = [] if histogram is None else [histogram]
+            else:
+                histograms = list(self._histograms.values())
+            counts = [sum(column) for column in zip(*(h.counts for h in histograms))]
+        return pd.DataFrame(
+            {"le": _LATENCY_BUCKETS, "count": counts or [0] * len(_LATENCY_BUCKETS)}
+        )
+
+    def latency_stats(self):
+        """
+        One row per normalized query: count, mean, p50, p95 and max latency in
+        seconds, slowest p95 first. Percentiles are bucket upper bounds.
+        """
+        import pandas as pd
+
+        with self._lock:
+            rows = [
+                {
+                    "query": query,
+                    "count": h.count,
+                    "mean": h.total / h.count,
+                    "p50": h.quantile(0.5),
+                    "p95": h.quantile(0.95),
+                    "max": h.max,
+                }
+                for query, h in self._histograms.items()
+            ]
+        columns = ["query", "count", "mean", "p50", "p95", "max"]
+        stats = pd.DataFrame(rows, columns=columns)
+        return stats.sort_values("p95", ascending=False, ignore_index=True)
+
+
+# Profiles of recently profiled (graph, commit) pairs, most recent last
+_PROFILE_CACHE_SIZE = 32
+_profiles = OrderedDict()
+
+
+class _QueryCounter:
+    """Client proxy counting the queries run through it."""
+
+    def __init__(self, client):
+        self.client = client
+        self.count = 0
+
+    def query(self, query):
+        self.count += 1
+        return self.client.query(query)
+
+    def map_queries(self, queries):
+        """Results of queries, run concurrently when client is a TuringDBPool."""
+        self.count += len(queries)
+        if hasattr(self.client, "map_queries"):
+            return self.client.map_queries(queries)
+        return [self.client.query(query) for query in queries]
+
+
+def _names(df):
+    """Names listed by CALL db.labels() or db.edgeTypes() (their last column)."""
+    return [] if df.empty else df.iloc[:, -1].astype(str).tolist()
+
+
+def _group_keys(value):
+    """Groups of a grouped result row: the labels listed by labels(n), or type(e)."""
+    if isinstance(value, str):
+        return [value]
+    if hasattr(value, "__iter__"):
+        return [str(item) for item in value]
+    return [str(value)]
+
+
+def _grouped_counts(client, match, var, group_fn, groups, properties):
+    """
+    Count and property counts per group, in one grouped aggregate query.
+
+    labels(n) groups nodes by their list of labels; a node with several labels
+    is counted under each, as MATCH (n:Label) would. Returns {group: [count,
+    count of each property]}, or None when the server rejects the query or does
+    not group (the groups found are not those listed by the server).
+    """
+    from .graph import _cypher_name
+
+    columns = [f"{group_fn}({var})", f"count({var})"] + [
+        f"count({var}.{_cypher_name(prop)})" for prop in properties
+    ]
+    try:
+        result = client.query(f"MATCH {match} RETURN {', '.join(columns)}")
+    except Exception:
+        return None
+    if result.shape[1] != len(columns):
+        return None
+    counts = {}
+    for group_value, *row_counts in result.itertuples(index=False):
+        for group in _group_keys(group_value):
+            totals = counts.setdefault(group, [0] * len(row_counts))
+            for i, n in enumerate(row_counts):
+                totals[i] += int(n)
+    if set(counts) != set(groups):
+        return None
+    return counts
+
+
+def _looped_counts(client, label_match, var, groups, properties):
+    """
+    The counts of _grouped_counts with one count query per group and per
+    (group, property), for servers without grouped aggregation.
+    """
+    from .graph import _cypher_name
+
+    queries = []
+    for group in groups:
+        match = label_match.format(_cypher_name(group))
+        queries.append(f"MATCH {match} RETURN count({var})")
+        queries.extend(
+            f"MATCH {match} WHERE {var}.{_cypher_name(prop)} IS NOT NULL "
+            f"RETURN count({var})"
+            for prop in properties
+        )
+    results = iter(client.map_queries(queries))
+    return {
+        group: [int(next(results).iloc[0, 0]) for _ in range(len(properties) + 1)]
+        for group in groups
+    }
+
+
+def _degree_summary(client, n_nodes, n_edges):
+    """Out- and in-degree statistics over all nodes, from grouped edge counts."""
+    import numpy as np
+    import pandas as pd
+
+    rows = {}
+    for direction, var in (("out", "n"), ("in", "m")):
+        row = {"mean": n_edges / n_nodes if n_nodes else 0.0}
+        try:
+            result = client.query(f"MATCH (n)-[e]->(m) RETURN id({var}), count(e)")
+            degrees = result.iloc[:, -1].to_numpy(dtype=np.int64)
+            if degrees.sum() != n_edges or len(degrees) > n_nodes:
+                raise ValueError("Edge counts are not grouped per node")
+        except Exception:
+            degrees = None
+        if degrees is not None and n_nodes:
+            # Nodes without edges in this direction are not returned
+            degrees = np.concatenate(
+                [degrees, np.zeros(n_nodes - len(degrees), dtype=np.int64)]
+            )
+            row.update(
+                {
+                    "min": int(degrees.min()),
+                    "p50": float(np.percentile(degrees, 50)),
+                    "p90": float(np.percentile(degrees, 90)),
+                    "p99": float(np.percentile(degrees, 99)),
+                    "max": int(degrees.max()),
+                    "zero": int((degrees == 0).sum()),
+                }
+            )
+        rows[direction] = row
+    columns = ["mean", "min", "p50", "p90", "p99", "max", "zero"]
+    return pd.DataFrame.from_dict(rows, orient="index", columns=columns)
+
+
+def graph_profile(client, degrees=True, refresh=False):
+    """
+    Node and edge counts, property fill rates and degree statistics of the
+    current graph, computed with aggregate queries and cached per commit.
+
+    Counts per label (and per edge type) and the counts of every property come
+    from one grouped query, MATCH (n) RETURN labels(n), count(n), count(n.p),
+    ..., so the number of queries does not grow with the number of labels.
+    Servers without grouped aggregation get one count(n) query per label and
+    per (label, property), run concurrently when client is a TuringDBPool.
+    Nothing is materialized but the per-node edge counts of the degree summary.
+
+    Parameters
+    ----------
+    client : turingdb.TuringDB, CachedTuringDB or TuringDBPool
+        Client set on the graph to profile.
+    degrees : bool, default=True
+        Also compute the degree summary (two queries returning one row per node
+        with edges).
+    refresh : bool, default=False
+        Recompute even if the profile of this commit is cached.
+
+    Returns
+    -------
+    dict
+        - nodes, edges: totals
+        - labels: DataFrame of label and count
+        - edge_types: DataFrame of edge_type and count
+        - properties: DataFrame of element ('node' or 'relationship'), label,
+          property, type, count and fill_rate, as in graph.graph_schema
+        - degree: DataFrame of out- and in-degree mean, min, p50, p90, p99,
+          max and number of nodes with none (only the mean if the server
+          cannot group edge counts per node), or None without degrees
+        - commit, queries, seconds
+
+    Examples
+    --------
+    >>> profile = graph_profile(client)
+    >>> print(f"Graph: {profile['nodes']:,} nodes and {profile['edges']:,} edges")
+    >>> profile["properties"].query("fill_rate < 0.5")
+    """
+    import pandas as pd
+
+    start_time = time.perf_counter()
+    counter = _QueryCounter(client)
+    graph_name = getattr(client, "current_graph", None) or getattr(
+        client, "graph_name", None
+    )
+    commit = getattr(client, "current_commit", "HEAD")
+    if commit == "HEAD":
+        commit = _head_commit(counter)
+    key = (graph_name, commit, degrees)
+    if commit is not None and not refresh and key in _profiles:
+        _profiles.move_to_end(key)
+        return _profiles[key]
+
+    with span("turingdb.profile") as profile_span:
+        labels = _names(counter.query("CALL db.labels()"))
+        edge_types = _names(counter.query("CALL db.edgeTypes()"))
+        property_types = counter.query("CALL db.propertyTypes()")
+        if property_types.empty:
+            types = {}
+        else:
+            types = dict(
+                zip(
+                    property_types["propertyType"].astype(str),
+                    property_types["valueType"].astype(str),
+                )
+            )
+        properties = list(types)
+        n_nodes = int(counter.query("MATCH (n) RETURN count(n)").iloc[0, 0])
+
+        node_counts = _grouped_counts(
+            counter, "(n)", "n", "labels", labels, properties
+        ) or _looped_counts(counter, "(n:{})", "n", labels, properties)
+        edge_counts = _grouped_counts(
+            counter, "(n)-[e]->(m)", "e", "type", edge_types, properties
+        ) or _looped_counts(counter, "(n)-[e:{}]->(m)", "e", edge_types, properties)
+        n_edges = sum(counts[0] for counts in edge_counts.values())
+
+        rows = []
+        for element, counts in (("node", node_counts), ("relationship", edge_counts)):
+            for label, (total, *prop_counts) in counts.items():
+                for prop, n in zip(properties, prop_counts):
+                    if n:
+                        rows.append(
+                            {
+                                "element": element,
+                                "label": label,
+                                "property": prop,
+                                "type": types[prop],
+                                "count": n,
+                                "fill_rate": n / total if total else 0.0,
+                            }
+                        )
+
+        degree = _degree_summary(counter, n_nodes, n_edges) if degrees else None
+        profile_span.add("queries", counter.count)
+
+    elapsed = time.perf_counter() - start_time
+    profile = {
+        "nodes": n_nodes,
+        "edges": n_edges,
+        "labels": pd.DataFrame(
+            [(label, counts[0]) for label, counts in node_counts.items()],
+            columns=["label", "count"],
+        ),
+        "edge_types": pd.DataFrame(
+            [(edge_type, counts[0]) for edge_type, counts in edge_counts.items()],
+            columns=["edge_type", "count"],
+        ),
+        "properties": pd.DataFrame(
+            rows,
+            columns=["element", "label", "property", "type", "count", "fill_rate"],
+        ),
+        "degree": degree,
+        "commit": commit,
+        "queries": counter.count,
+        "seconds": elapsed,
+    }
+    print(
+        f"Graph: {n_nodes:,} nodes and {n_edges:,} edges, profiled with "
+        f"{counter.count} queries in {elapsed:.2f}s"
+    )
+    if commit is not None:
+        _profiles[key] = profile
+        while len(_profiles) > _PROFILE_CACHE_SIZE:
+            _profiles.popitem(last=False)
+    return profile
@@ -0,0 +1,574 @@
+import hashlib
+import os
+import time
+
+import numpy as np
+
+
+class EmbeddingStore:
+    """
+    On-disk embedding cache, so re-runs only embed new or changed texts.
+
+    Vectors are kept in a memory-mapped float32 .npy file, one row per
+    (model name, text) hash, with the hashes in a companion keys.npy. The vector
+    file grows by doubling, and the keys are only saved once the vectors are
+    flushed, so an interrupted run never leaves a key without its vector.
+
+    Parameters
+    ----------
+    path : str
+        Directory of the store, created if needed.
+    model_name : str
+        Name of the embedding model, part of every key so that vectors of
+        different models never mix.
+
+    Examples
+    --------
+    >>> model = SentenceTransformer("all-MiniLM-L6-v2")
+    >>> store = EmbeddingStore("~/.turing/embeddings/wiki", "all-MiniLM-L6-v2")
+    >>> embeddings = store.embed(texts, model, batch_size=64)
+    """
+
+    def __init__(self, path, model_name):
+        self.path = os.path.expanduser(path)
+        self.model_name = model_name
+        os.makedirs(self.path, exist_ok=True)
+        self._keys_path = os.path.join(self.path, "keys.npy")
+        self._vectors_path = os.path.join(self.path, "vectors.npy")
+
+        keys = (
+            np.load(self._keys_path)
+            if os.path.exists(self._keys_path)
+            else np.empty(0, dtype="V16")
+        )
+        self._keys = keys.tolist()
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        self._vectors = (
+            np.load(self._vectors_path, mmap_mode="r+")
+            if os.path.exists(self._vectors_path)
+            else None
+        )
+
+    def __len__(self):
+        return len(self._keys)
+
+    @property
+    def dimension(self):
+        return None if self._vectors is None else self._vectors.shape[1]
+
+    def key(self, text):
+        """16-byte hash of (model name, text)."""
+        data = f"{self.model_name}\0{text}".encode("utf-8")
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def embed(self, texts, model, **encode_kwargs):
+        """
+        Vectors of texts, computing only those not in the store yet.
+
+        Parameters
+        ----------
+        texts : list of str
+            Texts to embed.
+        model : SentenceTransformer or callable
+            Object with an encode(list_of_texts, **encode_kwargs) method, or a
+            function taking a list of texts, returning one vector per text.
+        **encode_kwargs :
+            Passed to model.encode, e.g. batch_size or show_progress_bar.
+
+        Returns
+        -------
+        np.ndarray
+            float32 array of shape (len(texts), dimension), in input order.
+        """
+        start_time = time.perf_counter()
+        keys = [self.key(text) for text in texts]
+
+        # Texts not in the store yet, each embedded once even if repeated
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in self._rows and key not in missing:
+                missing[key] = text
+
+        if missing:
+            encode = model.encode if hasattr(model, "encode") else model
+            new_vectors = encode(list(missing.values()), **encode_kwargs)
+            self._append(list(missing), np.asarray(new_vectors, dtype=np.float32))
+
+        print(
+            f"Embedded {len(missing):,} new texts, reused {len(texts) - len(missing):,} "
+            f"in {time.perf_counter() - start_time:.2f}s"
+        )
+        return self.lookup(keys)
+
+    def lookup(self, keys):
+        """Stored vectors for keys (as returned by key), in order."""
+        rows = np.fromiter((self._rows[key] for key in keys), np.int64, len(keys))
+        if self._vectors is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.asarray(self._vectors[rows])
+
+    def _append(self, keys, vectors):
+        if vectors.ndim != 2 or len(vectors) != len(keys):
+            raise ValueError(
+                f"Expected {len(keys)} vectors, got an array of shape {vectors.shape}"
+            )
+        if self.dimension is not None and vectors.shape[1] != self.dimension:
+            raise ValueError(
+                f"Vectors of dimension {vectors.shape[1]} do not match the store's "
+                f"{self.dimension}"
+            )
+
+        n = len(self._keys)
+        self._reserve(n + len(keys), vectors.shape[1])
+        self._vectors[n : n + len(keys)] = vectors
+        self._vectors.flush()
+
+        self._keys.extend(keys)
+        for row, key in enumerate(keys, start=n):
+            self._rows[key] = row
+        tmp_path = self._keys_path + ".tmp.npy"
+        # Raw 16-byte records: an "S16" array would drop trailing zero bytes
+        np.save(tmp_path, np.frombuffer(b"".join(self._keys), dtype="V16"))
+        os.replace(tmp_path, self._keys_path)
+
+    def _reserve(self, n_rows, dimension):
+        """Make the vector file hold at least n_rows rows, doubling its capacity."""
+        capacity = 0 if self._vectors is None else len(self._vectors)
+        if n_rows <= capacity:
+            return
+        capacity = max(n_rows, 2 * capacity, 1024)
+        tmp_path = self._vectors_path + ".tmp.npy"
+        vectors = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=np.float32, shape=(capacity, dimension)
+        )
+        if self._vectors is not None:
+            vectors[: len(self._keys)] = self._vectors[: len(self._keys)]
+        vectors.flush()
+        del vectors
+        self._vectors = None
+        os.replace(tmp_path, self._vectors_path)
+        self._vectors = np.load(self._vectors_path, mmap_mode="r+")
+
+
+def _write_digits(buf, start, width, values, strip_leading_zeros):
+    """Write the width lowest decimal digits of values as ASCII into buf."""
+    power = 1
+    for k in range(width):
+        digit = (values // power) % 10 + ord("0")
+        if strip_leading_zeros and k > 0:
+            # 0 bytes are padding, removed once the whole block is laid out
+            digit = np.where(values >= power, digit, 0)
+        buf[..., start + width - 1 - k] = digit
+        power *= 10
+
+
+def _int_fields(values):
+    """(n, width) ASCII fields of an integer array, each followed by a comma."""
+    values = np.asarray(values, dtype=np.int64)
+    magnitude = np.abs(values)
+    width = len(str(int(magnitude.max()))) if len(values) else 1
+    buf = np.zeros((len(values), width + 2), dtype=np.uint8)
+    buf[:, 0] = np.where(values < 0, ord("-"), 0)
+    _write_digits(buf, 1, width, magnitude, strip_leading_zeros=True)
+    buf[:, -1] = ord(",")
+    return buf
+
+
+def _float_fields(values, decimals):
+    """(n, m, width) ASCII fields of a float array in %.{decimals}f notation."""
+    scale = 10**decimals
+    scaled = np.rint(values.astype(np.float64) * scale)
+    if not np.isfinite(scaled).all() or np.abs(scaled).max(initial=0) >= 2**62:
+        raise ValueError(
+            f"Vector values must be finite and small enough for {decimals} decimals"
+        )
+    scaled = scaled.astype(np.int64)
+    integer, fraction = np.divmod(np.abs(scaled), scale)
+
+    width = len(str(int(integer.max(initial=0))))
+    field = 1 + width + (1 + decimals if decimals else 0) + 1
+    buf = np.zeros(scaled.shape + (field,), dtype=np.uint8)
+    buf[..., 0] = np.where(scaled < 0, ord("-"), 0)
+    _write_digits(buf, 1, width, integer, strip_leading_zeros=True)
+    if decimals:
+        buf[..., 1 + width] = ord(".")
+        _write_digits(buf, 2 + width, decimals, fraction, strip_leading_zeros=False)
+    buf[..., -1] = ord(",")
+    buf[:, -1, -1] = ord("\n")
+    return buf
+
+
+def write_vector_csv(
+    node_ids, vectors, filename, data_dir=None, decimals=6, block_size=10_000
+):
+    """
+    Write the node ID + vector CSV read by TuringDB's LOAD VECTOR command.
+
+    Each line is the integer node ID followed by the vector components, in
+    %.{decimals}f notation. Rows are formatted a block at a time with array
+    operations, instead of one Python list per row.
+
+    Parameters
+    ----------
+    node_ids : array-like of int
+        TuringDB node IDs, one per vector.
+    vectors : np.ndarray
+        Array of shape (len(node_ids), dimension), e.g. from EmbeddingStore.embed.
+    filename : str
+        Name of the CSV file, to pass to LOAD VECTOR FROM.
+    data_dir : str or None
+        Directory to write the file to. Defaults to ~/.turing/data.
+    decimals : int, default=6
+        Digits after the decimal point.
+    block_size : int, default=10_000
+        Rows formatted at a time; bounds the extra memory used.
+
+    Returns
+    -------
+    str
+        The filename (without directory path) to pass to the LOAD VECTOR command.
+    """
+    if data_dir is None:
+        data_dir = os.path.expanduser("~/.turing/data")
+    os.makedirs(data_dir, exist_ok=True)
+    filepath = os.path.join(data_dir, filename)
+
+    node_ids = np.asarray(node_ids)
+    if len(node_ids) != len(vectors):
+        raise ValueError(f"Got {len(node_ids)} node IDs for {len(vectors)} vectors")
+
+    start_time = time.perf_counter()
+    with open(filepath, "wb") as f:
+        for start in range(0, len(node_ids), block_size):
+            ids = _int_fields(node_ids[start : start + block_size])
+            values = _float_fields(
+                np.asarray(vectors[start : start + block_size]), decimals
+            )
+            block = np.concatenate([ids, values.reshape(len(ids), -1)], axis=1)
+            f.write(block[block != 0].tobytes())
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Vector CSV written to: {filepath}")
+    print(
+        f"Wrote {len(node_ids):,} vectors in {elapsed:.2f}s "
+        f"({len(node_ids) / max(elapsed, 1e-9):,.0f} rows/s)"
+    )
+    return filename
+
+
+def vector_literal(vector, decimals=6):
+    """Cypher list literal of a vector, e.g. for VECTOR SEARCH ... FOR k [..]."""
+    fields = _float_fields(
+        np.asarray(vector, dtype=np.float32).reshape(1, -1), decimals
+    )
+    fields[:, -1, -1] = ord("]")
+    text = fields[fields != 0].tobytes().decode("ascii")
+    return "[" + text.replace(",", ", ")
+
+
+class VectorSearchIndex:
+    """
+    In-process top-k cosine similarity search, optionally within graph partitions.
+
+    Vectors are normalized once into a float32 matrix, or an int8 one with a
+    scale per row (4x less memory, about 2 digits of precision on scores).
+    Queries are scored in batches, one matrix product per block of rows, and
+    the best k are picked with argpartition rather than a full sort.
+
+    Parameters
+    ----------
+    node_ids : array-like
+        Node IDs, one per vector; row_of maps them back to rows.
+    vectors : np.ndarray
+        Array of shape (len(node_ids), dimension).
+    quantize : bool, default=False
+        Store int8 instead of float32.
+    block_size : int, default=65_536
+        Rows scored at a time, bounding the memory used by the score matrix.
+
+    Examples
+    --------
+    >>> index = VectorSearchIndex(articles_df["n"].astype(int), embeddings)
+    >>> index.add_partition_from_query(
+    ...     client,
+    ...     "topic",
+    ...     "MATCH (a:Article)-[:BELONGS_TO]->(t:Topic) RETURN a, t.name",
+    ... )
+    >>> ids, scores = index.search(model.encode(["graph databases"]), k=5,
+    ...                            partition="topic", value="Databases")
+    """
+
+    def __init__(self, node_ids, vectors, quantize=False, block_size=65_536):
+        self.node_ids = np.asarray(node_ids)
+        self.row_of = {
+            node_id: row for row, node_id in enumerate(self.node_ids.tolist())
+        }
+        self.block_size = block_size
+        self.partitions = {}
+
+        vectors = _normalize_rows(np.asarray(vectors, dtype=np.float32))
+        if len(vectors) != len(self.node_ids):
+            raise ValueError(
+                f"Got {len(self.node_ids)} node IDs for {len(vectors)} vectors"
+            )
+        if quantize:
+            peak = np.abs(vectors).max(axis=1, keepdims=True)
+            peak[peak == 0] = 1
+            self.matrix = np.rint(vectors * (127 / peak)).astype(np.int8)
+            self.row_scale = (peak[:, 0] / 127).astype(np.float32)
+        else:
+            self.matrix = vectors
+            self.row_scale = None
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def add_partition(self, name, values):
+        """
+        Index rows by a node attribute, for search(partition=name, value=...).
+
+        values maps node IDs to attribute values, as a dict or a pd.Series; a
+        node may appear several times to belong to several values. Nodes not in
+        the index are ignored.
+        """
+        import pandas as pd
+
+        values = pd.Series(values) if isinstance(values, dict) else values
+        rows = pd.Series(values.index.map(self.row_of), index=values.index)
+        found = rows.notna().to_numpy()
+        groups = pd.Series(rows.to_numpy()[found].astype(np.int64)).groupby(
+            values.to_numpy()[found]
+        )
+        self.partitions[name] = {
+            value: np.sort(group.to_numpy()) for value, group in groups
+        }
+
+    def add_partition_from_query(self, client, name, query):
+        """add_partition from one Cypher query returning (node ID, value) columns."""
+        df = client.query(query)
+        ids = df.iloc[:, 0]
+        if self.node_ids.dtype.kind in "iu":
+            ids = ids.astype(np.int64)
+        self.add_partition(name, dict(zip(ids.tolist(), df.iloc[:, 1].tolist())))
+
+    def search(self, queries, k=10, partition=None, value=None, rows=None):
+        """
+        Top-k nodes by cosine similarity, for one query or a batch.
+
+        Parameters
+        ----------
+        queries : np.ndarray
+            One vector of shape (dimension,) or a batch (n_queries, dimension).
+        k : int, default=10
+            Number of results per query.
+        partition, value : optional
+            Only search rows whose partition attribute equals value.
+        rows : array-like of int, optional
+            Only search these rows (e.g. from row_of), combined with partition.
+
+        Returns
+        -------
+        ids, scores : np.ndarray
+            Node IDs and similarities, best first, of shape (k,) for a single
+            query or (n_queries, k) for a batch. Fewer than k are returned if the
+            searched rows are fewer.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        single = queries.ndim == 1
+        queries = _normalize_rows(queries.reshape(1, -1) if single else queries)
+
+        candidates = None
+        if partition is not None:
+            candidates = self.partitions[partition].get(
+                value, np.empty(0, dtype=np.int64)
+            )
+        if rows is not None:
+            rows = np.asarray(rows, dtype=np.int64)
+            candidates = (
+                rows if candidates is None else np.intersect1d(candidates, rows)
+            )
+
+        best_rows, best_scores = self._top_k(queries, k, candidates)
+        ids, scores = self.node_ids[best_rows], best_scores
+        if single:
+            return ids[0], scores[0]
+        return ids, scores
+
+    def _top_k(self, queries, k, candidates=None):
+        n = len(self) if candidates is None else len(candidates)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+
+        for start in range(0, n, self.block_size):
+            if candidates is None:
+                block_rows = np.arange(start, min(start + self.block_size, n))
+                block = self.matrix[start : start + self.block_size]
+            else:
+                block_rows = candidates[start : start + self.block_size]
+                block = self.matrix[block_rows]
+            scores = queries @ block.astype(np.float32, copy=False).T
+            if self.row_scale is not None:
+                scores *= self.row_scale[block_rows]
+
+            scores = np.concatenate([best_scores, scores], axis=1)
+            rows = np.concatenate(
+                [
+                    best_rows,
+                    np.broadcast_to(block_rows, (len(queries), len(block_rows))),
+                ],
+                axis=1,
+            )
+            if scores.shape[1] > k:
+                keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, keep, axis=1)
+                rows = np.take_along_axis(rows, keep, axis=1)
+            best_rows, best_scores = rows, scores
+
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        return (
+            np.take_along_axis(best_rows, order, axis=1),
+            np.take_along_axis(best_scores, order, axis=1),
+        )
+
+
+def _normalize_rows(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+
+# Model loaded once per worker process by _init_encode_worker
+_WORKER_MODEL = None
+
+
+def _load_model(model, device):
+    if isinstance(model, str):
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer(model, device=device)
+    return model()
+
+
+def _init_encode_worker(model, device, n_threads):
+    global _WORKER_MODEL
+    if n_threads:
+        try:
+            import torch
+
+            # Share the cores between workers instead of oversubscribing them
+            torch.set_num_threads(n_threads)
+        except ImportError:
+            pass
+    _WORKER_MODEL = _load_model(model, device)
+
+
+def _encode_batch(texts, batch_size):
+    vectors = _WORKER_MODEL.encode(texts, batch_size=batch_size)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def _length_batches(texts, batch_size):
+    """Index batches of texts of similar length, longest batches first."""
+    lengths = np.fromiter((len(text) for text in texts), np.int64, len(texts))
+    order = np.argsort(-lengths, kind="stable")
+    return [
+        order[start : start + batch_size] for start in range(0, len(order), batch_size)
+    ]
+
+
+def encode_parallel(
+    texts,
+    model,
+    n_workers=None,
+    batch_size=64,
+    device="cpu",
+    out=None,
+):
+    """
+    Embed texts with a pool of worker processes, batching texts by length.
+
+    Texts are sorted by length and cut into batches, so each batch pads to
+    similar lengths, and batches are shared out to the workers longest first.
+    Each worker loads the model once and gets an equal share of the CPU threads.
+    Results are written into the output array at their original positions.
+
+    Parameters
+    ----------
+    texts : list of str
+        Texts to embed.
+    model : str or callable
+        SentenceTransformer model name, or a picklable function returning an
+        object with an encode(texts, batch_size=...) method.
+    n_workers : int or None
+        Number of worker processes; None uses every CPU. With 1, texts are
+        encoded in this process (still batched by length).
+    batch_size : int, default=64
+        Texts per batch.
+    device : str, default="cpu"
+        Device passed to SentenceTransformer.
+    out : np.ndarray or None
+        float32 array of shape (len(texts), dimension) to fill, e.g. a memmap.
+        Allocated when None.
+
+    Returns
+    -------
+    np.ndarray
+        The embeddings, in the order of texts.
+
+    Notes
+    -----
+    Can be passed to EmbeddingStore.embed as the model, to parallelize only the
+    texts missing from the store:
+    ``store.embed(texts, functools.partial(encode_parallel, model=name))``.
+    """
+    import os
+    import time
+    from collections import deque
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    batches = _length_batches(texts, batch_size)
+    start_time = time.perf_counter()
+
+    def store(rows, vectors):
+        nonlocal out
+        if out is None:
+            out = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+        out[rows] = vectors
+
+    if n_workers <= 1:
+        encoder = _load_model(model, device)
+        for rows in batches:
+            batch = [texts[i] for i in rows]
+            store(rows, np.asarray(encoder.encode(batch, batch_size=batch_size)))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        n_threads = max(1, (os.cpu_count() or 1) // n_workers)
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_encode_worker,
+            initargs=(model, device, n_threads),
+        ) as executor:
+            pending = deque()
+            for rows in batches:
+                batch = [texts[i] for i in rows]
+                pending.append(
+                    (rows, executor.submit(_encode_batch, batch, batch_size))
+                )
+                if len(pending) >= 4 * n_workers:
+                    rows, future = pending.popleft()
+                    store(rows, future.result())
+            while pending:
+                rows, future = pending.popleft()
+                store(rows, future.result())
+
+    elapsed = time.perf_counter() - start_time
+    print(
+        f"Encoded {len(texts):,} texts in {elapsed:.2f}s "
+        f"({len(texts) / max(elapsed, 1e-9):,.0f} sentences/s, "
+        f"n_workers={n_workers}, batch_size={batch_size})"
+    )
+    if out is None:
+        out = np.empty((0, 0), dtype=np.float32)
+    return out
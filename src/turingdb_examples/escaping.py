@@ -0,0 +1,115 @@
+"""
+Escaping of values for Cypher string literals.
+
+Backslash, double quote, newline, carriage return and tab become \\\\, \\",
+\\n, \\r and \\t. utils.escape_for_cypher and the Cypher exporters of graph.py
+all go through escape_value, so they give the same text for the same value.
+
+The escapes are chained str.replace calls rather than one str.translate table:
+translating to multi-character replacements goes through CPython's per-character
+mapping path, several times slower than five replace() scans on short values.
+
+Property values repeat a lot (blood types, transaction types, countries, ...),
+so escape_string remembers the escaped text of the strings it has seen, up to
+_MEMO_SIZE of them. escape_series escapes each distinct value of a Series once,
+or, when nearly every value is distinct, all of them as one joined string.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+# Escaped text of recently seen strings; emptied when full, so columns of unique
+# values (IDs, free text) do not pin memory
+_MEMO_SIZE = 65_536
+_memo = {}
+
+# Joins the values of a Series escaped in one go; left alone by _escape
+_SEPARATOR = "\x00"
+
+
+def _escape(text):
+    # Backslash first, so the backslashes added by the other escapes are kept
+    return (
+        text.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+        .replace("\t", "\\t")
+    )
+
+
+def escape_string(value):
+    """Escape a str for use between double quotes in a Cypher query."""
+    escaped = _memo.get(value)
+    if escaped is None:
+        escaped = _escape(value)
+        if len(_memo) >= _MEMO_SIZE:
+            _memo.clear()
+        _memo[value] = escaped
+    return escaped
+
+
+def _is_missing(value):
+    if value is None or value is pd.NA or value is pd.NaT:
+        return True
+    return isinstance(value, (float, np.floating)) and math.isnan(value)
+
+
+def _text(value):
+    """Unescaped text of a value: "" when missing, else str(value)."""
+    if isinstance(value, str):
+        return value
+    return "" if _is_missing(value) else str(value)
+
+
+def escape_value(value):
+    """
+    Escape any value as text for a Cypher string literal.
+
+    Missing values (None, NaN, pd.NA, pd.NaT) give "", other non-strings their
+    str() form, escaped like strings.
+    """
+    if isinstance(value, str):
+        return escape_string(value)
+    return escape_string(_text(value))
+
+
+def _escape_all(values):
+    """escape_value of every item of a list, as a list."""
+    texts = [v if v.__class__ is str else _text(v) for v in values]
+    joined = _SEPARATOR.join(texts)
+    if joined.count(_SEPARATOR) != len(texts) - 1:
+        # A value holds the separator itself
+        return [_escape(text) for text in texts]
+    return _escape(joined).split(_SEPARATOR) if texts else []
+
+
+def escape_series(series, sample_size=10_000):
+    """
+    escape_value applied to a whole Series.
+
+    Low-cardinality columns are factorized and each distinct value escaped once;
+    when a sample of sample_size values is mostly distinct, all values are
+    escaped at once instead.
+
+    Returns
+    -------
+    pd.Series of str, with the index of series.
+    """
+    values = series.to_numpy(dtype=object)
+    sample = values[:sample_size]
+    if len(sample) and len(pd.unique(sample)) > len(sample) // 2:
+        escaped = _escape_all(values.tolist())
+        return pd.Series(escaped, index=series.index, dtype=object)
+
+    codes, uniques = pd.factorize(values)
+    # Code -1 (missing) picks the trailing ""
+    escaped = np.array(_escape_all(list(uniques)) + [""], dtype=object)
+    return pd.Series(escaped[codes], index=series.index, dtype=object)
+
+
+def cypher_string(value):
+    """Double-quoted Cypher string literal of value."""
+    return '"' + escape_value(value) + '"'
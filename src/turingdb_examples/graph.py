@@ -1,8 +1,19 @@
+import hashlib
+import json
+import math
+import re
+import numpy as np
 import pandas as pd
 import networkx as nx
+from itertools import groupby, repeat
 from typing import Union, Dict, List, Optional
 
+from .escaping import cypher_string, escape_string, escape_value
+from .schema import TYPES, coerce_types, infer_schema
+from .tracing import count, span, traced
 
+
+@traced("create_graph_from_df")
 def create_graph_from_df(
     df: pd.DataFrame,
     *,
@@ -19,6 +30,8 @@ def create_graph_from_df(
     edge_col_label: Optional[str] = None,
     node_attributes_df: Optional[pd.DataFrame] = None,
     node_attributes_key_col: str = "id",
+    engine: str = "rows",
+    property_types: Union[str, Dict[str, str], None] = None,
 ) -> Union[nx.Graph, nx.DiGraph]:
     """
     Create a NetworkX graph from a pandas DataFrame.
@@ -87,6 +100,28 @@ def create_graph_from_df(
     node_attributes_key_col : str, default='id'
         Column name in node_attributes_df used to match nodes.
 
+    engine : {'rows', 'columnar'}, default='rows'
+        How the DataFrame is walked.
+        'rows': iterate with df.iterrows(), one node/edge at a time.
+        'columnar': build the node and edge tables with whole-column pandas/NumPy
+        operations (factorized ID dedup, joined node_attributes_df) and add them to
+        the graph in bulk. Produces the same graph as 'rows', much faster on large
+        DataFrames.
+
+    property_types : 'infer', dict or None, default=None
+        Type the node and edge properties before building the graph.
+        None: values are stored as they are in the DataFrame.
+        'infer': the type of every attribute column (and node_attributes_df
+        column) is inferred from its values with turingdb_examples.schema
+        (int, float, bool, date, datetime or string) and the column is converted
+        once, so e.g. numbers read as strings from a CSV become numbers.
+        dict: column name -> type for the columns whose type is known, the
+        others are inferred.
+        The schema is printed; see also graph_schema. Types are per column, not
+        per node label or edge type: a column that holds the property of
+        several labels (source nodes of different types, say) gets one type,
+        inferred from all of its values.
+
     Returns
     -------
     G : nx.DiGraph or nx.Graph
@@ -125,19 +160,284 @@ def create_graph_from_df(
     """
     label_str = "displayName"
 
-    # Strip whitespace from string columns in main DataFrame
+    if engine not in ("rows", "columnar"):
+        raise ValueError(f"Unsupported engine: {engine}")
+    count("rows", len(df))
+
+    with span("validate_columns", columns=len(df.columns)):
+        # Strip whitespace from string columns in main DataFrame
+        df = _strip_string_columns(df)
+
+        # Strip whitespace from node_attributes_df if provided
+        if node_attributes_df is not None:
+            node_attributes_df = _strip_string_columns(node_attributes_df)
+
+        source_info, target_info, source_attrs, target_attrs, edge_attrs = (
+            _resolve_column_spec(
+                df.columns,
+                source_node_col=source_node_col,
+                target_node_col=target_node_col,
+                attributes_source_node_cols=attributes_source_node_cols,
+                attributes_target_node_cols=attributes_target_node_cols,
+                optional_nodes_cols=optional_nodes_cols,
+                attributes_edges=attributes_edges,
+                edge_col=edge_col,
+            )
+        )
+
+    if property_types is not None:
+        attribute_cols = _attribute_columns(
+            source_info,
+            target_info,
+            source_attrs,
+            target_attrs,
+            edge_attrs,
+            optional_nodes_cols,
+        )
+        df = coerce_types(df, _property_schema(df, property_types, attribute_cols))
+        if node_attributes_df is not None:
+            node_attributes_df = _typed_node_attributes(
+                node_attributes_df, node_attributes_key_col, property_types
+            )
+
+    # Create a directed or undirected graph
+    G = nx.DiGraph() if directed else nx.Graph()
+
+    # Create lookup dict for node attributes if provided
+    node_attrs_lookup = {}
+    unique_node_attrs = None
+    if node_attributes_df is not None:
+        # Drop duplicates based on key column to ensure unique index
+        unique_node_attrs = node_attributes_df.drop_duplicates(
+            subset=[node_attributes_key_col]
+        ).set_index(node_attributes_key_col)
+        if engine == "rows":
+            node_attrs_lookup = unique_node_attrs.to_dict("index")
+
+    if engine == "columnar":
+        slots, edge_kinds = _columnar_layout(
+            df,
+            source_info,
+            target_info,
+            source_attrs,
+            target_attrs,
+            edge_attrs,
+            optional_nodes_cols,
+            edge_col,
+            edge_col_label,
+        )
+        nodes, edges = _columnar_tables(df, slots, edge_kinds, unique_node_attrs)
+        with span("graph_insert", nodes=len(nodes[0]), edges=len(edges[0])):
+            _bulk_add(G, nodes, edges)
+        return G
+
+    # Function to add a node to the graph with its attributes
+    def add_node_with_attrs(
+        row,
+        node_id_col,
+        node_label_col,
+        node_type_val,
+        is_type_column,
+        attr_cols,
+        node_prefix="",
+    ):
+        if pd.isna(row[node_id_col]):
+            return None
+
+        node_id = row[node_id_col]
+
+        # Skip if node_id is NaN
+        if pd.isna(node_id):
+            return None
+
+        # Add node if it doesn't exist yet
+        if node_id not in G:
+            # Set node attributes
+            node_attrs = {}
+
+            # Add label if specified
+            if node_label_col:
+                label = (
+                    row[node_label_col] if not pd.isna(row[node_label_col]) else node_id
+                )
+                node_attrs[label_str] = label
+            else:
+                node_attrs[label_str] = str(node_id)
+
+            # Add type if specified
+            if node_type_val is not None:
+                if is_type_column:
+                    # Type from column
+                    node_type = (
+                        row[node_type_val] if not pd.isna(row[node_type_val]) else None
+                    )
+                    if node_type:
+                        node_attrs["type"] = node_type
+                else:
+                    # Type as constant value
+                    node_attrs["type"] = node_type_val
+
+            # Add other attributes from row
+            for attr_col in attr_cols:
+                if attr_col in row and not pd.isna(row[attr_col]):
+                    attr_name = f"{node_prefix}{attr_col}" if node_prefix else attr_col
+                    node_attrs[attr_name] = row[attr_col]
+
+            # Add attributes from node_attributes_df if available
+            if node_id in node_attrs_lookup:
+                for attr_name, attr_value in node_attrs_lookup[node_id].items():
+                    if not pd.isna(attr_value):
+                        node_attrs[attr_name] = attr_value
+
+            G.add_node(node_id, **node_attrs)
+
+        return node_id
+
+    # Nodes and edges are added in the same pass over the rows
+    with span("row_pass", rows=len(df)):
+        # Process each row in the DataFrame
+        for idx, row in df.iterrows():
+            # Add source node (always required)
+            source_id = add_node_with_attrs(
+                row,
+                source_info["id"],
+                source_info[label_str],
+                source_info["type"],
+                source_info["is_type_column"],
+                source_attrs,
+                node_prefix="",
+            )
+
+            # Skip if source is None
+            if source_id is None:
+                continue
+
+            # Add target node only if target_node_col is specified
+            target_id = None
+            if target_info:
+                target_id = add_node_with_attrs(
+                    row,
+                    target_info["id"],
+                    target_info[label_str],
+                    target_info["type"],
+                    target_info["is_type_column"],
+                    target_attrs,
+                    node_prefix="",
+                )
+
+                # Add edge between source and target with attributes (only if both nodes exist)
+                if target_id is not None:
+                    edge_attributes = {}
+
+                    # Add edge type if specified
+                    if edge_col and edge_col in row and not pd.isna(row[edge_col]):
+                        if edge_col_label is None:
+                            edge_col_label = edge_col
+                        edge_attributes[edge_col_label] = row[edge_col]
+
+                    # Add edge attributes
+                    for attr_col in edge_attrs:
+                        if attr_col in row and not pd.isna(row[attr_col]):
+                            edge_attributes[attr_col] = row[attr_col]
+
+                    G.add_edge(source_id, target_id, **edge_attributes)
+
+            # Process optional node sets
+            if optional_nodes_cols:
+                for node_set, config in optional_nodes_cols.items():
+                    # Extract node information - use key name as default for id
+                    node_id_col = config.get("id", node_set)
+                    node_label_col = config.get(label_str)
+
+                    # Handle node type (column reference or constant value)
+                    if "type" in config:
+                        # Explicitly specified type
+                        node_type_val = config["type"]
+                        is_type_column = (
+                            isinstance(node_type_val, str) and node_type_val in df.columns
+                        )
+                    else:
+                        # Default to node_set key as constant type
+                        node_type_val = node_set
+                        is_type_column = False  # Always treat default as constant
+
+                    node_attr_cols = _as_list(config.get("attributes", []))
+
+                    # Add optional node
+                    opt_node_id = add_node_with_attrs(
+                        row,
+                        node_id_col,
+                        node_label_col,
+                        node_type_val,
+                        is_type_column,
+                        node_attr_cols,
+                        node_prefix="",
+                    )
+
+                    if opt_node_id is None:
+                        continue
+
+                    # Connect to source if specified
+                    if config.get("link_to_source", False):
+                        edge_attrs_to_source = {}
+
+                        # Add edge type if specified
+                        if "edge_type_to_source" in config:
+                            edge_attrs_to_source["type"] = config["edge_type_to_source"]
+
+                        # Add edge attributes if specified
+                        if "edge_attributes" in config:
+                            for attr_col in _as_list(config["edge_attributes"]):
+                                if attr_col in row and not pd.isna(row[attr_col]):
+                                    edge_attrs_to_source[attr_col] = row[attr_col]
+
+                        G.add_edge(source_id, opt_node_id, **edge_attrs_to_source)
+
+                    # Connect to target if specified (only if target exists)
+                    if config.get("link_to_target", False) and target_id is not None:
+                        edge_attrs_to_target = {}
+
+                        # Add edge type if specified
+                        if "edge_type_to_target" in config:
+                            edge_attrs_to_target["type"] = config["edge_type_to_target"]
+
+                        # Add edge attributes if specified
+                        if "edge_attributes" in config:
+                            for attr_col in _as_list(config["edge_attributes"]):
+                                if attr_col in row and not pd.isna(row[attr_col]):
+                                    edge_attrs_to_target[attr_col] = row[attr_col]
+
+                        G.add_edge(opt_node_id, target_id, **edge_attrs_to_target)
+
+    return G
+
+
+def _strip_string_columns(df):
+    """Return a copy of df with whitespace stripped from its string columns."""
     df = df.copy()
     for col in df.select_dtypes(include=["object"]).columns:
         df[col] = df[col].astype(str).str.strip()
+    return df
 
-    # Strip whitespace from node_attributes_df if provided
-    if node_attributes_df is not None:
-        node_attributes_df = node_attributes_df.copy()
-        for col in node_attributes_df.select_dtypes(include=["object"]).columns:
-            node_attributes_df[col] = node_attributes_df[col].astype(str).str.strip()
 
-    # Create a directed or undirected graph
-    G = nx.DiGraph() if directed else nx.Graph()
+def _resolve_column_spec(
+    columns,
+    *,
+    source_node_col,
+    target_node_col,
+    attributes_source_node_cols,
+    attributes_target_node_cols,
+    optional_nodes_cols,
+    attributes_edges,
+    edge_col,
+):
+    """
+    Resolve and validate the column spec of create_graph_from_df.
+
+    Returns (source_info, target_info, source_attrs, target_attrs, edge_attrs).
+    Raises ValueError if a column the spec refers to is missing.
+    """
+    label_str = "displayName"
 
     # Helper function to process node columns
     def process_node_info(col_spec):
@@ -155,7 +455,7 @@ def create_graph_from_df(
 
             # If type is specified and is a string that exists as a column, it's a column reference
             # Otherwise, it's treated as a constant value
-            if isinstance(type_value, str) and type_value in df.columns:
+            if isinstance(type_value, str) and type_value in columns:
                 is_type_column = True
 
             return {
@@ -230,246 +530,434 @@ def create_graph_from_df(
                     required_cols.extend(config["edge_attributes"])
 
     # Check if all required columns exist in DataFrame
-    missing_cols = [col for col in required_cols if col not in df.columns]
+    missing_cols = [col for col in required_cols if col not in columns]
     if missing_cols:
         raise ValueError(f"Missing required columns in DataFrame: {missing_cols}")
 
-    # Helper function to normalize attributes to a list
-    def normalize_attr(attr):
-        if attr is None:
-            return []
-        elif isinstance(attr, str):
-            return [attr]
-        return list(attr)
-
     # Normalize attribute lists
-    source_attrs = normalize_attr(attributes_source_node_cols)
-    target_attrs = normalize_attr(attributes_target_node_cols) if target_info else []
-    edge_attrs = normalize_attr(attributes_edges) if target_info else []
+    source_attrs = _as_list(attributes_source_node_cols)
+    target_attrs = _as_list(attributes_target_node_cols) if target_info else []
+    edge_attrs = _as_list(attributes_edges) if target_info else []
+
+    return source_info, target_info, source_attrs, target_attrs, edge_attrs
+
+
+def _as_list(attr):
+    if attr is None:
+        return []
+    elif isinstance(attr, str):
+        return [attr]
+    return list(attr)
+
+
+def _attribute_columns(
+    source_info,
+    target_info,
+    source_attrs,
+    target_attrs,
+    edge_attrs,
+    optional_nodes_cols,
+):
+    """Property columns of a resolved column spec, without the ID and type columns."""
+    columns = list(source_attrs) + list(target_attrs) + list(edge_attrs)
+    for config in (optional_nodes_cols or {}).values():
+        columns += _as_list(config.get("attributes"))
+        columns += _as_list(config.get("edge_attributes"))
+    structural = {source_info["id"], source_info["displayName"]}
+    if target_info:
+        structural |= {target_info["id"], target_info["displayName"]}
+    return [col for col in dict.fromkeys(columns) if col not in structural]
 
-    # Create lookup dict for node attributes if provided
-    node_attrs_lookup = {}
-    if node_attributes_df is not None:
-        # Drop duplicates based on key column to ensure unique index
-        unique_node_attrs = node_attributes_df.drop_duplicates(
-            subset=[node_attributes_key_col]
-        )
-        node_attrs_lookup = unique_node_attrs.set_index(
-            node_attributes_key_col
-        ).to_dict("index")
 
-    # Function to add a node to the graph with its attributes
-    def add_node_with_attrs(
-        row,
-        node_id_col,
-        node_label_col,
-        node_type_val,
-        is_type_column,
-        attr_cols,
-        node_prefix="",
-    ):
-        if pd.isna(row[node_id_col]):
-            return None
+def _typed_node_attributes(node_attributes_df, key_col, property_types):
+    """node_attributes_df with its columns but key_col converted per property_types."""
+    columns = [col for col in node_attributes_df.columns if col != key_col]
+    schema = _property_schema(node_attributes_df, property_types, columns)
+    return coerce_types(node_attributes_df, schema)
 
-        node_id = row[node_id_col]
 
-        # Skip if node_id is NaN
-        if pd.isna(node_id):
-            return None
+def _property_schema(df, property_types, columns):
+    """
+    Schema of the property columns for the property_types argument.
 
-        # Add node if it doesn't exist yet
-        if node_id not in G:
-            # Set node attributes
-            node_attrs = {}
+    None gives an empty schema (values are exported as they are), "infer" infers
+    every column, and a dict fixes the type of some columns and infers the rest.
+    Types are inferred from the rows of df only, one per column whatever the
+    node labels or edge types of its rows.
+    """
+    if property_types is None:
+        return {}
+    if isinstance(property_types, str):
+        if property_types != "infer":
+            raise ValueError(f"Unsupported property_types: {property_types}")
+        property_types = {}
+    elif not isinstance(property_types, dict):
+        raise ValueError(f"Unsupported property_types: {property_types}")
+
+    unsupported = {t for t in property_types.values() if t not in TYPES}
+    if unsupported:
+        raise ValueError(f"Unsupported property types: {sorted(unsupported)}")
+    columns = [col for col in dict.fromkeys(columns) if col in df.columns]
+    with span("infer_types", columns=len(columns)):
+        inferred = infer_schema(
+            df, [col for col in columns if col not in property_types]
+        )
+    schema = {col: property_types.get(col, inferred.get(col)) for col in columns}
+    if schema:
+        print(
+            "Inferred property types: "
+            + ", ".join(f"{col}: {column_type}" for col, column_type in schema.items())
+        )
+    return schema
+
+
+def _columnar_layout(
+    df,
+    source_info,
+    target_info,
+    source_attrs,
+    target_attrs,
+    edge_attrs,
+    optional_nodes_cols,
+    edge_col,
+    edge_col_label,
+):
+    """
+    Describe the node slots and edge kinds produced by each DataFrame row.
 
-            # Add label if specified
-            if node_label_col:
-                label = (
-                    row[node_label_col] if not pd.isna(row[node_label_col]) else node_id
-                )
-                node_attrs[label_str] = label
-            else:
-                node_attrs[label_str] = str(node_id)
+    Slots and edge kinds are listed in the order create_graph_from_df visits them
+    within a row, which is what keeps the columnar engine's output identical to
+    the row-wise one.
+    """
+    label_str = "displayName"
 
-            # Add type if specified
-            if node_type_val is not None:
-                if is_type_column:
-                    # Type from column
-                    node_type = (
-                        row[node_type_val] if not pd.isna(row[node_type_val]) else None
-                    )
-                    if node_type:
-                        node_attrs["type"] = node_type
-                else:
-                    # Type as constant value
-                    node_attrs["type"] = node_type_val
+    def slot(info, attrs):
+        return {
+            "id": info["id"],
+            "label": info[label_str],
+            "type": info["type"],
+            "is_type_column": info["is_type_column"],
+            "attributes": attrs,
+        }
 
-            # Add other attributes from row
-            for attr_col in attr_cols:
-                if attr_col in row and not pd.isna(row[attr_col]):
-                    attr_name = f"{node_prefix}{attr_col}" if node_prefix else attr_col
-                    node_attrs[attr_name] = row[attr_col]
+    slots = [slot(source_info, source_attrs)]
+    edge_kinds = []
 
-            # Add attributes from node_attributes_df if available
-            if node_id in node_attrs_lookup:
-                for attr_name, attr_value in node_attrs_lookup[node_id].items():
-                    if not pd.isna(attr_value):
-                        node_attrs[attr_name] = attr_value
+    if target_info:
+        slots.append(slot(target_info, target_attrs))
+        columns = [(edge_col_label or edge_col, edge_col)] if edge_col else []
+        columns.extend((attr_col, attr_col) for attr_col in edge_attrs)
+        edge_kinds.append({"start": 0, "end": 1, "constants": [], "columns": columns})
+
+    for node_set, config in (optional_nodes_cols or {}).items():
+        if "type" in config:
+            node_type_val = config["type"]
+            is_type_column = isinstance(node_type_val, str) and node_type_val in df.columns
+        else:
+            node_type_val = node_set
+            is_type_column = False
 
-            G.add_node(node_id, **node_attrs)
+        slots.append(
+            {
+                "id": config.get("id", node_set),
+                "label": config.get(label_str),
+                "type": node_type_val,
+                "is_type_column": is_type_column,
+                "attributes": _as_list(config.get("attributes", [])),
+            }
+        )
+        opt_slot = len(slots) - 1
+        columns = [
+            (attr_col, attr_col) for attr_col in _as_list(config.get("edge_attributes"))
+        ]
+
+        if config.get("link_to_source", False):
+            constants = (
+                [("type", config["edge_type_to_source"])]
+                if "edge_type_to_source" in config
+                else []
+            )
+            edge_kinds.append(
+                {"start": 0, "end": opt_slot, "constants": constants, "columns": columns}
+            )
 
-        return node_id
+        if config.get("link_to_target", False) and target_info:
+            constants = (
+                [("type", config["edge_type_to_target"])]
+                if "edge_type_to_target" in config
+                else []
+            )
+            edge_kinds.append(
+                {"start": opt_slot, "end": 1, "constants": constants, "columns": columns}
+            )
 
-    # Process each row in the DataFrame
-    for idx, row in df.iterrows():
-        # Add source node (always required)
-        source_id = add_node_with_attrs(
-            row,
-            source_info["id"],
-            source_info[label_str],
-            source_info["type"],
-            source_info["is_type_column"],
-            source_attrs,
-            node_prefix="",
-        )
+    return slots, edge_kinds
 
-        # Skip if source is None
-        if source_id is None:
-            continue
 
-        # Add target node only if target_node_col is specified
-        target_id = None
-        if target_info:
-            target_id = add_node_with_attrs(
-                row,
-                target_info["id"],
-                target_info[label_str],
-                target_info["type"],
-                target_info["is_type_column"],
-                target_attrs,
-                node_prefix="",
-            )
+def _attr_dicts(n, columns, constants=()):
+    """
+    Turn (key, values, keep) columns into one attribute dict per row.
 
-            # Add edge between source and target with attributes (only if both nodes exist)
-            if target_id is not None:
-                edge_attributes = {}
-
-                # Add edge type if specified
-                if edge_col and edge_col in row and not pd.isna(row[edge_col]):
-                    if edge_col_label is None:
-                        edge_col_label = edge_col
-                    edge_attributes[edge_col_label] = row[edge_col]
-
-                # Add edge attributes
-                for attr_col in edge_attrs:
-                    if attr_col in row and not pd.isna(row[attr_col]):
-                        edge_attributes[attr_col] = row[attr_col]
-
-                G.add_edge(source_id, target_id, **edge_attributes)
-
-        # Process optional node sets
-        if optional_nodes_cols:
-            for node_set, config in optional_nodes_cols.items():
-                # Extract node information - use key name as default for id
-                node_id_col = config.get("id", node_set)
-                node_label_col = config.get(label_str)
-
-                # Handle node type (column reference or constant value)
-                if "type" in config:
-                    # Explicitly specified type
-                    node_type_val = config["type"]
-                    is_type_column = (
-                        isinstance(node_type_val, str) and node_type_val in df.columns
-                    )
-                else:
-                    # Default to node_set key as constant type
-                    node_type_val = node_set
-                    is_type_column = False  # Always treat default as constant
+    keep is a boolean array marking the rows where the value is set, or None when
+    it is set on every row. Keys keep the order they are first set in, as with
+    successive `attrs[key] = value` assignments.
+    """
+    base = dict(constants)
+    if len(base) == 1:
+        ((base_key, base_value),) = base.items()
+        dicts = [{base_key: base_value} for _ in range(n)]
+    else:
+        dicts = [base.copy() for _ in range(n)] if base else None
+    for key, values, keep in columns:
+        if keep is None or keep.all():
+            if dicts is None:
+                dicts = [{key: value} for value in values]
+            else:
+                for attrs, value in zip(dicts, values):
+                    attrs[key] = value
+        else:
+            if dicts is None:
+                dicts = [{} for _ in range(n)]
+            for i in np.flatnonzero(keep).tolist():
+                dicts[i][key] = values[i]
+    return dicts if dicts is not None else [{} for _ in range(n)]
 
-                node_attr_cols = normalize_attr(config.get("attributes", []))
 
-                # Add optional node
-                opt_node_id = add_node_with_attrs(
-                    row,
-                    node_id_col,
-                    node_label_col,
-                    node_type_val,
-                    is_type_column,
-                    node_attr_cols,
-                    node_prefix="",
-                )
+def _bulk_add(G, nodes, edges):
+    """
+    Add prebuilt nodes and edges to a fresh graph G.
 
-                if opt_node_id is None:
-                    continue
+    nodes is a (node_ids, attrs) pair of sequences, edges a (sources, targets, attrs)
+    triple, node IDs unique and covering every edge endpoint. An edge repeating a
+    (source, target) pair updates the first one's attributes, as add_edge does.
 
-                # Connect to source if specified
-                if config.get("link_to_source", False):
-                    edge_attrs_to_source = {}
+    For an empty, plain nx.Graph or nx.DiGraph, the dicts are written straight into
+    its adjacency (about twice as fast as add_nodes_from / add_edges_from, which
+    check and copy every item); any other graph goes through the public API.
+    """
+    internals = ("_node", "_adj", "_pred") if G.is_directed() else ("_node", "_adj")
+    if (
+        type(G) not in (nx.Graph, nx.DiGraph)
+        or len(G)
+        or not all(isinstance(getattr(G, name, None), dict) for name in internals)
+    ):
+        G.add_nodes_from(zip(*nodes))
+        G.add_edges_from(zip(*edges))
+        return
+
+    node, adj = G._node, G._adj
+    pred = G._pred if G.is_directed() else adj
+    for node_id, attrs in zip(*nodes):
+        node[node_id] = attrs
+        adj[node_id] = {}
+        if pred is not adj:
+            pred[node_id] = {}
+    for u, v, attrs in zip(*edges):
+        data = adj[u].get(v)
+        if data is None:
+            adj[u][v] = attrs
+            pred[v][u] = attrs
+        else:
+            data.update(attrs)
 
-                    # Add edge type if specified
-                    if "edge_type_to_source" in config:
-                        edge_attrs_to_source["type"] = config["edge_type_to_source"]
 
-                    # Add edge attributes if specified
-                    if "edge_attributes" in config:
-                        for attr_col in normalize_attr(config["edge_attributes"]):
-                            if attr_col in row and not pd.isna(row[attr_col]):
-                                edge_attrs_to_source[attr_col] = row[attr_col]
+def _columnar_tables(df, slots, edge_kinds, node_attributes=None, known_ids=None):
+    """
+    Build the node and edge tables of create_graph_from_df with column operations.
 
-                    G.add_edge(source_id, opt_node_id, **edge_attrs_to_source)
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The cleaned input DataFrame.
+    slots, edge_kinds : list
+        Layout returned by _columnar_layout.
+    node_attributes : pd.DataFrame or None
+        node_attributes_df deduplicated and indexed by its key column.
+    known_ids : container or None
+        Node IDs already emitted (e.g. by a previous chunk); they are left out of
+        the returned nodes.
 
-                # Connect to target if specified (only if target exists)
-                if config.get("link_to_target", False) and target_id is not None:
-                    edge_attrs_to_target = {}
+    Returns
+    -------
+    nodes : (node_ids, attrs)
+        Unique nodes in first-seen order.
+    edges : (sources, targets, attrs)
+        Edges in row order.
+    """
+    # df.iterrows() boxes every row to one common dtype; do the same per column
+    row_dtype = df.iloc[:0].to_numpy().dtype
+    n_slots = len(slots)
+    arrays = {}
+
+    def column_array(col):
+        if col not in arrays:
+            values = df[col].to_numpy(dtype=row_dtype)
+            arrays[col] = (values, ~pd.isna(values))
+        return arrays[col]
+
+    def column(col, positions):
+        values, present = column_array(col)
+        return values[positions], present[positions]
+
+    def as_objects(values):
+        # Keep NumPy scalars as they are, like the row Series of a numeric frame
+        if values.dtype == object:
+            return values
+        return np.fromiter(values, dtype=object, count=len(values))
+
+    with span("node_pass") as node_pass:
+        # A row only counts if its source node is set
+        source_valid = column_array(slots[0]["id"])[1]
+        valid = [source_valid] + [
+            source_valid & column_array(slot["id"])[1] for slot in slots[1:]
+        ]
+        positions = [np.flatnonzero(mask) for mask in valid]
+
+        # Nodes: the first occurrence in (row, slot) order wins, as with `node_id not in G`
+        ids = np.concatenate(
+            [as_objects(column(slot["id"], pos)[0]) for slot, pos in zip(slots, positions)]
+        )
+        order_keys = np.concatenate(
+            [pos * n_slots + i for i, pos in enumerate(positions)]
+        ).astype(np.int64)
+        order = np.argsort(order_keys, kind="stable")
+        codes, _ = pd.factorize(ids[order])
+        _, first = np.unique(codes, return_index=True)
+        winners = order[first]
+        if known_ids:
+            is_new = np.fromiter(
+                (node_id not in known_ids for node_id in ids[winners].tolist()),
+                dtype=bool,
+                count=len(winners),
+            )
+            winners = winners[is_new]
+        winner_ids = ids[winners]
+        winner_slots = order_keys[winners] % n_slots
+        winner_positions = order_keys[winners] // n_slots
+
+        node_attrs = np.empty(len(winners), dtype=object)
+        for i, slot in enumerate(slots):
+            sel = np.flatnonzero(winner_slots == i)
+            if not len(sel):
+                continue
+            dicts = _node_attr_dicts(
+                column, as_objects, slot, winner_ids[sel], winner_positions[sel], node_attributes
+            )
+            node_attrs[sel] = dicts
+        nodes = (winner_ids.tolist(), node_attrs.tolist())
+        node_pass.add("nodes", len(winners))
+
+    with span("edge_pass") as edge_pass:
+        # Edges: one whole-column pass per edge kind, then interleaved back in row order
+        starts, ends, dicts, edge_keys = [], [], [], []
+        for k, kind in enumerate(edge_kinds):
+            pos = np.flatnonzero(valid[kind["start"]] & valid[kind["end"]])
+            columns = []
+            for key, col in kind["columns"]:
+                values, keep = column(col, pos)
+                columns.append((key, as_objects(values).tolist(), keep))
+            kind_dicts = np.empty(len(pos), dtype=object)
+            kind_dicts[:] = _attr_dicts(len(pos), columns, kind["constants"])
+            starts.append(as_objects(column(slots[kind["start"]]["id"], pos)[0]))
+            ends.append(as_objects(column(slots[kind["end"]]["id"], pos)[0]))
+            dicts.append(kind_dicts)
+            edge_keys.append(pos * len(edge_kinds) + k)
+
+        if not edge_kinds:
+            return nodes, ([], [], [])
+        starts, ends, dicts = (np.concatenate(parts) for parts in (starts, ends, dicts))
+        if len(edge_kinds) > 1:
+            order = np.argsort(np.concatenate(edge_keys), kind="stable")
+            starts, ends, dicts = starts[order], ends[order], dicts[order]
+        edges = (starts.tolist(), ends.tolist(), dicts.tolist())
+        edge_pass.add("edges", len(starts))
+
+    return nodes, edges
+
+
+def _node_attr_dicts(column, as_objects, slot, node_ids, positions, node_attributes):
+    """Attribute dicts for the nodes first seen in one slot."""
+    label_str = "displayName"
+    n = len(node_ids)
+
+    if slot["label"]:
+        labels, has_label = column(slot["label"], positions)
+        labels = np.where(has_label, as_objects(labels), node_ids).tolist()
+    else:
+        labels = [str(node_id) for node_id in node_ids]
+    columns = [(label_str, labels, None)]
+
+    if slot["type"] is not None:
+        if slot["is_type_column"]:
+            types, has_type = column(slot["type"], positions)
+            types = as_objects(types).tolist()
+            keep = has_type & np.array([bool(t) for t in types], dtype=bool)
+            columns.append(("type", types, keep))
+        else:
+            columns.append(("type", repeat(slot["type"], n), None))
 
-                    # Add edge type if specified
-                    if "edge_type_to_target" in config:
-                        edge_attrs_to_target["type"] = config["edge_type_to_target"]
+    for attr_col in slot["attributes"]:
+        values, keep = column(attr_col, positions)
+        columns.append((attr_col, as_objects(values).tolist(), keep))
 
-                    # Add edge attributes if specified
-                    if "edge_attributes" in config:
-                        for attr_col in normalize_attr(config["edge_attributes"]):
-                            if attr_col in row and not pd.isna(row[attr_col]):
-                                edge_attrs_to_target[attr_col] = row[attr_col]
+    if node_attributes is not None and len(node_attributes) and len(node_attributes.columns):
+        matches = node_attributes.index.get_indexer(pd.Index(node_ids, dtype=object))
+        found = matches >= 0
+        for attr_name in node_attributes.columns:
+            attr_values = node_attributes[attr_name].tolist()
+            has_value = node_attributes[attr_name].notna().to_numpy()
+            values = [attr_values[j] if j >= 0 else None for j in matches.tolist()]
+            columns.append((attr_name, values, found & has_value[matches]))
 
-                    G.add_edge(opt_node_id, target_id, **edge_attrs_to_target)
+    return _attr_dicts(n, columns)
 
-    return G
 
+@traced("build_create_command_from_networkx")
+def build_create_command_from_networkx(
+    G, node_type_key=None, edge_type_key=None, bulk_edges=False, max_size_mb=1
+):
+    """
+    Build CREATE command from NetworkX object
 
-def build_create_command_from_networkx(G, node_type_key=None, edge_type_key=None):
-    """Build CREATE command from NetworkX object"""
-
-    def escape_value(value):
-        """Escape quotes and special characters in property values"""
-        import re
-
-        value_str = str(value)
-        # Replace problematic characters
-        value_str = value_str.replace('"', '\\"')
-        value_str = value_str.replace("\n", " ")
-        value_str = value_str.replace("\r", " ")
-        value_str = value_str.replace("\t", " ")
-        value_str = value_str.replace("\\", "")
-        # Remove or replace other problematic characters
-        value_str = re.sub(
-            r"[^\w\s\-\.\,\:\;\(\)\[\]\{\}\/\@\#\$\%\&\*\+\=\<\>\?\!\~\`\|\\]",
-            " ",
-            value_str,
-        )
-        # Clean up multiple spaces
-        value_str = re.sub(r"\s+", " ", value_str).strip()
-        return value_str
-
-    # Collect all unique nodes
-    all_nodes = {}
-    for node_id, attrs in G.nodes(data=True):
-        all_nodes[node_id] = attrs
+    With bulk_edges, edges are grouped by (source label, relationship type, target
+    label) and emitted as multi-edge MATCH ... CREATE statements of at most
+    max_size_mb each, with labeled lookups on both sides, instead of one
+    unlabeled MATCH ... CREATE per edge. Each statement stays on one line, so
+    split_cypher_commands still passes them through as edge chunks.
 
+    To load a large graph in chunks, iter_cypher_chunks yields the same
+    statements already split, without building the full string.
+    """
     commands = []
+    node_parts = []
+    for kind, text in _cypher_create_parts(
+        G, node_type_key, edge_type_key, bulk_edges, max_size_mb
+    ):
+        if kind == "node":
+            node_parts.append(text)
+        else:
+            commands.append(text)
+
+    if node_parts:
+        commands.insert(0, "CREATE " + ",\n".join(node_parts))
+
+    print(
+        f"Cypher query will create graph with {G.number_of_nodes():,} nodes and {G.number_of_edges():,} edges"
+    )
+
+    return "\n".join(commands) if commands else ""
+
+
+def _cypher_create_parts(
+    G, node_type_key=None, edge_type_key=None, bulk_edges=False, max_size_mb=1
+):
+    """
+    Yield ("node", pattern) for every node of G, then ("edge", statement).
 
-    # TODO: Set properties type to correct one depending on one in networkx graph
-    # ...
+    Node patterns are the "(:Label {...})" items of the CREATE statement, edge
+    statements complete MATCH ... CREATE commands. Nothing is accumulated except
+    the node -> label map and, with bulk_edges, one open statement per group.
+    """
 
     def format_prop_key(k):
         if " " in k:
@@ -477,17 +965,18 @@ def build_create_command_from_networkx(G, node_type_key=None, edge_type_key=None
         return k
 
     def format_prop_val(v):
-        if isinstance(v, str):
-            return f'"{escape_value(v)}"'
-        return v
+        # Numbers and booleans keep their type (see property_types in
+        # create_graph_from_df); None when the value is missing
+        return _cypher_literal(v)
 
     # Create nodes first
-    node_parts = []
-    for i, (node_id, attrs) in enumerate(all_nodes.items()):
+    node_labels = {}
+    for node_id, attrs in G.nodes(data=True):
         props = []
         for k, v in attrs.items():
-            prop = f"{format_prop_key(k)}: {format_prop_val(v)}"
-            props.append(prop)
+            value = format_prop_val(v)
+            if value is not None:
+                props.append(f"{format_prop_key(k)}: {value}")
         props = ", ".join(props)
 
         node_type = attrs.get(
@@ -499,59 +988,368 @@ def build_create_command_from_networkx(G, node_type_key=None, edge_type_key=None
             if " " in node_type or "_" in node_type
             else node_type[0].upper() + node_type[1:]
         )
-        node_id_val = f'"{node_id}"'
-        node_parts.append(
-            f'(:{node_type} {{id: {node_id_val}{", " + props if props else ""}}})'
+        node_labels[node_id] = node_type
+        node_id_val = cypher_string(node_id)
+        yield (
+            "node",
+            f'(:{node_type} {{id: {node_id_val}{", " + props if props else ""}}})',
         )
 
-    if node_parts:
-        commands.append("CREATE " + ",\n".join(node_parts))
-
     # Create edges using MATCH ... CREATE ...
+    max_bytes = max_size_mb * 1000 * 1000 * 0.9999
+    edge_groups = {}
     for source, target, edge_attrs in G.edges(data=True):
         # Extract relationship type from specified key
         relationship_type = edge_attrs.get(
             edge_type_key, edge_type_key if edge_type_key is not None else "CONNECTED"
         )
 
-        # Remove the type key from properties to avoid duplication
+        # Remove the type key from properties to avoid duplication, and
+        # missing values
         filtered_edge_attrs = {
-            k: v for k, v in edge_attrs.items() if k != edge_type_key
+            k: format_prop_val(v) for k, v in edge_attrs.items() if k != edge_type_key
         }
 
         # Build edge properties string
-        edge_props = (
-            ", ".join(
-                [
-                    f"{format_prop_key(k)}:{format_prop_val(v)}"
-                    for k, v in filtered_edge_attrs.items()
-                ]
-            )
-            if filtered_edge_attrs
-            else ""
+        edge_props = ", ".join(
+            f"{format_prop_key(k)}:{value}"
+            for k, value in filtered_edge_attrs.items()
+            if value is not None
         )
         edge_props_str = f" {{{edge_props}}}" if edge_props else ""
 
         # Convert relationship type to uppercase for Cypher convention
         relationship_type = str(relationship_type).upper()
 
-        source_id = f'"{source}"'
-        target_id = f'"{target}"'
+        if bulk_edges:
+            group = (node_labels[source], relationship_type, node_labels[target])
+            statement = edge_groups.get(group)
+            if statement is None:
+                statement = edge_groups[group] = _new_bulk_edge_statement(*group)
+            closed = _add_bulk_edge(
+                statement, source, target, edge_props_str, max_bytes
+            )
+            if closed is not None:
+                yield "edge", closed
+            continue
+
+        source_id = cypher_string(source)
+        target_id = cypher_string(target)
 
         edge_command = (
             f"MATCH (source {{id: {source_id}}}), (target {{id: {target_id}}}) "
             f"CREATE (source)-[:{relationship_type}{edge_props_str}]->(target)"
         )
-        commands.append(edge_command)
+        yield "edge", edge_command
 
-    print(
-        f"Cypher query will create graph with {G.number_of_nodes():,} nodes and {G.number_of_edges():,} edges"
+    for statement in edge_groups.values():
+        if statement["create"]:
+            yield "edge", _bulk_edge_text(statement)
+
+
+_BULK_EDGE_FIXED_SIZE = len("MATCH  CREATE ")
+
+
+def _new_bulk_edge_statement(source_type, relationship_type, target_type):
+    """Empty multi-edge statement for one (source label, type, target label) group."""
+    return {
+        "types": (source_type, relationship_type, target_type),
+        "match": [],
+        "create": [],
+        "variables": {},
+        "size": _BULK_EDGE_FIXED_SIZE,
+    }
+
+
+def _bulk_edge_text(statement):
+    return (
+        "MATCH "
+        + ", ".join(statement["match"])
+        + " CREATE "
+        + ", ".join(statement["create"])
     )
 
-    return "\n".join(commands) if commands else ""
 
+def _bulk_edge_parts(statement, source, target, edge_props_str):
+    """MATCH patterns for endpoints not bound yet, the edge pattern, and their size."""
+    source_type, relationship_type, target_type = statement["types"]
+    variables = statement["variables"]
+    parts = []
+    for node_id, node_type in ((source, source_type), (target, target_type)):
+        if node_id not in variables:
+            variables[node_id] = f"n{len(variables)}"
+            parts.append(
+                f"({variables[node_id]}:{node_type} {{id: {cypher_string(node_id)}}})"
+            )
+    create = (
+        f"({variables[source]})-[:{relationship_type}{edge_props_str}]"
+        f"->({variables[target]})"
+    )
+    text = "".join(parts) + create
+    size = len(text) if text.isascii() else len(text.encode("utf-8"))
+    return parts, create, size + 2 * (len(parts) + 1)
+
+
+def _add_bulk_edge(statement, source, target, edge_props_str, max_bytes):
+    """
+    Add one edge to an open multi-edge statement.
+
+    Each node is matched once per statement. If the edge would take the statement
+    past max_bytes, the statement is closed and returned as text and the edge
+    starts a new one (a single oversized edge still gets its own statement).
+    """
+    closed = None
+    parts, create, added = _bulk_edge_parts(statement, source, target, edge_props_str)
+    if statement["size"] + added > max_bytes and statement["create"]:
+        closed = _bulk_edge_text(statement)
+        statement.update(match=[], create=[], variables={}, size=_BULK_EDGE_FIXED_SIZE)
+        parts, create, added = _bulk_edge_parts(
+            statement, source, target, edge_props_str
+        )
+    statement["match"].extend(parts)
+    statement["create"].append(create)
+    statement["size"] += added
+    return closed
+
+
+def _pack_create_chunks(node_parts, max_bytes):
+    """Pack "(:Label {...})" node patterns into CREATE statements of at most max_bytes."""
+    current_chunk = []
+    current_size = len("CREATE ".encode("utf-8"))
+    for node in node_parts:
+        node_size = len(node.encode("utf-8")) + 2  # +2 for ",\n"
+
+        if current_size + node_size > max_bytes and current_chunk:
+            yield "CREATE " + ",\n".join(current_chunk)
+            current_chunk = []
+            current_size = len("CREATE ".encode("utf-8"))
+
+        current_chunk.append(node)
+        current_size += node_size
+
+    if current_chunk:
+        yield "CREATE " + ",\n".join(current_chunk)
+
+
+def iter_cypher_chunks(
+    G, node_type_key=None, edge_type_key=None, max_size_mb=1, bulk_edges=False
+):
+    """
+    Yield size-bounded Cypher chunks for G, streamed from the graph.
+
+    Produces the same chunks as
+    split_cypher_commands(build_create_command_from_networkx(G, ...), max_size_mb)
+    in linear time, without ever holding the full command string: only the
+    chunk being filled is kept in memory.
 
-def networkx_to_jsonl(G, graph_name, node_type_key=None, edge_type_key=None, data_dir=None):
+    Parameters
+    ----------
+    G : nx.Graph or nx.DiGraph
+        The NetworkX graph to create.
+    node_type_key, edge_type_key, bulk_edges :
+        As in build_create_command_from_networkx.
+    max_size_mb : float, default=1
+        Maximum size in MB of a node chunk, and of a bulk edge statement.
+
+    Yields
+    ------
+    tuple of (str, str)
+        ("node", chunk) for every CREATE chunk, then ("edge", chunk) for every
+        MATCH ... CREATE statement.
+    """
+    max_bytes = max_size_mb * 1000 * 1000 * 0.9999
+    parts = _cypher_create_parts(
+        G, node_type_key, edge_type_key, bulk_edges, max_size_mb
+    )
+
+    # Node patterns all come before the edge statements
+    for kind, group in groupby(parts, key=lambda part: part[0]):
+        texts = (text for _, text in group)
+        if kind == "node":
+            for chunk in _pack_create_chunks(texts, max_bytes):
+                yield "node", chunk
+        else:
+            for text in texts:
+                yield "edge", text
+
+
+def _to_serializable(v):
+    """Convert value to a JSON-serializable Python native type."""
+    if isinstance(v, np.integer):
+        return int(v)
+    if isinstance(v, np.floating):
+        return None if np.isnan(v) else float(v)
+    if isinstance(v, np.bool_):
+        return bool(v)
+    if isinstance(v, float) and math.isnan(v):
+        return None
+    return v
+
+
+def _jsonl_node_label(attrs, node_type_key):
+    raw = attrs.get(node_type_key, node_type_key) if node_type_key else "Node"
+    if raw is None:
+        return "Node"
+    raw = str(raw)
+    # Convert to PascalCase if the label contains spaces or underscores
+    if " " in raw or "_" in raw:
+        return "".join(w.title() for w in raw.replace("_", " ").split())
+    return raw[0].upper() + raw[1:]
+
+
+def _jsonl_rel_type(attrs, edge_type_key):
+    raw = attrs.get(edge_type_key, edge_type_key) if edge_type_key else "CONNECTED"
+    if raw is None:
+        return "CONNECTED"
+    return str(raw).upper()
+
+
+_encode_str = json.encoder.encode_basestring_ascii
+
+
+def _encode_float(v):
+    if v != v:
+        return None
+    if v == math.inf:
+        return "Infinity"
+    if v == -math.inf:
+        return "-Infinity"
+    return float.__repr__(float(v))
+
+
+# JSON text for the value types that dominate graph attributes, matching what
+# json.dumps(_to_serializable(v)) gives; None means "drop the property"
+_VALUE_ENCODERS = {
+    str: _encode_str,
+    int: int.__repr__,
+    bool: lambda v: "true" if v else "false",
+    float: _encode_float,
+    type(None): lambda v: None,
+    np.int64: lambda v: int.__repr__(int(v)),
+    np.int32: lambda v: int.__repr__(int(v)),
+    np.float64: _encode_float,
+    np.float32: _encode_float,
+    np.bool_: lambda v: "true" if v else "false",
+    type(pd.NA): lambda v: None,
+}
+
+
+def _encode_value(v):
+    encode = _VALUE_ENCODERS.get(type(v))
+    if encode is not None:
+        return encode(v)
+    sv = _to_serializable(v)
+    return None if sv is None else json.dumps(sv)
+
+
+def _encode_properties(attrs, first=None, skip_key=None, key_cache=None):
+    """
+    JSON text of a properties object, without building the dict.
+
+    first is the already-encoded "id" value put in front (node records); an "id"
+    attribute replaces it in place, as a dict assignment would. key_cache maps a
+    property name to its encoded '"name": ' prefix and is shared across records.
+    """
+    if key_cache is None:
+        key_cache = {}
+    parts = [] if first is None else ['"id": ' + first]
+    for k, v in attrs.items():
+        if k == skip_key:
+            continue
+        ev = _encode_value(v)
+        if ev is None:
+            continue
+        if first is not None and k == "id":
+            parts[0] = '"id": ' + ev
+            continue
+        prefix = key_cache.get(k) if type(k) is str else None
+        if prefix is None:
+            prefix = json.dumps(k if isinstance(k, str) else {k: 0})
+            prefix = prefix + ": " if isinstance(k, str) else prefix[1:-4] + ": "
+            if type(k) is str:
+                key_cache[k] = prefix
+        parts.append(prefix + ev)
+    return "{" + ", ".join(parts) + "}"
+
+
+def _jsonl_node_record(int_id, node_id, attrs, node_type_key, key_cache=None):
+    """One LOAD JSONL node line."""
+    properties = _encode_properties(
+        attrs, first=_encode_str(str(node_id)), key_cache=key_cache
+    )
+    label = _encode_str(_jsonl_node_label(attrs, node_type_key))
+    return (
+        f'{{"type": "node", "id": "{int_id}", "labels": [{label}], '
+        f'"properties": {properties}}}\n'
+    )
+
+
+def _jsonl_relationship_record(
+    rel_id, start_id, end_id, attrs, edge_type_key, key_cache=None
+):
+    """One LOAD JSONL relationship line, between two integer node IDs."""
+    properties = _encode_properties(attrs, skip_key=edge_type_key, key_cache=key_cache)
+    label = _encode_str(_jsonl_rel_type(attrs, edge_type_key))
+    return (
+        f'{{"type": "relationship", "id": "{rel_id}", "label": {label}, '
+        f'"start": {{"id": "{start_id}"}}, "end": {{"id": "{end_id}"}}, '
+        f'"properties": {properties}}}\n'
+    )
+
+
+def _encode_jsonl_shard(kind, records, node_type_key, edge_type_key):
+    """
+    Encode one shard of node or relationship records to JSONL text.
+
+    Module-level so it can run in a worker process. Node records are
+    (int_id, node_id, attrs), relationship records (rel_id, start, end, attrs).
+    """
+    key_cache = {}
+    if kind == "node":
+        return "".join(
+            _jsonl_node_record(int_id, node_id, attrs, node_type_key, key_cache)
+            for int_id, node_id, attrs in records
+        )
+    return "".join(
+        _jsonl_relationship_record(rel_id, start, end, attrs, edge_type_key, key_cache)
+        for rel_id, start, end, attrs in records
+    )
+
+
+def _jsonl_shards(G, shard_size):
+    """Yield ("node", records) then ("relationship", records) shards of G in order."""
+    node_id_map = {}
+    shard = []
+    for int_id, (node_id, attrs) in enumerate(G.nodes(data=True)):
+        node_id_map[node_id] = int_id
+        shard.append((int_id, node_id, attrs))
+        if len(shard) == shard_size:
+            yield "node", shard
+            shard = []
+    if shard:
+        yield "node", shard
+
+    shard = []
+    for rel_id, (source, target, attrs) in enumerate(G.edges(data=True)):
+        shard.append((rel_id, node_id_map[source], node_id_map[target], attrs))
+        if len(shard) == shard_size:
+            yield "relationship", shard
+            shard = []
+    if shard:
+        yield "relationship", shard
+
+
+@traced("networkx_to_jsonl")
+def networkx_to_jsonl(
+    G,
+    graph_name,
+    node_type_key=None,
+    edge_type_key=None,
+    data_dir=None,
+    n_jobs=1,
+    shard_size=50_000,
+    manifest=False,
+):
     """
     Convert a NetworkX graph to JSONL format compatible with TuringDB's LOAD JSONL command.
 
@@ -573,15 +1371,28 @@ def networkx_to_jsonl(G, graph_name, node_type_key=None, edge_type_key=None, dat
         constant type. If None, defaults to "CONNECTED".
     data_dir : str or None
         Directory to write the file to. Defaults to ~/.turing/data.
+    n_jobs : int or None, default=1
+        Number of worker processes serializing shards. None or -1 uses every CPU.
+        With 1, shards are serialized in this process.
+    shard_size : int, default=50_000
+        Number of node or relationship records per shard.
+    manifest : bool, default=False
+        Also write {graph_name}.manifest.json, the node ID map and content
+        hashes that apply_graph_delta diffs later versions of the graph against.
 
     Returns
     -------
     str
         The filename (without directory path) to pass to the LOAD JSONL command.
+
+    Notes
+    -----
+    Integer IDs follow G's node and edge order whatever n_jobs is, and shards are
+    written back in order, so the file is identical for any n_jobs.
     """
-    import json
-    import math
     import os
+    import time
+    from collections import deque
 
     if data_dir is None:
         data_dir = os.path.expanduser("~/.turing/data")
@@ -590,89 +1401,1693 @@ def networkx_to_jsonl(G, graph_name, node_type_key=None, edge_type_key=None, dat
     filename = f"{graph_name}.jsonl"
     filepath = os.path.join(data_dir, filename)
 
-    def to_serializable(v):
-        """Convert value to a JSON-serializable Python native type."""
-        try:
-            import numpy as np
-            if isinstance(v, np.integer):
-                return int(v)
-            if isinstance(v, np.floating):
-                return None if np.isnan(v) else float(v)
-            if isinstance(v, np.bool_):
-                return bool(v)
-        except ImportError:
-            pass
-        if isinstance(v, float) and math.isnan(v):
-            return None
-        return v
-
-    def node_label(attrs):
-        raw = attrs.get(node_type_key, node_type_key) if node_type_key else "Node"
-        if raw is None:
-            return "Node"
-        raw = str(raw)
-        # Convert to PascalCase if the label contains spaces or underscores
-        if " " in raw or "_" in raw:
-            return "".join(w.title() for w in raw.replace("_", " ").split())
-        return raw[0].upper() + raw[1:]
-
-    def rel_type(attrs):
-        raw = attrs.get(edge_type_key, edge_type_key) if edge_type_key else "CONNECTED"
-        if raw is None:
-            return "CONNECTED"
-        return str(raw).upper()
+    if n_jobs is None or n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
 
-    node_id_map = {}
+    start_time = time.perf_counter()
+    shards = _jsonl_shards(G, shard_size)
 
     with open(filepath, "w", encoding="utf-8") as f:
-        # Write nodes
-        for int_id, (node_id, attrs) in enumerate(G.nodes(data=True)):
-            node_id_map[node_id] = int_id
-            label = node_label(attrs)
-
-            properties = {"id": str(node_id)}
-            for k, v in attrs.items():
-                sv = to_serializable(v)
-                if sv is not None:
-                    properties[k] = sv
-
-            f.write(json.dumps({
-                "type": "node",
-                "id": str(int_id),
-                "labels": [label],
-                "properties": properties,
-            }) + "\n")
-
-        # Write relationships
-        for rel_id, (source, target, edge_attrs) in enumerate(G.edges(data=True)):
-            rtype = rel_type(edge_attrs)
-
-            properties = {}
-            for k, v in edge_attrs.items():
-                if k == edge_type_key:
-                    continue
-                sv = to_serializable(v)
-                if sv is not None:
-                    properties[k] = sv
-
-            f.write(json.dumps({
-                "type": "relationship",
-                "id": str(rel_id),
-                "label": rtype,
-                "start": {"id": str(node_id_map[source])},
-                "end": {"id": str(node_id_map[target])},
-                "properties": properties,
-            }) + "\n")
 
+        def write(text):
+            with span("file.write", bytes=len(text)):
+                f.write(text)
+
+        if n_jobs <= 1:
+            for kind, records in shards:
+                with span("jsonl.serialize", records=len(records)):
+                    text = _encode_jsonl_shard(
+                        kind, records, node_type_key, edge_type_key
+                    )
+                write(text)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Keep a bounded number of shards in flight and write them back in order
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                pending = deque()
+                for kind, records in shards:
+                    pending.append(
+                        executor.submit(
+                            _encode_jsonl_shard,
+                            kind,
+                            records,
+                            node_type_key,
+                            edge_type_key,
+                        )
+                    )
+                    if len(pending) >= 2 * n_jobs:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+
+    elapsed = time.perf_counter() - start_time
+    n_records = G.number_of_nodes() + G.number_of_edges()
     print(f"JSONL file written to: {filepath}")
     print(f"Graph: {G.number_of_nodes():,} nodes, {G.number_of_edges():,} edges")
+    print(
+        f"Serialized {n_records:,} records in {elapsed:.2f}s "
+        f"({n_records / max(elapsed, 1e-9):,.0f} records/s, n_jobs={n_jobs})"
+    )
+    if manifest:
+        manifest_path = _write_manifest(
+            _graph_manifest(G, node_type_key, edge_type_key), data_dir, graph_name
+        )
+        print(f"Manifest written to: {manifest_path}")
+    return filename
+
+
+def _value_type(v):
+    """Property type name of one exported value (see turingdb_examples.schema)."""
+    if isinstance(v, (bool, np.bool_)):
+        return "bool"
+    if isinstance(v, (int, np.integer)):
+        return "int"
+    if isinstance(v, (float, np.floating)):
+        return "float"
+    if isinstance(v, str):
+        return "string"
+    return type(v).__name__
+
+
+def graph_schema(G, node_type_key=None, edge_type_key=None):
+    """
+    Property types found in a graph, per node label and relationship type.
+
+    Labels and relationship types are derived as in networkx_to_jsonl, so the
+    report matches what is loaded into TuringDB.
+
+    Parameters
+    ----------
+    G : nx.Graph, nx.DiGraph or ArrayGraph
+    node_type_key, edge_type_key :
+        As in networkx_to_jsonl.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per (element, label, property), element being 'node' or
+        'relationship', with the type of its values ('int|float' when mixed),
+        the number of elements having it and the fill rate among the elements
+        of that label.
+    """
+    counts = {}
+    totals = {}
+
+    def add(element, label, attrs, skip_key):
+        key = (element, label)
+        totals[key] = totals.get(key, 0) + 1
+        for prop, value in attrs.items():
+            if prop == skip_key or value is None or value is pd.NA:
+                continue
+            if isinstance(value, float) and value != value:
+                continue
+            entry = counts.setdefault(key + (prop,), [0, set()])
+            entry[0] += 1
+            entry[1].add(_value_type(value))
+
+    for _, attrs in G.nodes(data=True):
+        add("node", _jsonl_node_label(attrs, node_type_key), attrs, None)
+    for _, _, attrs in G.edges(data=True):
+        add("relationship", _jsonl_rel_type(attrs, edge_type_key), attrs, edge_type_key)
+
+    rows = [
+        {
+            "element": element,
+            "label": label,
+            "property": prop,
+            "type": "|".join(sorted(types)),
+            "count": n,
+            "fill_rate": n / totals[(element, label)],
+        }
+        for (element, label, prop), (n, types) in counts.items()
+    ]
+    return pd.DataFrame(
+        rows,
+        columns=["element", "label", "property", "type", "count", "fill_rate"],
+    )
+
+
+@traced("dataframe_to_jsonl")
+def dataframe_to_jsonl(
+    data,
+    graph_name,
+    *,
+    source_node_col: Union[str, Dict[str, str]] = "source",
+    target_node_col: Union[str, Dict[str, str], None] = None,
+    attributes_source_node_cols: Union[str, List[str], None] = None,
+    attributes_target_node_cols: Union[str, List[str], None] = None,
+    optional_nodes_cols: Optional[
+        Dict[str, Dict[str, Union[str, List[str], bool]]]
+    ] = None,
+    attributes_edges: Union[str, List[str], None] = None,
+    edge_col: Optional[str] = None,
+    edge_col_label: Optional[str] = None,
+    node_attributes_df: Optional[pd.DataFrame] = None,
+    node_attributes_key_col: str = "id",
+    node_type_key=None,
+    edge_type_key=None,
+    data_dir=None,
+    chunksize: int = 100_000,
+    read_csv_kwargs: Optional[dict] = None,
+    property_types: Union[str, Dict[str, str], None] = None,
+):
+    """
+    Write TuringDB LOAD JSONL records straight from tabular data, without NetworkX.
+
+    Equivalent to networkx_to_jsonl(create_graph_from_df(df, ...), ...) but done
+    in one pass over the input, chunk by chunk. Only the node ID -> integer ID map
+    is kept in memory, so inputs larger than RAM can be exported.
+
+    Parameters
+    ----------
+    data : pd.DataFrame, str, os.PathLike or iterable of pd.DataFrame
+        The rows to export. A DataFrame is processed in slices of chunksize rows,
+        a path is read with pd.read_csv(chunksize=chunksize), and any other
+        iterable is taken as a sequence of DataFrame chunks.
+    graph_name : str
+        Base name used for the output filename ({graph_name}.jsonl).
+    source_node_col, target_node_col, attributes_source_node_cols,
+    attributes_target_node_cols, optional_nodes_cols, attributes_edges, edge_col,
+    edge_col_label, node_attributes_df, node_attributes_key_col :
+        Column spec, as in create_graph_from_df.
+    node_type_key, edge_type_key, data_dir :
+        As in networkx_to_jsonl.
+    chunksize : int, default=100_000
+        Number of rows processed (and records buffered) at a time.
+    read_csv_kwargs : dict or None
+        Extra keyword arguments for pd.read_csv when data is a path.
+    property_types : 'infer', dict or None, default=None
+        As in create_graph_from_df. The types are inferred once, on the whole
+        DataFrame, or on the first chunk only for paths and iterables, and every
+        chunk is converted with them. Values of later chunks that do not parse
+        as the inferred type (2.5 in a column typed int on the first chunk) are
+        kept as they are, so the property then has mixed types; pass a dict for
+        such columns.
+
+    Returns
+    -------
+    str
+        The filename (without directory path) to pass to the LOAD JSONL command.
+
+    Notes
+    -----
+    - Nodes get the same integer IDs, labels and properties as with
+      networkx_to_jsonl: first occurrence wins, in row order.
+    - Relationships are written in row order. A (source, target) pair that
+      appears on several rows gives several relationships, where nx.DiGraph
+      would have merged them into one edge.
+    - Relationships are spooled to a temporary file next to the output and
+      appended after all nodes, so the file keeps the nodes-then-relationships
+      layout LOAD JSONL expects.
+    """
+    import os
+    import shutil
+    import tempfile
+
+    if data_dir is None:
+        data_dir = os.path.expanduser("~/.turing/data")
+    os.makedirs(data_dir, exist_ok=True)
+
+    filename = f"{graph_name}.jsonl"
+    filepath = os.path.join(data_dir, filename)
+
+    if isinstance(data, pd.DataFrame):
+        chunks = (
+            data.iloc[start : start + chunksize]
+            for start in range(0, len(data), chunksize)
+        )
+    elif isinstance(data, (str, os.PathLike)):
+        chunks = pd.read_csv(data, chunksize=chunksize, **(read_csv_kwargs or {}))
+    else:
+        chunks = data
+
+    unique_node_attrs = None
+    if node_attributes_df is not None:
+        node_attributes_df = _strip_string_columns(node_attributes_df)
+        if property_types is not None:
+            node_attributes_df = _typed_node_attributes(
+                node_attributes_df, node_attributes_key_col, property_types
+            )
+        unique_node_attrs = node_attributes_df.drop_duplicates(
+            subset=[node_attributes_key_col]
+        ).set_index(node_attributes_key_col)
+
+    schema = None
+    node_id_map = {}
+    n_rels = 0
+    rels_size = 0
+    key_cache = {}
+
+    with open(filepath, "w", encoding="utf-8") as f, tempfile.TemporaryFile(
+        "w+", encoding="utf-8", dir=data_dir
+    ) as rels:
+        for chunk in chunks:
+            count("rows", len(chunk))
+            with span("validate_columns", columns=len(chunk.columns)):
+                chunk = _strip_string_columns(chunk)
+                source_info, target_info, source_attrs, target_attrs, edge_attrs = (
+                    _resolve_column_spec(
+                        chunk.columns,
+                        source_node_col=source_node_col,
+                        target_node_col=target_node_col,
+                        attributes_source_node_cols=attributes_source_node_cols,
+                        attributes_target_node_cols=attributes_target_node_cols,
+                        optional_nodes_cols=optional_nodes_cols,
+                        attributes_edges=attributes_edges,
+                        edge_col=edge_col,
+                    )
+                )
+                if property_types is not None:
+                    if schema is None:
+                        attribute_cols = _attribute_columns(
+                            source_info,
+                            target_info,
+                            source_attrs,
+                            target_attrs,
+                            edge_attrs,
+                            optional_nodes_cols,
+                        )
+                        sample = (
+                            _strip_string_columns(data[attribute_cols])
+                            if isinstance(data, pd.DataFrame)
+                            else chunk
+                        )
+                        schema = _property_schema(
+                            sample, property_types, attribute_cols
+                        )
+                    chunk = coerce_types(chunk, schema)
+                slots, edge_kinds = _columnar_layout(
+                    chunk,
+                    source_info,
+                    target_info,
+                    source_attrs,
+                    target_attrs,
+                    edge_attrs,
+                    optional_nodes_cols,
+                    edge_col,
+                    edge_col_label,
+                )
+            nodes, edges = _columnar_tables(
+                chunk, slots, edge_kinds, unique_node_attrs, known_ids=node_id_map
+            )
+
+            with span("jsonl.serialize", records=len(nodes[0])):
+                lines = []
+                for node_id, attrs in zip(*nodes):
+                    int_id = len(node_id_map)
+                    node_id_map[node_id] = int_id
+                    lines.append(
+                        _jsonl_node_record(
+                            int_id, node_id, attrs, node_type_key, key_cache
+                        )
+                    )
+                text = "".join(lines)
+            with span("file.write", bytes=len(text)):
+                f.write(text)
+
+            with span("jsonl.serialize", records=len(edges[0])):
+                lines = []
+                for source, target, attrs in zip(*edges):
+                    lines.append(
+                        _jsonl_relationship_record(
+                            n_rels,
+                            node_id_map[source],
+                            node_id_map[target],
+                            attrs,
+                            edge_type_key,
+                            key_cache,
+                        )
+                    )
+                    n_rels += 1
+                text = "".join(lines)
+            with span("file.write", bytes=len(text)):
+                rels.write(text)
+            rels_size += len(text)
+
+        with span("file.write", bytes=rels_size):
+            rels.seek(0)
+            shutil.copyfileobj(rels, f)
+
+    print(f"JSONL file written to: {filepath}")
+    print(f"Graph: {len(node_id_map):,} nodes, {n_rels:,} edges")
+    return filename
+
+
+# GML tokens, as tokenized by nx.read_gml
+_GML_KEY, _GML_REAL, _GML_INT, _GML_STRING, _GML_START, _GML_END = range(6)
+_GML_TOKEN = re.compile(
+    r"([A-Za-z][0-9A-Za-z_]*\b)"
+    r"|([+-]?(?:[0-9]*\.[0-9]+|[0-9]+\.[0-9]*|INF)(?:[Ee][+-]?[0-9]+)?)"
+    r"|([+-]?[0-9]+)"
+    r'|(".*?")'
+    r"|(\[)"
+    r"|(\])"
+    r"|(#.*$|\s+)"
+)
+_GML_KEY_PATTERN = re.compile(r"[A-Za-z][0-9A-Za-z_]*")
+_GML_INT_PATTERN = re.compile(r"[+-]?[0-9]+")
+_GML_ENTITY = re.compile(r"&(?:[0-9A-Za-z]+|#(?:[0-9]+|x[0-9A-Fa-f]+));")
+# Marks a value networkx wrote as a list
+_GML_LIST_START = "_networkx_list_start"
+
+
+def _gml_line_tokens(line, lineno):
+    """Tokens of one GML line, with the full tokenizer of nx.read_gml."""
+    pos = 0
+    while pos < len(line):
+        match = _GML_TOKEN.match(line, pos)
+        if match is None:
+            raise ValueError(f"Cannot tokenize GML {line[pos:]!r} at line {lineno}")
+        kind = match.lastindex - 1
+        text = match.group(kind + 1)
+        pos = match.end()
+        if kind == _GML_KEY:
+            yield kind, text
+        elif kind == _GML_REAL:
+            yield kind, float(text)
+        elif kind == _GML_INT:
+            yield kind, int(text)
+        elif kind < 6:
+            yield kind, text
+
+
+def _gml_tokens(lines):
+    """
+    Yield the (kind, value) tokens of GML text, one line at a time.
+
+    Lines of the usual `key value`, `key [` and `]` shapes are split directly;
+    anything else goes through the regex tokenizer. Strings spread over several
+    lines are joined with spaces, as in nx.read_gml.
+    """
+    keys = set()
+    multiline = []
+    for lineno, line in enumerate(lines, 1):
+        line = line.rstrip("\n")
+        if multiline:
+            multiline.append(line.strip())
+            if not line.endswith('"'):
+                continue
+            line = " ".join(multiline)
+            multiline = []
+        elif line.count('"') == 1:
+            stripped = line.strip()
+            if stripped[0] != '"' and stripped[-1] != '"':
+                multiline = [line.rstrip()]
+                continue
+
+        parts = line.split(None, 1)
+        if not parts:
+            continue
+        if len(parts) == 1 and parts[0] == "]":
+            yield _GML_END, "]"
+            continue
+        if len(parts) == 2:
+            key, value = parts
+            value = value.rstrip()
+            if key not in keys and _GML_KEY_PATTERN.fullmatch(key):
+                keys.add(key)
+            if key in keys:
+                if value == "[":
+                    yield _GML_KEY, key
+                    yield _GML_START, "["
+                    continue
+                if value[0] == '"' and value.find('"', 1) == len(value) - 1:
+                    yield _GML_KEY, key
+                    yield _GML_STRING, value
+                    continue
+                if _GML_INT_PATTERN.fullmatch(value):
+                    yield _GML_KEY, key
+                    yield _GML_INT, int(value)
+                    continue
+        yield from _gml_line_tokens(line, lineno)
+
+
+def _gml_unescape(text):
+    """Replace XML character references, as nx.read_gml does."""
+    if "&" not in text:
+        return text
+
+    def replace(match):
+        ref = match.group(0)
+        if ref[1] == "#":
+            code = int(ref[3:-1], 16) if ref[2] == "x" else int(ref[2:-1])
+        else:
+            from html.entities import name2codepoint
+
+            code = name2codepoint.get(ref[1:-1])
+            if code is None:
+                return ref
+        try:
+            return chr(code)
+        except (ValueError, OverflowError):
+            return ref
+
+    return _GML_ENTITY.sub(replace, text)
+
+
+def _gml_value(key, tokens):
+    """Parse the value following key, as nx.read_gml does."""
+    kind, value = next(tokens, (None, None))
+    if kind == _GML_REAL or kind == _GML_INT:
+        return value
+    if kind == _GML_STRING:
+        value = _gml_unescape(value[1:-1])
+        if value == "()":
+            return ()
+        if value == "[]":
+            return []
+        return value
+    if kind == _GML_START:
+        return _gml_dict(tokens)
+    if kind == _GML_KEY:
+        # Unquoted strings are allowed for these keys, and NAN or INF for any
+        if key in ("id", "label", "source", "target"):
+            return _gml_unescape(value)
+        if value in ("NAN", "INF"):
+            return float(value)
+    found = "end of file" if kind is None else repr(value)
+    raise ValueError(f"Expected a value for GML key {key!r}, found {found}")
+
+
+def _gml_dict(tokens):
+    """Parse the key-value pairs of a block, up to its closing ']'."""
+    dct = {}
+    for kind, value in tokens:
+        if kind == _GML_END:
+            break
+        if kind != _GML_KEY:
+            raise ValueError(f"Expected a GML key or ']', found {value!r}")
+        dct.setdefault(value, []).append(_gml_value(value, tokens))
+    else:
+        raise ValueError("Unexpected end of GML file, expected ']'")
+
+    for key, values in dct.items():
+        if len(values) == 1:
+            dct[key] = values[0]
+        elif values[0] == _GML_LIST_START:
+            dct[key] = values[1:]
+    return dct
+
+
+@traced("gml_to_jsonl")
+def gml_to_jsonl(
+    path,
+    graph_name,
+    label="label",
+    node_type_key=None,
+    edge_type_key=None,
+    data_dir=None,
+    chunk_size=100_000,
+):
+    """
+    Convert a GML file to JSONL for TuringDB's LOAD JSONL command, streaming.
+
+    Gives the records networkx_to_jsonl writes for nx.read_gml(path, label=label),
+    without building the NetworkX graph: the file is tokenized line by line and
+    each node or edge block is written out as soon as it is closed. Only the map
+    of GML node IDs to integer IDs is kept in memory.
+
+    Writes the file to ~/.turing/data/{graph_name}.jsonl (or data_dir/{graph_name}.jsonl).
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        The GML file.
+    graph_name : str
+        Base name used for the output filename ({graph_name}.jsonl).
+    label : str or None, default="label"
+        As in nx.read_gml: the node attribute giving the node ID (the "id"
+        property), removed from the properties. If None or "id", the GML id is
+        used.
+    node_type_key, edge_type_key, data_dir :
+        As in networkx_to_jsonl.
+    chunk_size : int, default=100_000
+        Number of records serialized and written at once.
+
+    Returns
+    -------
+    str
+        The filename (without directory path) to pass to the LOAD JSONL command.
+
+    Notes
+    -----
+    - Nodes, their labels and properties are those of networkx_to_jsonl, in file
+      order. Relationships are written in file order, with source and target as
+      in the file; networkx_to_jsonl follows the adjacency order of the graph,
+      which for undirected graphs can list an edge from its target.
+    - The "key" of edges is dropped in multigraphs, as nx.read_gml does; the
+      directed and multigraph flags must come before the edges, as write_gml
+      puts them.
+    - Edges met before their endpoints' node blocks are spooled to a temporary
+      file and written once all nodes are known.
+    - Unlike nx.read_gml, duplicate node labels are not detected (that would
+      need every label in memory) and repeated edges of simple graphs are kept.
+    """
+    import os
+    import shutil
+    import tempfile
+    import time
+
+    if data_dir is None:
+        data_dir = os.path.expanduser("~/.turing/data")
+    os.makedirs(data_dir, exist_ok=True)
+
+    filename = f"{graph_name}.jsonl"
+    filepath = os.path.join(data_dir, filename)
+    use_label = label is not None and label != "id"
+
+    start_time = time.perf_counter()
+    node_id_map = {}
+    n_rels = 0
+    n_deferred = 0
+    multigraph = False
+    key_cache = {}
+    nodes = []
+    rels = []
+
+    def node_id(block, kind, attr):
+        try:
+            return block.pop(attr)
+        except KeyError:
+            raise ValueError(f"GML {kind} has no {attr!r} attribute") from None
+
+    def add_edge(block, out):
+        nonlocal n_rels
+        source = node_id(block, "edge", "source")
+        target = node_id(block, "edge", "target")
+        if multigraph:
+            block.pop("key", None)
+        for endpoint in (source, target):
+            if endpoint not in node_id_map:
+                raise ValueError(f"GML edge has undefined endpoint {endpoint!r}")
+        out.append(
+            _jsonl_relationship_record(
+                n_rels,
+                node_id_map[source],
+                node_id_map[target],
+                block,
+                edge_type_key,
+                key_cache,
+            )
+        )
+        n_rels += 1
+
+    def flush(records, out):
+        if records:
+            text = "".join(records)
+            with span("file.write", bytes=len(text)):
+                out.write(text)
+            records.clear()
+
+    with open(path, encoding="utf-8") as gml, open(
+        filepath, "w", encoding="utf-8"
+    ) as f, tempfile.TemporaryFile(
+        "w+", encoding="utf-8", dir=data_dir
+    ) as rels_file, tempfile.TemporaryFile(
+        "w+", encoding="utf-8", dir=data_dir
+    ) as deferred:
+        tokens = _gml_tokens(gml)
+        in_graph = False
+        for kind, key in tokens:
+            if not in_graph:
+                if kind != _GML_KEY:
+                    raise ValueError(f"Expected a GML key, found {key!r}")
+                if key != "graph":
+                    _gml_value(key, tokens)
+                    continue
+                if next(tokens, (None, None))[0] != _GML_START:
+                    raise ValueError("Expected '[' after GML key 'graph'")
+                in_graph = True
+                continue
+
+            if kind == _GML_END:
+                in_graph = False
+                continue
+            if kind != _GML_KEY:
+                raise ValueError(f"Expected a GML key or ']', found {key!r}")
+            value = _gml_value(key, tokens)
+            if key == "multigraph":
+                multigraph = bool(value)
+            elif key == "node":
+                gml_id = node_id(value, "node", "id")
+                if gml_id in node_id_map:
+                    raise ValueError(f"GML node id {gml_id!r} is duplicated")
+                key_value = node_id(value, "node", label) if use_label else gml_id
+                int_id = len(node_id_map)
+                node_id_map[gml_id] = int_id
+                nodes.append(
+                    _jsonl_node_record(
+                        int_id, key_value, value, node_type_key, key_cache
+                    )
+                )
+                if len(nodes) >= chunk_size:
+                    flush(nodes, f)
+            elif key == "edge":
+                source, target = value.get("source"), value.get("target")
+                if source in node_id_map and target in node_id_map:
+                    add_edge(value, rels)
+                    if len(rels) >= chunk_size:
+                        flush(rels, rels_file)
+                else:
+                    deferred.write(json.dumps(value) + "\n")
+                    n_deferred += 1
+        if in_graph:
+            raise ValueError("Unexpected end of GML file, expected ']'")
+        flush(nodes, f)
+
+        if n_deferred:
+            deferred.seek(0)
+            for line in deferred:
+                add_edge(json.loads(line), rels)
+                if len(rels) >= chunk_size:
+                    flush(rels, rels_file)
+        flush(rels, rels_file)
+
+        with span("file.write", bytes=rels_file.tell()):
+            rels_file.seek(0)
+            shutil.copyfileobj(rels_file, f)
+
+    elapsed = time.perf_counter() - start_time
+    n_records = len(node_id_map) + n_rels
+    count("records", n_records)
+    print(f"JSONL file written to: {filepath}")
+    print(f"Graph: {len(node_id_map):,} nodes, {n_rels:,} edges")
+    print(
+        f"Converted {n_records:,} records in {elapsed:.2f}s "
+        f"({n_records / max(elapsed, 1e-9):,.0f} records/s)"
+    )
     return filename
 
 
+# Stands for "no value on this record" in property columns rebuilt as lists
+_MISSING = object()
+
+
+class PropertyColumn:
+    """
+    One node or edge property as a typed array plus a validity mask.
+
+    kind is one of:
+    - 'bool', 'int' (int64), 'float' (float64): values is a NumPy array of that type.
+    - 'category': all values are strings, stored as int32 codes into categories.
+    - 'object': anything else (mixed types, lists, ...), as an object array.
+    valid marks the records that have the property.
+    """
+
+    __slots__ = ("kind", "values", "valid", "categories")
+
+    def __init__(self, kind, values, valid, categories=None):
+        self.kind = kind
+        self.values = values
+        self.valid = valid
+        self.categories = categories
+
+    @classmethod
+    def from_values(cls, n, positions, values):
+        """Column of length n holding values at positions (missing elsewhere)."""
+        valid = np.zeros(n, dtype=bool)
+        valid[positions] = True
+        types = set(map(type, values))
+
+        kind, dtype = "object", object
+        if types <= {bool, np.bool_}:
+            kind, dtype = "bool", bool
+        elif types <= {int, np.int64, np.int32}:
+            kind, dtype = "int", np.int64
+        elif types <= {float, np.float64}:
+            kind, dtype = "float", np.float64
+        elif types == {str}:
+            codes, categories = pd.factorize(np.array(values, dtype=object))
+            column_codes = np.full(n, -1, dtype=np.int32)
+            column_codes[positions] = codes
+            return cls("category", column_codes, valid, np.asarray(categories))
+
+        if dtype is not object:
+            try:
+                array = np.zeros(n, dtype=dtype)
+                array[positions] = values
+                return cls(kind, array, valid)
+            except OverflowError:
+                pass
+        array = np.empty(n, dtype=object)
+        array[positions] = _object_array(values)
+        return cls("object", array, valid)
+
+    def __len__(self):
+        return len(self.valid)
+
+    def take(self, positions):
+        """Column of the records at positions."""
+        return PropertyColumn(
+            self.kind, self.values[positions], self.valid[positions], self.categories
+        )
+
+    def to_list(self, start=0, stop=None):
+        """Python values of records start:stop, _MISSING where not set."""
+        values = self.values[start:stop]
+        if self.kind == "category":
+            values = self.categories[values]
+        values = values.tolist()
+        valid = self.valid[start:stop]
+        if not valid.all():
+            for i in np.flatnonzero(~valid).tolist():
+                values[i] = _MISSING
+        return values
+
+    def nbytes(self, deep=True):
+        """Bytes held by the arrays (and, if deep, by the Python objects in them)."""
+        size = self.values.nbytes + self.valid.nbytes
+        if self.categories is not None:
+            size += _array_bytes(self.categories, deep)
+        elif self.kind == "object" and deep:
+            size += _object_bytes(self.values[self.valid])
+        return size
+
+
+def _object_array(values):
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _object_bytes(array):
+    import sys
+
+    return sum(sys.getsizeof(v) for v in array.tolist())
+
+
+def _array_bytes(array, deep=True):
+    size = array.nbytes
+    if deep and array.dtype == object:
+        size += _object_bytes(array)
+    return size
+
+
+def _property_columns(dicts):
+    """Attribute dicts -> {key: PropertyColumn}, keys in first-seen order."""
+    collected = {}
+    for i, attrs in enumerate(dicts):
+        for key, value in attrs.items():
+            entry = collected.get(key)
+            if entry is None:
+                entry = collected[key] = ([], [])
+            entry[0].append(i)
+            entry[1].append(value)
+    return {
+        key: PropertyColumn.from_values(
+            len(dicts), np.array(positions, dtype=np.int64), values
+        )
+        for key, (positions, values) in collected.items()
+    }
+
+
+def _merge_duplicate_edges(codes, n_groups, columns):
+    """
+    Collapse edges sharing a group code, like repeated add_edge calls on a graph.
+
+    Every property takes its last set value within the group, so the result
+    matches successive attrs.update() calls.
+    """
+    merged = {}
+    for key, column in columns.items():
+        positions = np.flatnonzero(column.valid)[::-1]
+        groups, first = np.unique(codes[positions], return_index=True)
+        last = positions[first]
+        valid = np.zeros(n_groups, dtype=bool)
+        valid[groups] = True
+        if column.kind == "object":
+            values = np.empty(n_groups, dtype=object)
+        else:
+            values = np.zeros(n_groups, dtype=column.values.dtype)
+        values[groups] = column.values[last]
+        merged[key] = PropertyColumn(column.kind, values, valid, column.categories)
+    return merged
+
+
+def _concat_columns(parts, lengths):
+    """Stack {key: PropertyColumn} dicts of consecutive record ranges."""
+    keys = dict.fromkeys(key for part in parts for key in part)
+    columns = {}
+    for key in keys:
+        pieces = [part.get(key) for part in parts]
+        valid = np.concatenate(
+            [
+                piece.valid if piece is not None else np.zeros(n, dtype=bool)
+                for piece, n in zip(pieces, lengths)
+            ]
+        )
+        kinds = {piece.kind for piece in pieces if piece is not None}
+        kind = kinds.pop() if len(kinds) == 1 else "object"
+
+        if kind == "category":
+            categories, remaps = [], []
+            for piece in pieces:
+                remaps.append(len(categories))
+                if piece is not None:
+                    categories.extend(piece.categories.tolist())
+            codes_map, categories = pd.factorize(_object_array(categories))
+            values = np.concatenate(
+                [
+                    codes_map[piece.values + offset] if piece is not None else
+                    np.full(n, -1, dtype=np.intp)
+                    for piece, n, offset in zip(pieces, lengths, remaps)
+                ]
+            ).astype(np.int32)
+            values[~valid] = -1
+            columns[key] = PropertyColumn(kind, values, valid, np.asarray(categories))
+            continue
+
+        arrays = []
+        for piece, n in zip(pieces, lengths):
+            if piece is None:
+                dtype = object if kind == "object" else _KIND_DTYPES[kind]
+                arrays.append(np.zeros(n, dtype=dtype))
+            elif kind == "object" and piece.kind != "object":
+                array = _object_array(piece.to_list())
+                array[~piece.valid] = None
+                arrays.append(array)
+            else:
+                arrays.append(piece.values)
+        columns[key] = PropertyColumn(kind, np.concatenate(arrays), valid)
+    return columns
+
+
+_KIND_DTYPES = {"bool": bool, "int": np.int64, "float": np.float64}
+
+
+class ArrayGraph:
+    """
+    Graph held in NumPy arrays: CSR adjacency and typed property columns.
+
+    Node i has ID node_ids[i]. Edges are stored sorted by source node: the edges
+    of node i are the positions indptr[i]:indptr[i + 1], and indices holds their
+    target nodes. Node and edge properties are PropertyColumn objects; string
+    properties such as labels and relationship types are dictionary-encoded.
+
+    Uses a fraction of the memory of nx.DiGraph, whose nested dicts take several
+    hundred bytes per edge (see memory_usage()). It has the nodes(data=True),
+    edges(data=True), number_of_nodes(), number_of_edges() and is_directed()
+    methods the exporters use, so it can be passed to networkx_to_jsonl,
+    build_create_command_from_networkx, iter_cypher_chunks and graph_delta in
+    place of a NetworkX graph, and gives the same output.
+
+    Build it with from_dataframe (same arguments as create_graph_from_df),
+    from_networkx or from_records; to_networkx converts back.
+
+    Notes
+    -----
+    Attribute dicts rebuilt by nodes(data=True) and edges(data=True) list their
+    keys in column order, which can differ from the insertion order of the
+    original dicts when records set their properties in different orders.
+    """
+
+    def __init__(
+        self,
+        node_ids,
+        node_properties,
+        indptr,
+        indices,
+        edge_properties,
+        directed=True,
+    ):
+        self.node_ids = node_ids
+        self.node_properties = node_properties
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_properties = edge_properties
+        self.directed = directed
+        self._index = None
+
+    @classmethod
+    def from_records(
+        cls,
+        node_ids,
+        node_attrs,
+        sources,
+        targets,
+        edge_attrs,
+        directed=True,
+    ):
+        """
+        Build from node and edge records.
+
+        Parameters
+        ----------
+        node_ids : sequence
+            Unique node IDs, in order.
+        node_attrs : sequence of dict
+            Attributes of each node.
+        sources, targets : sequence
+            Edge endpoints (node IDs, all in node_ids).
+        edge_attrs : sequence of dict
+            Attributes of each edge.
+        directed : bool, default=True
+            Whether (u, v) and (v, u) are different edges. Edges repeating a
+            pair are merged into the first one, later attributes winning, as in
+            nx.DiGraph / nx.Graph.
+        """
+        return cls._from_columns(
+            _object_array(list(node_ids)),
+            _property_columns(node_attrs),
+            _object_array(list(sources)),
+            _object_array(list(targets)),
+            _property_columns(edge_attrs),
+            directed,
+        )
+
+    @classmethod
+    def _from_columns(cls, ids, node_columns, sources, targets, edge_columns, directed):
+        if len(ids) and all(type(v) is int for v in ids.tolist()):
+            try:
+                ids = ids.astype(np.int64)
+            except OverflowError:
+                pass
+        n_nodes = len(ids)
+        index_dtype = np.int32 if n_nodes < 2**31 else np.int64
+
+        node_index = pd.Index(ids)
+        src = node_index.get_indexer(sources)
+        dst = node_index.get_indexer(targets)
+        if (src < 0).any() or (dst < 0).any():
+            raise ValueError("Edge endpoints must all be in node_ids")
+
+        # Repeated (source, target) pairs merge into the first, as in NetworkX
+        if directed:
+            u, v = src, dst
+        else:
+            u, v = np.minimum(src, dst), np.maximum(src, dst)
+        codes, uniques = pd.factorize(u.astype(np.int64) * max(n_nodes, 1) + v)
+        if len(uniques) < len(codes):
+            _, first = np.unique(codes, return_index=True)
+            src, dst = src[first], dst[first]
+            edge_columns = _merge_duplicate_edges(codes, len(uniques), edge_columns)
+        if not directed:
+            # nx.Graph lists an edge from whichever endpoint comes first
+            src, dst = np.minimum(src, dst), np.maximum(src, dst)
+
+        order = np.argsort(src, kind="stable")
+        indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n_nodes), out=indptr[1:])
+        return cls(
+            ids,
+            node_columns,
+            indptr,
+            dst[order].astype(index_dtype),
+            {key: column.take(order) for key, column in edge_columns.items()},
+            directed=directed,
+        )
+
+    @classmethod
+    def from_networkx(cls, G):
+        """Build from a NetworkX graph, keeping its node and edge order."""
+        node_ids, node_attrs = zip(*G.nodes(data=True)) if len(G) else ((), ())
+        edges = list(G.edges(data=True))
+        sources, targets, edge_attrs = zip(*edges) if edges else ((), (), ())
+        return cls.from_records(
+            node_ids, node_attrs, sources, targets, edge_attrs, G.is_directed()
+        )
+
+    @classmethod
+    def from_dataframe(
+        cls,
+        df: pd.DataFrame,
+        *,
+        directed: bool = True,
+        node_attributes_df: Optional[pd.DataFrame] = None,
+        node_attributes_key_col: str = "id",
+        chunksize: int = 100_000,
+        property_types: Union[str, Dict[str, str], None] = None,
+        **column_spec,
+    ):
+        """
+        Build the graph create_graph_from_df(df, ...) would, without NetworkX.
+
+        Takes the same arguments as create_graph_from_df (engine excepted) and
+        gives the same nodes, edges and attributes. The DataFrame is processed
+        chunksize rows at a time, so the per-record dicts built along the way
+        never outnumber one chunk. With property_types, the types are inferred
+        once on the whole DataFrame and every chunk is converted with them.
+        """
+        unique_node_attrs = None
+        if node_attributes_df is not None:
+            node_attributes_df = _strip_string_columns(node_attributes_df)
+            if property_types is not None:
+                node_attributes_df = _typed_node_attributes(
+                    node_attributes_df, node_attributes_key_col, property_types
+                )
+            unique_node_attrs = node_attributes_df.drop_duplicates(
+                subset=[node_attributes_key_col]
+            ).set_index(node_attributes_key_col)
+        optional_nodes_cols = column_spec.get("optional_nodes_cols")
+        edge_col = column_spec.get("edge_col")
+
+        schema = None
+        seen = set()
+        node_parts, edge_parts = [], []
+        for start in range(0, len(df), chunksize):
+            chunk = df.iloc[start : start + chunksize]
+            with span("validate_columns", columns=len(chunk.columns)):
+                chunk = _strip_string_columns(chunk)
+                resolved = _resolve_column_spec(
+                    chunk.columns,
+                    source_node_col=column_spec.get("source_node_col", "source"),
+                    target_node_col=column_spec.get("target_node_col"),
+                    attributes_source_node_cols=column_spec.get(
+                        "attributes_source_node_cols"
+                    ),
+                    attributes_target_node_cols=column_spec.get(
+                        "attributes_target_node_cols"
+                    ),
+                    optional_nodes_cols=optional_nodes_cols,
+                    attributes_edges=column_spec.get("attributes_edges"),
+                    edge_col=edge_col,
+                )
+                if property_types is not None:
+                    if schema is None:
+                        attribute_cols = _attribute_columns(
+                            *resolved, optional_nodes_cols
+                        )
+                        schema = _property_schema(
+                            _strip_string_columns(df[attribute_cols]),
+                            property_types,
+                            attribute_cols,
+                        )
+                    chunk = coerce_types(chunk, schema)
+                slots, edge_kinds = _columnar_layout(
+                    chunk,
+                    *resolved,
+                    optional_nodes_cols,
+                    edge_col,
+                    column_spec.get("edge_col_label"),
+                )
+            (node_ids, node_attrs), (sources, targets, edge_attrs) = _columnar_tables(
+                chunk, slots, edge_kinds, unique_node_attrs, known_ids=seen
+            )
+            with span("graph_insert", nodes=len(node_ids), edges=len(sources)):
+                seen.update(node_ids)
+                node_parts.append(
+                    (_object_array(node_ids), _property_columns(node_attrs))
+                )
+                edge_parts.append(
+                    (
+                        _object_array(sources),
+                        _object_array(targets),
+                        _property_columns(edge_attrs),
+                    )
+                )
+
+        def stack(arrays):
+            return np.concatenate(arrays) if arrays else np.empty(0, dtype=object)
+
+        with span("graph_insert"):
+            return cls._from_columns(
+                stack([ids for ids, _ in node_parts]),
+                _concat_columns(
+                    [columns for _, columns in node_parts],
+                    [len(ids) for ids, _ in node_parts],
+                ),
+                stack([sources for sources, _, _ in edge_parts]),
+                stack([targets for _, targets, _ in edge_parts]),
+                _concat_columns(
+                    [columns for _, _, columns in edge_parts],
+                    [len(sources) for sources, _, _ in edge_parts],
+                ),
+                directed,
+            )
+
+    def to_networkx(self):
+        """The same graph as an nx.DiGraph (or nx.Graph if undirected)."""
+        G = nx.DiGraph() if self.directed else nx.Graph()
+        node_ids = self.node_ids.tolist()
+        nodes = (node_ids, [attrs for _, attrs in self.nodes(data=True)])
+        sources = self.edge_sources()
+        edges = (
+            self.node_ids[sources].tolist(),
+            self.node_ids[self.indices].tolist(),
+            list(self._attr_dicts(self.edge_properties, self.number_of_edges())),
+        )
+        _bulk_add(G, nodes, edges)
+        return G
+
+    def number_of_nodes(self):
+        return len(self.node_ids)
+
+    def number_of_edges(self):
+        return len(self.indices)
+
+    def __len__(self):
+        return self.number_of_nodes()
+
+    def is_directed(self):
+        return self.directed
+
+    def node_index(self, node_id):
+        """Position of node_id in node_ids."""
+        if self._index is None:
+            self._index = pd.Index(self.node_ids)
+        position = self._index.get_indexer([node_id])[0]
+        if position < 0:
+            raise KeyError(node_id)
+        return position
+
+    def edge_sources(self):
+        """Source node position of every edge."""
+        return np.repeat(
+            np.arange(self.number_of_nodes(), dtype=self.indices.dtype),
+            np.diff(self.indptr),
+        )
+
+    def out_degree(self):
+        """Out-degree of every node, as an array (degree if undirected)."""
+        degree = np.diff(self.indptr)
+        if not self.directed:
+            degree = degree + np.bincount(self.indices, minlength=len(degree))
+        return degree
+
+    def in_degree(self):
+        """In-degree of every node, as an array (degree if undirected)."""
+        if not self.directed:
+            return self.out_degree()
+        return np.bincount(self.indices, minlength=self.number_of_nodes())
+
+    def successors(self, node_id):
+        """IDs of the targets of node_id's outgoing edges."""
+        i = self.node_index(node_id)
+        return self.node_ids[self.indices[self.indptr[i] : self.indptr[i + 1]]].tolist()
+
+    def predecessors(self, node_id):
+        """IDs of the sources of node_id's incoming edges, by source position."""
+        i = self.node_index(node_id)
+        return self.node_ids[self.edge_sources()[self.indices == i]].tolist()
+
+    def nodes(self, data=False):
+        """Iterate over node IDs, or (node_id, attrs) pairs if data is True."""
+        if not data:
+            return iter(self.node_ids.tolist())
+        return zip(
+            self.node_ids.tolist(),
+            self._attr_dicts(self.node_properties, self.number_of_nodes()),
+        )
+
+    def edges(self, data=False):
+        """Iterate over (source, target) or (source, target, attrs) edges."""
+        sources = self.node_ids[self.edge_sources()].tolist()
+        targets = self.node_ids[self.indices].tolist()
+        if not data:
+            return zip(sources, targets)
+        return zip(
+            sources,
+            targets,
+            self._attr_dicts(self.edge_properties, self.number_of_edges()),
+        )
+
+    @staticmethod
+    def _attr_dicts(columns, n, block_size=65_536):
+        """Yield one attribute dict per record, decoding block_size records at once."""
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            block = [(key, column.to_list(start, stop)) for key, column in columns.items()]
+            for i in range(stop - start):
+                attrs = {}
+                for key, values in block:
+                    value = values[i]
+                    if value is not _MISSING:
+                        attrs[key] = value
+                yield attrs
+
+    def memory_usage(self, deep=True):
+        """
+        Bytes held by the graph, by part, and per edge.
+
+        Returns
+        -------
+        dict
+            node_ids, adjacency, node_properties, edge_properties and total bytes,
+            plus bytes_per_edge (total / number of edges). With deep, Python
+            objects referenced by object arrays (string IDs, categories) count too.
+        """
+        usage = {
+            "node_ids": _array_bytes(self.node_ids, deep),
+            "adjacency": self.indptr.nbytes + self.indices.nbytes,
+            "node_properties": sum(
+                column.nbytes(deep) for column in self.node_properties.values()
+            ),
+            "edge_properties": sum(
+                column.nbytes(deep) for column in self.edge_properties.values()
+            ),
+        }
+        usage["total"] = sum(usage.values())
+        usage["bytes_per_edge"] = usage["total"] / max(self.number_of_edges(), 1)
+        return usage
+
+    def __repr__(self):
+        kind = "directed" if self.directed else "undirected"
+        return (
+            f"ArrayGraph({kind}, {self.number_of_nodes():,} nodes, "
+            f"{self.number_of_edges():,} edges)"
+        )
+
+
+def _cypher_literal(v):
+    """Cypher literal for a property value, or None when the value is missing."""
+    if isinstance(v, str):
+        return '"' + escape_string(v) + '"'
+    if isinstance(v, (bool, np.bool_)):
+        return "true" if v else "false"
+    if isinstance(v, (int, np.integer)):
+        return str(int(v))
+    if isinstance(v, (float, np.floating)):
+        return repr(float(v)) if math.isfinite(v) else None
+    if v is None or v is pd.NA or v is pd.NaT:
+        return None
+    return '"' + escape_string(str(v)) + '"'
+
+
+def _cypher_name(name):
+    """Label, relationship type or property key, backticked unless a plain identifier."""
+    name = str(name)
+    if name.isidentifier():
+        return name
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _cypher_properties(attrs, skip_key=None):
+    """(key, literal) pairs of attrs, skipping skip_key and missing values."""
+    props = []
+    for k, v in attrs.items():
+        if k == skip_key:
+            continue
+        literal = _cypher_literal(v)
+        if literal is not None:
+            props.append((k, literal))
+    return props
+
+
+def _content_signature(label, attrs, skip_key=None):
+    """Content hash of a node or relationship, and the property keys it carries."""
+    props = sorted(_cypher_properties(attrs, skip_key), key=lambda kv: str(kv[0]))
+    text = "\x1f".join([label] + [f"{k}\x1e{literal}" for k, literal in props])
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+    return digest, [str(k) for k, _ in props]
+
+
+def _graph_manifest(G, node_type_key, edge_type_key):
+    """
+    Manifest of G as exported by networkx_to_jsonl.
+
+    nodes maps str(node_id) to [int_id, label, hash, keys] and edges lists
+    [source, target, type, hash, keys]. Nodes are hashed without their "id"
+    attribute, since the delta matches nodes on id = str(node_id).
+    """
+    nodes = {}
+    for int_id, (node_id, attrs) in enumerate(G.nodes(data=True)):
+        label = _jsonl_node_label(attrs, node_type_key)
+        nodes[str(node_id)] = [int_id, label, *_content_signature(label, attrs, "id")]
+    edges = []
+    for source, target, attrs in G.edges(data=True):
+        rel_type = _jsonl_rel_type(attrs, edge_type_key)
+        edges.append(
+            [
+                str(source),
+                str(target),
+                rel_type,
+                *_content_signature(rel_type, attrs, edge_type_key),
+            ]
+        )
+    return {
+        "version": 1,
+        "node_type_key": node_type_key,
+        "edge_type_key": edge_type_key,
+        "directed": G.is_directed(),
+        "next_node_id": len(nodes),
+        "nodes": nodes,
+        "edges": edges,
+    }
+
+
+def _manifest_path(data_dir, graph_name):
+    import os
+
+    if data_dir is None:
+        data_dir = os.path.expanduser("~/.turing/data")
+    return os.path.join(data_dir, f"{graph_name}.manifest.json")
+
+
+def _write_manifest(manifest, data_dir, graph_name):
+    """Write the manifest atomically, so a failed write keeps the previous one."""
+    import os
+
+    path = _manifest_path(data_dir, graph_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    return path
+
+
+def _node_pattern(var, label, node_key):
+    return f'({var}:{_cypher_name(label)} {{id: "{escape_value(node_key)}"}})'
+
+
+def _set_clauses(var, props, removed_keys=()):
+    clauses = []
+    if props:
+        clauses.append(
+            "SET "
+            + ", ".join(f"{var}.{_cypher_name(k)} = {literal}" for k, literal in props)
+        )
+    if removed_keys:
+        clauses.append(
+            "REMOVE " + ", ".join(f"{var}.{_cypher_name(k)}" for k in removed_keys)
+        )
+    return clauses
+
+
+def _batches(items, batch_size):
+    for start in range(0, len(items), batch_size):
+        yield items[start : start + batch_size]
+
+
+def graph_delta(
+    G,
+    manifest,
+    node_type_key=None,
+    edge_type_key=None,
+    batch_size=1_000,
+    **graph_kwargs,
+):
+    """
+    Diff a graph against the manifest of its last export, as batched Cypher.
+
+    Parameters
+    ----------
+    G : nx.Graph, nx.DiGraph or pd.DataFrame
+        The new version of the graph. A DataFrame is first turned into a graph
+        with create_graph_from_df(G, engine="columnar", **graph_kwargs).
+    manifest : dict, str or os.PathLike
+        Manifest written by networkx_to_jsonl(..., manifest=True) or by a
+        previous apply_graph_delta, or the path to it.
+    node_type_key, edge_type_key : str or None
+        As in networkx_to_jsonl. Must match the ones the manifest was made with.
+    batch_size : int, default=1_000
+        Maximum number of nodes or relationships touched by one statement.
+
+    Returns
+    -------
+    commands : list of str
+        Statements to run in order: relationship deletes, node deletes, node
+        creates, node updates, relationship creates, relationship updates.
+    new_manifest : dict
+        Manifest of G, to be saved once the commands are applied.
+    stats : dict
+        Number of nodes and edges created, updated and deleted.
+
+    Notes
+    -----
+    - Nodes are matched on label and id = str(node_id), relationships on their
+      endpoints and type. A node whose label changed, or a relationship whose
+      type changed, is deleted and created again, along with the relationships
+      of such a node.
+    - Kept nodes keep their integer ID and new ones get IDs past the highest
+      ever handed out, so the ID map stays stable across versions.
+    - For undirected graphs an edge matches the manifest in either direction.
+    """
+    if isinstance(G, pd.DataFrame):
+        G = create_graph_from_df(G, engine="columnar", **graph_kwargs)
+    if not isinstance(manifest, dict):
+        with open(manifest, encoding="utf-8") as f:
+            manifest = json.load(f)
+    if (manifest["node_type_key"], manifest["edge_type_key"]) != (
+        node_type_key,
+        edge_type_key,
+    ):
+        raise ValueError(
+            "node_type_key and edge_type_key must match the manifest: "
+            f"{manifest['node_type_key']!r}, {manifest['edge_type_key']!r}"
+        )
+    directed = G.is_directed()
+    if manifest["directed"] != directed:
+        raise ValueError("G and the manifest disagree on whether edges are directed")
+
+    old_nodes = manifest["nodes"]
+    next_node_id = manifest["next_node_id"]
+    nodes = {}
+    node_creates, node_updates, recreated = [], [], set()
+    for node_id, attrs in G.nodes(data=True):
+        key = str(node_id)
+        label = _jsonl_node_label(attrs, node_type_key)
+        digest, keys = _content_signature(label, attrs, "id")
+        old = old_nodes.get(key)
+        if old is None:
+            int_id = next_node_id
+            next_node_id += 1
+            node_creates.append((key, label, attrs))
+        else:
+            int_id = old[0]
+            if old[1] != label:
+                recreated.add(key)
+                node_creates.append((key, label, attrs))
+            elif old[2] != digest:
+                removed_keys = sorted(set(old[3]) - set(keys))
+                node_updates.append((key, label, attrs, removed_keys))
+        nodes[key] = [int_id, label, digest, keys]
+    node_deletes = [
+        (key, old[1])
+        for key, old in old_nodes.items()
+        if key not in nodes or key in recreated
+    ]
+
+    old_edges = {(e[0], e[1]): e for e in manifest["edges"]}
+    edges, kept = [], set()
+    edge_creates, edge_updates = [], []
+    for source, target, attrs in G.edges(data=True):
+        s, t = str(source), str(target)
+        old = old_edges.get((s, t))
+        if old is None and not directed:
+            old = old_edges.get((t, s))
+            if old is not None:
+                s, t = t, s
+        rel_type = _jsonl_rel_type(attrs, edge_type_key)
+        digest, keys = _content_signature(rel_type, attrs, edge_type_key)
+        if old is None or old[2] != rel_type or s in recreated or t in recreated:
+            edge_creates.append((s, t, rel_type, attrs))
+        else:
+            kept.add((s, t))
+            if old[3] != digest:
+                removed_keys = sorted(set(old[4]) - set(keys))
+                edge_updates.append((s, t, rel_type, attrs, removed_keys))
+        edges.append([s, t, rel_type, digest, keys])
+    edge_deletes = [e for pair, e in old_edges.items() if pair not in kept]
+
+    commands = []
+    for batch in _batches(edge_deletes, batch_size):
+        patterns = [
+            f"{_node_pattern(f'a{i}', old_nodes[s][1], s)}"
+            f"-[r{i}:{_cypher_name(rel_type)}]->"
+            f"{_node_pattern(f'b{i}', old_nodes[t][1], t)}"
+            for i, (s, t, rel_type, *_) in enumerate(batch)
+        ]
+        commands.append(
+            "MATCH "
+            + ", ".join(patterns)
+            + " DELETE "
+            + ", ".join(f"r{i}" for i in range(len(batch)))
+        )
+    for batch in _batches(node_deletes, batch_size):
+        patterns = [
+            _node_pattern(f"n{i}", label, key) for i, (key, label) in enumerate(batch)
+        ]
+        commands.append(
+            "MATCH "
+            + ", ".join(patterns)
+            + " DELETE "
+            + ", ".join(f"n{i}" for i in range(len(batch)))
+        )
+    for batch in _batches(node_creates, batch_size):
+        parts = []
+        for key, label, attrs in batch:
+            props = [("id", f'"{escape_value(key)}"')]
+            props += _cypher_properties(attrs, skip_key="id")
+            props = ", ".join(f"{_cypher_name(k)}: {literal}" for k, literal in props)
+            parts.append(f"(:{_cypher_name(label)} {{{props}}})")
+        commands.append("CREATE " + ",\n".join(parts))
+    for batch in _batches(node_updates, batch_size):
+        patterns, clauses = [], []
+        for i, (key, label, attrs, removed_keys) in enumerate(batch):
+            patterns.append(_node_pattern(f"n{i}", label, key))
+            props = _cypher_properties(attrs, skip_key="id")
+            clauses += _set_clauses(f"n{i}", props, removed_keys)
+        commands.append("MATCH " + ", ".join(patterns) + " " + " ".join(clauses))
+    for batch in _batches(edge_creates, batch_size):
+        patterns, parts = [], []
+        for i, (s, t, rel_type, attrs) in enumerate(batch):
+            patterns.append(_node_pattern(f"a{i}", nodes[s][1], s))
+            patterns.append(_node_pattern(f"b{i}", nodes[t][1], t))
+            props = _cypher_properties(attrs, skip_key=edge_type_key)
+            props = ", ".join(f"{_cypher_name(k)}: {literal}" for k, literal in props)
+            props = f" {{{props}}}" if props else ""
+            parts.append(f"(a{i})-[:{_cypher_name(rel_type)}{props}]->(b{i})")
+        commands.append("MATCH " + ", ".join(patterns) + " CREATE " + ", ".join(parts))
+    for batch in _batches(edge_updates, batch_size):
+        patterns, clauses = [], []
+        for i, (s, t, rel_type, attrs, removed_keys) in enumerate(batch):
+            patterns.append(
+                f"{_node_pattern(f'a{i}', nodes[s][1], s)}"
+                f"-[r{i}:{_cypher_name(rel_type)}]->"
+                f"{_node_pattern(f'b{i}', nodes[t][1], t)}"
+            )
+            props = _cypher_properties(attrs, skip_key=edge_type_key)
+            clauses += _set_clauses(f"r{i}", props, removed_keys)
+        commands.append("MATCH " + ", ".join(patterns) + " " + " ".join(clauses))
+
+    new_manifest = dict(manifest, next_node_id=next_node_id, nodes=nodes, edges=edges)
+    stats = {
+        "nodes_created": len(node_creates),
+        "nodes_updated": len(node_updates),
+        "nodes_deleted": len(node_deletes),
+        "edges_created": len(edge_creates),
+        "edges_updated": len(edge_updates),
+        "edges_deleted": len(edge_deletes),
+    }
+    return commands, new_manifest, stats
+
+
+def apply_graph_delta(
+    client,
+    G,
+    graph_name,
+    node_type_key=None,
+    edge_type_key=None,
+    data_dir=None,
+    batch_size=1_000,
+    **graph_kwargs,
+):
+    """
+    Bring a loaded graph up to date with G in a single TuringDB change.
+
+    Diffs G against {graph_name}.manifest.json in data_dir (see graph_delta),
+    runs the statements in a new change on graph_name, commits and submits it,
+    then saves the new manifest. Refreshing a graph this way costs O(delta)
+    instead of a full LOAD JSONL, and each refresh shows up in CALL db.history().
+
+    Parameters
+    ----------
+    client : turingdb.TuringDB
+        Connected client.
+    G : nx.Graph, nx.DiGraph or pd.DataFrame
+        The new version of the graph, as in graph_delta.
+    graph_name : str
+        Name of the loaded graph, and base name of its manifest.
+    node_type_key, edge_type_key, batch_size, **graph_kwargs :
+        As in graph_delta.
+    data_dir : str or None
+        Directory holding the manifest. Defaults to ~/.turing/data.
+
+    Returns
+    -------
+    dict
+        Number of nodes and edges created, updated and deleted.
+
+    Notes
+    -----
+    The manifest is only replaced once the change is submitted. If a statement
+    fails the client is checked out back to main and the error is raised, so the
+    next call diffs against the last applied version again.
+    """
+    import os
+    import time
+
+    manifest_path = _manifest_path(data_dir, graph_name)
+    if not os.path.exists(manifest_path):
+        raise ValueError(
+            f"No manifest at {manifest_path}; export the graph with "
+            "networkx_to_jsonl(..., manifest=True) first"
+        )
+
+    start_time = time.perf_counter()
+    commands, new_manifest, stats = graph_delta(
+        G,
+        manifest_path,
+        node_type_key=node_type_key,
+        edge_type_key=edge_type_key,
+        batch_size=batch_size,
+        **graph_kwargs,
+    )
+
+    if commands:
+        client.set_graph(graph_name)
+        change_id = client.new_change()
+        try:
+            for command in commands:
+                client.query(command)
+            client.query("COMMIT")
+            client.query("CHANGE SUBMIT")
+            # Saved before anything else can fail, or the next call would apply
+            # the submitted delta again
+            _write_manifest(new_manifest, data_dir, graph_name)
+        finally:
+            client.checkout()
+        print(f"Applied change {change_id} with {len(commands):,} statements")
+    else:
+        _write_manifest(new_manifest, data_dir, graph_name)
+    elapsed = time.perf_counter() - start_time
+    print(
+        "Nodes: +{nodes_created:,} ~{nodes_updated:,} -{nodes_deleted:,}, "
+        "edges: +{edges_created:,} ~{edges_updated:,} -{edges_deleted:,}".format(
+            **stats
+        )
+        + f" in {elapsed:.2f}s"
+    )
+    return stats
+
+
+def _is_single_pattern(line):
+    """Whether line is one "(...)" pattern, without "), (" between two."""
+    return (
+        line.startswith("(")
+        and line.endswith(")")
+        and "), (" not in line
+        and "),(" not in line
+    )
+
+
+def _split_create_patterns(create_block, progress_bar=False):
+    """Split a CREATE block into its top-level "(...)" patterns."""
+    if progress_bar:
+        from tqdm.auto import tqdm
+
+    nodes = []
+    current_node = ""
+    paren_count = 0
+
+    chars = (
+        tqdm(create_block, desc="Iterate create characters")
+        if progress_bar
+        else create_block
+    )
+    for char in chars:
+        if char == "(":
+            paren_count += 1
+            current_node += char
+        elif char == ")":
+            current_node += char
+            paren_count -= 1
+            if paren_count == 0 and current_node.strip():
+                nodes.append(current_node.strip().rstrip(",").strip())
+                current_node = ""
+        elif paren_count > 0:
+            current_node += char
+    return nodes
+
+
+@traced("split_cypher_commands")
 def split_cypher_commands(cypher_commands, max_size_mb=1, progress_bar=False):
     """
     Split Cypher commands into chunks to avoid size limits.
     Separates node creation from edge creation.
+    iter_cypher_chunks does the same straight from the graph, without the string.
 
     Args:
         cypher_commands: Full Cypher command string
@@ -712,48 +3127,15 @@ def split_cypher_commands(cypher_commands, max_size_mb=1, progress_bar=False):
         elif in_create:
             create_block.append(line)
 
-    # Parse individual nodes from the CREATE block
-    full_create = " ".join(create_block)
-    nodes = []
-    current_node = ""
-    paren_count = 0
-
-    full_create = (
-        tqdm(full_create, desc="Iterate create characters")
-        if progress_bar
-        else full_create
-    )
-    for char in full_create:
-        if char == "(":
-            paren_count += 1
-            current_node += char
-        elif char == ")":
-            current_node += char
-            paren_count -= 1
-            if paren_count == 0 and current_node.strip():
-                nodes.append(current_node.strip().rstrip(",").strip())
-                current_node = ""
-        elif paren_count > 0:
-            current_node += char
+    # Each node of the CREATE block is normally on its own line, ending with ","
+    nodes = [node.rstrip(",").strip() for node in create_block]
+    nodes = [node for node in nodes if node]
+    if not all(_is_single_pattern(node) for node in nodes):
+        # Several patterns on a line, or one spanning lines: split on parentheses
+        nodes = _split_create_patterns(" ".join(create_block), progress_bar)
 
     # Chunk nodes by size
-    node_chunks = []
-    current_chunk = []
-    current_size = len("CREATE ".encode("utf-8"))
-
     nodes_iter = tqdm(nodes, desc="Split nodes into chunks") if progress_bar else nodes
-    for node in nodes_iter:
-        node_size = len(node.encode("utf-8")) + 2  # +2 for ",\n"
-
-        if current_size + node_size > max_bytes and current_chunk:
-            node_chunks.append("CREATE " + ",\n".join(current_chunk))
-            current_chunk = []
-            current_size = len("CREATE ".encode("utf-8"))
-
-        current_chunk.append(node)
-        current_size += node_size
-
-    if current_chunk:
-        node_chunks.append("CREATE " + ",\n".join(current_chunk))
+    node_chunks = list(_pack_create_chunks(nodes_iter, max_bytes))
 
     return {"node_chunks": node_chunks, "edge_chunks": edge_lines}
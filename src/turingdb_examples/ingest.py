@@ -0,0 +1,310 @@
+"""
+Build one graph from several tables in parallel.
+
+Each (table, column spec) job is what one create_graph_from_df call would take.
+The jobs (and the row chunks of large DataFrames) are built into ArrayGraph
+partitions by a pool of worker processes, then merged:
+
+- Nodes are deduplicated on their ID, first occurrence in job order winning with
+  all its attributes, as when create_graph_from_df meets a node again. The IDs
+  are hash-partitioned, and each partition is deduplicated by its own worker.
+- Edges are concatenated; an edge repeating a (source, target) pair is merged
+  into the first one, later attributes winning, as in NetworkX.
+
+The result is an ArrayGraph, which networkx_to_jsonl writes directly:
+
+    >>> jobs = [
+    ...     (df_sequence, {"source_node_col": {"id": "input_id"}, ...}),
+    ...     ("data/provision.csv", {"source_node_col": "provider_id", ...}),
+    ... ]
+    >>> filename = ingest_to_jsonl(jobs, "supply_chain", node_type_key="type")
+"""
+
+import contextlib
+import io
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from .graph import (
+    ArrayGraph,
+    _attribute_columns,
+    _concat_columns,
+    _object_array,
+    _property_schema,
+    _resolve_column_spec,
+    _strip_string_columns,
+    networkx_to_jsonl,
+)
+from .tracing import span
+
+# create_graph_from_df arguments a job spec may set (directed is per graph)
+_SPEC_KEYS = frozenset(
+    (
+        "source_node_col",
+        "target_node_col",
+        "attributes_source_node_cols",
+        "attributes_target_node_cols",
+        "optional_nodes_cols",
+        "attributes_edges",
+        "edge_col",
+        "edge_col_label",
+        "node_attributes_df",
+        "node_attributes_key_col",
+        "property_types",
+    )
+)
+
+
+def _check_spec(spec):
+    unknown = set(spec) - _SPEC_KEYS
+    if unknown:
+        raise ValueError(f"Unsupported job spec keys: {sorted(unknown)}")
+
+
+def _fixed_property_types(df, spec):
+    """
+    Spec with property_types inferred on the whole of df, for building df in
+    chunks that must all get the same types.
+    """
+    source_info, target_info, source_attrs, target_attrs, edge_attrs = (
+        _resolve_column_spec(
+            df.columns,
+            source_node_col=spec.get("source_node_col", "source"),
+            target_node_col=spec.get("target_node_col"),
+            attributes_source_node_cols=spec.get("attributes_source_node_cols"),
+            attributes_target_node_cols=spec.get("attributes_target_node_cols"),
+            optional_nodes_cols=spec.get("optional_nodes_cols"),
+            attributes_edges=spec.get("attributes_edges"),
+            edge_col=spec.get("edge_col"),
+        )
+    )
+    columns = _attribute_columns(
+        source_info,
+        target_info,
+        source_attrs,
+        target_attrs,
+        edge_attrs,
+        spec.get("optional_nodes_cols"),
+    )
+    schema = _property_schema(
+        _strip_string_columns(df[columns]), spec["property_types"], columns
+    )
+    return {**spec, "property_types": schema}
+
+
+def _build_partition(data, spec, directed, n_partitions, read_csv_kwargs):
+    """
+    Build one table (or row chunk) into node and edge columns.
+
+    Returns (node_ids, node_columns, node_partitions, sources, targets,
+    edge_columns, output), IDs as object arrays, node_partitions the hash
+    partition of every node ID and output what the build printed.
+    """
+    if not isinstance(data, pd.DataFrame):
+        data = pd.read_csv(data, **(read_csv_kwargs or {}))
+    # The inferred property types are returned for ingest_tables to print once
+    # per table, rather than once per chunk from the workers
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        graph = ArrayGraph.from_dataframe(data, directed=directed, **spec)
+    ids = _object_array(graph.node_ids.tolist())
+    partitions = pd.util.hash_array(ids) % np.uint64(n_partitions)
+    return (
+        ids,
+        graph.node_properties,
+        partitions.astype(np.int32),
+        ids[graph.edge_sources()],
+        ids[graph.indices],
+        graph.edge_properties,
+        output.getvalue(),
+    )
+
+
+def _first_occurrences(id_arrays):
+    """
+    Mask of the first occurrence of every ID across id_arrays, in order.
+
+    Each array holds unique IDs; returns one boolean mask per array.
+    """
+    lengths = [len(ids) for ids in id_arrays]
+    if not sum(lengths):
+        return [np.zeros(0, dtype=bool) for _ in id_arrays]
+    codes, _ = pd.factorize(np.concatenate(id_arrays))
+    _, first = np.unique(codes, return_index=True)
+    keep = np.zeros(len(codes), dtype=bool)
+    keep[first] = True
+    return np.split(keep, np.cumsum(lengths)[:-1])
+
+
+def ingest_tables(
+    jobs,
+    *,
+    directed=True,
+    n_workers=None,
+    n_partitions=None,
+    chunksize=1_000_000,
+    read_csv_kwargs=None,
+):
+    """
+    Build one graph from several tables, in a pool of worker processes.
+
+    Parameters
+    ----------
+    jobs : list of (data, spec)
+        data is a DataFrame or a CSV path (read by the worker with pd.read_csv),
+        spec a dict of create_graph_from_df arguments for that table: column
+        spec, node_attributes_df, node_attributes_key_col, property_types. The
+        property types inferred for a table are printed once.
+    directed : bool, default=True
+        Build a directed graph.
+    n_workers : int or None
+        Number of worker processes; None uses every CPU. With 1, everything runs
+        in this process.
+    n_partitions : int or None
+        Number of hash partitions of the node IDs for deduplication; defaults to
+        n_workers.
+    chunksize : int or None, default=1_000_000
+        DataFrames longer than this are built in chunks of chunksize rows, so
+        one large table is shared out too. None builds every table whole.
+    read_csv_kwargs : dict or None
+        Extra keyword arguments for pd.read_csv when data is a path.
+
+    Returns
+    -------
+    ArrayGraph
+        Nodes in job order; a node in several jobs has the attributes of its
+        first occurrence. Pass it to networkx_to_jsonl, or convert it with
+        to_networkx().
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_partitions = n_partitions or n_workers
+    start_time = time.perf_counter()
+
+    # (data, spec, whether to print what its build prints)
+    tasks = []
+    for data, spec in jobs:
+        _check_spec(spec)
+        if isinstance(data, pd.DataFrame) and chunksize and len(data) > chunksize:
+            # The types of a chunked table are inferred and printed here
+            if spec.get("property_types") is not None:
+                spec = _fixed_property_types(data, spec)
+            tasks.extend(
+                (data.iloc[start : start + chunksize], spec, False)
+                for start in range(0, len(data), chunksize)
+            )
+        else:
+            tasks.append((data, spec, True))
+
+    with contextlib.ExitStack() as stack:
+        if n_workers <= 1:
+            run = map
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            executor = stack.enter_context(
+                ProcessPoolExecutor(max_workers=min(n_workers, len(tasks) or 1))
+            )
+            run = executor.map
+
+        with span("ingest.build", tables=len(jobs), tasks=len(tasks)):
+            parts = list(
+                run(
+                    _build_partition,
+                    [data for data, _, _ in tasks],
+                    [spec for _, spec, _ in tasks],
+                    [directed] * len(tasks),
+                    [n_partitions] * len(tasks),
+                    [read_csv_kwargs] * len(tasks),
+                )
+            )
+        build_time = time.perf_counter() - start_time
+        for (_, _, report), part in zip(tasks, parts):
+            if report:
+                print(part[6], end="")
+
+        with span("ingest.dedup", partitions=n_partitions):
+            positions = [
+                [np.flatnonzero(part[2] == p) for part in parts]
+                for p in range(n_partitions)
+            ]
+            masks = run(
+                _first_occurrences,
+                [
+                    [part[0][pos] for part, pos in zip(parts, partition)]
+                    for partition in positions
+                ],
+            )
+            keep = [np.zeros(len(part[0]), dtype=bool) for part in parts]
+            for partition, partition_masks in zip(positions, masks):
+                for mask, pos, part_keep in zip(partition_masks, partition, keep):
+                    part_keep[pos] = mask
+
+    with span("ingest.merge"):
+        kept = [np.flatnonzero(mask) for mask in keep]
+        node_ids = np.concatenate(
+            [part[0][idx] for part, idx in zip(parts, kept)] or [_object_array([])]
+        )
+        node_columns = _concat_columns(
+            [
+                {key: column.take(idx) for key, column in part[1].items()}
+                for part, idx in zip(parts, kept)
+            ],
+            [len(idx) for idx in kept],
+        )
+        sources = np.concatenate([part[3] for part in parts] or [node_ids[:0]])
+        targets = np.concatenate([part[4] for part in parts] or [node_ids[:0]])
+        edge_columns = _concat_columns(
+            [part[5] for part in parts], [len(part[3]) for part in parts]
+        )
+        graph = ArrayGraph._from_columns(
+            node_ids, node_columns, sources, targets, edge_columns, directed
+        )
+
+    elapsed = time.perf_counter() - start_time
+    print(
+        f"Ingested {len(jobs)} tables ({len(tasks)} partitions) in {elapsed:.2f}s "
+        f"(build {build_time:.2f}s, n_workers={n_workers}): "
+        f"{graph.number_of_nodes():,} nodes, {graph.number_of_edges():,} edges"
+    )
+    return graph
+
+
+def ingest_to_jsonl(
+    jobs,
+    graph_name,
+    *,
+    node_type_key=None,
+    edge_type_key=None,
+    data_dir=None,
+    **kwargs,
+):
+    """
+    ingest_tables, then networkx_to_jsonl on the merged graph.
+
+    Parameters
+    ----------
+    jobs :
+        As in ingest_tables.
+    graph_name, node_type_key, edge_type_key, data_dir :
+        As in networkx_to_jsonl.
+    **kwargs
+        directed, n_workers, n_partitions, chunksize and read_csv_kwargs, as in
+        ingest_tables.
+
+    Returns
+    -------
+    str
+        The filename (without directory path) to pass to the LOAD JSONL command.
+    """
+    graph = ingest_tables(jobs, **kwargs)
+    return networkx_to_jsonl(
+        graph,
+        graph_name,
+        node_type_key=node_type_key,
+        edge_type_key=edge_type_key,
+        data_dir=data_dir,
+    )
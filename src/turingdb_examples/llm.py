@@ -1,3 +1,212 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import weakref
+
+from .tracing import count, span
+
+_DEFAULT_MODELS = {
+    "OpenAI": "gpt-4o-mini",
+    "Mistral": "mistral-small-latest",
+    "Anthropic": "claude-haiku-4-5-20251001",
+}
+
+
+# Provider clients, reused across calls so each (provider, api_key) keeps one
+# connection pool
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _get_client(provider, api_key=None):
+    """Process-wide client for (provider, api_key), created on first use."""
+    key = (provider, api_key)
+    client = _CLIENTS.get(key)
+    if client is not None:
+        return client
+
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            if provider == "OpenAI":
+                import openai
+
+                client = openai.OpenAI(api_key=api_key)
+            elif provider == "Mistral":
+                import mistralai
+
+                client = mistralai.Mistral(api_key=api_key)
+            elif provider == "Anthropic":
+                import anthropic
+
+                client = anthropic.Anthropic(api_key=api_key)
+            else:
+                raise ValueError(f"Unsupported provider: {provider}")
+            _CLIENTS[key] = client
+    return client
+
+
+# Async clients hold connections bound to the event loop that opened them, so
+# they are pooled per running loop
+_ASYNC_CLIENTS = weakref.WeakKeyDictionary()
+
+
+def _get_async_client(provider, api_key=None):
+    """Async client for (provider, api_key) on the running event loop."""
+    clients = _ASYNC_CLIENTS.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get((provider, api_key))
+    if client is None:
+        if provider == "OpenAI":
+            import openai
+
+            client = openai.AsyncOpenAI(api_key=api_key)
+        elif provider == "Mistral":
+            import mistralai
+
+            client = mistralai.Mistral(api_key=api_key)
+        elif provider == "Anthropic":
+            import anthropic
+
+            client = anthropic.AsyncAnthropic(api_key=api_key)
+        else:
+            raise ValueError(f"Unsupported provider: {provider}")
+        clients[(provider, api_key)] = client
+    return client
+
+
+class _ResponseCache:
+    """
+    On-disk LLM response cache, one JSON file per (provider, model, system
+    prompt, prompt, temperature) hash. Entries older than max_age_days are
+    dropped on read, and the least recently used ones are evicted once the cache
+    grows past max_size_mb.
+    """
+
+    def __init__(self, cache_dir=None, max_size_mb=100, max_age_days=30):
+        self.cache_dir = cache_dir or os.path.expanduser("~/.turing/llm_cache")
+        self.max_size_mb = max_size_mb
+        self.max_age_days = max_age_days
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._size = None
+
+    @staticmethod
+    def key(provider, model, system_prompt, prompt, temperature):
+        payload = json.dumps([provider, model, system_prompt, prompt, temperature])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def get(self, key):
+        path = self._path(key)
+        with self._lock:
+            try:
+                age = time.time() - os.path.getmtime(path)
+                if self.max_age_days is not None and age > self.max_age_days * 86400:
+                    self._remove(path)
+                    raise FileNotFoundError(path)
+                with open(path, encoding="utf-8") as f:
+                    response = json.load(f)["response"]
+                # Touch the entry so size eviction drops the least recently used
+                os.utime(path)
+            except (OSError, ValueError, KeyError):
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            return response
+
+    def put(self, key, response):
+        path = self._path(key)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"response": response}, f)
+            size = os.path.getsize(tmp_path)
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self.stats["writes"] += 1
+            self._size = self._total_size() if self._size is None else self._size
+            self._size += size - old_size
+            if self._size > self.max_size_mb * 1e6:
+                self._evict()
+
+    def clear(self):
+        with self._lock:
+            for path, _, _ in self._entries():
+                os.remove(path)
+            self._size = 0
+
+    def _entries(self):
+        """(path, size, mtime) of every entry."""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _total_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _remove(self, path):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        self.stats["evictions"] += 1
+        if self._size is not None:
+            self._size -= size
+
+    def _evict(self):
+        # Drop oldest entries until the cache is back under 90% of its limit
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self._size = sum(size for _, size, _ in entries)
+        target = 0.9 * self.max_size_mb * 1e6
+        for path, _, _ in entries:
+            if self._size <= target:
+                break
+            self._remove(path)
+
+
+_RESPONSE_CACHE = _ResponseCache()
+
+
+def configure_response_cache(cache_dir=None, max_size_mb=100, max_age_days=30):
+    """Point the LLM response cache at cache_dir (default ~/.turing/llm_cache)."""
+    global _RESPONSE_CACHE
+    _RESPONSE_CACHE = _ResponseCache(cache_dir, max_size_mb, max_age_days)
+
+
+def response_cache_stats():
+    """Hit, miss, write and eviction counts of the LLM response cache."""
+    return dict(_RESPONSE_CACHE.stats)
+
+
+def clear_response_cache():
+    """Delete every cached LLM response."""
+    _RESPONSE_CACHE.clear()
+
+
+def _use_cache(use_cache, temperature):
+    """
+    use_cache if given, else whether temperature is 0: sampled replies are
+    only cached on request, as a cache hit would always return the same one.
+    """
+    return temperature == 0 if use_cache is None else use_cache
+
+
 def query_llm(
     prompt,
     system_prompt=None,
@@ -5,14 +214,41 @@ def query_llm(
     model=None,
     api_key=None,
     temperature=0.0,
+    use_cache=None,
 ):
-    """Simple LLM query function with optional system prompt"""
+    """
+    Simple LLM query function with optional system prompt, cached on disk
+    (by default only when temperature is 0)
+    """
+
+    if provider not in ("OpenAI", "Mistral", "Anthropic"):
+        raise ValueError(f"Unsupported provider: {provider}")
+    model = model or _DEFAULT_MODELS[provider]
+
+    use_cache = _use_cache(use_cache, temperature)
+    cache_key = None
+    if use_cache:
+        cache_key = _RESPONSE_CACHE.key(
+            provider, model, system_prompt, prompt, temperature
+        )
+        response = _RESPONSE_CACHE.get(cache_key)
+        if response is not None:
+            count("llm_cache_hits")
+            return response
+
+    with span("llm.query", prompt_chars=len(prompt)):
+        response = _query_provider(
+            prompt, system_prompt, provider, model, api_key, temperature
+        )
+    if use_cache and response is not None:
+        _RESPONSE_CACHE.put(cache_key, response)
+    return response
 
-    if provider == "OpenAI":
-        import openai
 
-        client = openai.OpenAI(api_key=api_key)
-        model = model or "gpt-4o-mini"
+def _query_provider(prompt, system_prompt, provider, model, api_key, temperature):
+    client = _get_client(provider, api_key)
+
+    if provider == "OpenAI":
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
@@ -24,10 +260,6 @@ def query_llm(
         return response.choices[0].message.content
 
     elif provider == "Mistral":
-        import mistralai
-
-        client = mistralai.Mistral(api_key=api_key)
-        model = model or "mistral-small-latest"
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
@@ -41,9 +273,6 @@ def query_llm(
     elif provider == "Anthropic":
         import anthropic
 
-        client = anthropic.Anthropic(api_key=api_key)
-        model = model or "claude-haiku-4-5-20251001"
-
         response = client.messages.create(
             model=model,
             system=system_prompt or "",
@@ -58,6 +287,82 @@ def query_llm(
         raise ValueError(f"Unsupported provider: {provider}")
 
 
+async def aquery_llm(
+    prompt,
+    system_prompt=None,
+    provider="OpenAI",
+    model=None,
+    api_key=None,
+    temperature=0.0,
+    use_cache=None,
+):
+    """Async version of query_llm, sharing its response cache"""
+
+    if provider not in ("OpenAI", "Mistral", "Anthropic"):
+        raise ValueError(f"Unsupported provider: {provider}")
+    model = model or _DEFAULT_MODELS[provider]
+
+    use_cache = _use_cache(use_cache, temperature)
+    cache_key = None
+    if use_cache:
+        cache_key = _RESPONSE_CACHE.key(
+            provider, model, system_prompt, prompt, temperature
+        )
+        # Disk I/O off the event loop
+        response = await asyncio.to_thread(_RESPONSE_CACHE.get, cache_key)
+        if response is not None:
+            count("llm_cache_hits")
+            return response
+
+    with span("llm.query", prompt_chars=len(prompt)):
+        response = await _aquery_provider(
+            prompt, system_prompt, provider, model, api_key, temperature
+        )
+    if use_cache and response is not None:
+        await asyncio.to_thread(_RESPONSE_CACHE.put, cache_key, response)
+    return response
+
+
+async def _aquery_provider(
+    prompt, system_prompt, provider, model, api_key, temperature
+):
+    client = _get_async_client(provider, api_key)
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+
+    if provider == "OpenAI":
+        response = await client.chat.completions.create(
+            model=model, messages=messages, temperature=temperature
+        )
+        return response.choices[0].message.content
+
+    elif provider == "Mistral":
+        response = await client.chat.complete_async(
+            model=model, messages=messages, temperature=temperature
+        )
+        return response.choices[0].message.content
+
+    elif provider == "Anthropic":
+        import anthropic
+
+        response = await client.messages.create(
+            model=model,
+            system=system_prompt or "",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=4096,
+            temperature=temperature,
+        )
+        text_block = next(
+            b for b in response.content if isinstance(b, anthropic.types.TextBlock)
+        )
+        return text_block.text
+
+    else:
+        raise ValueError(f"Unsupported provider: {provider}")
+
+
 def natural_language_to_cypher(
     question,
     system_prompt,
@@ -65,6 +370,7 @@ def natural_language_to_cypher(
     model=None,
     api_key=None,
     temperature=0.0,
+    use_cache=None,
 ):
     """Convert natural language question to Cypher query"""
     cypher_query = query_llm(
@@ -74,6 +380,140 @@ def natural_language_to_cypher(
         model=model,
         api_key=api_key,
         temperature=temperature,
+        use_cache=use_cache,
     )
 
     return cypher_query.strip()
+
+
+class _TokenBucket:
+    """Requests-per-second limiter: rate tokens a second, bursts of up to capacity."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+# One bucket per provider, shared by every batch in the process
+_RATE_LIMITERS = {}
+
+
+def _rate_limiter(provider, requests_per_second):
+    bucket = _RATE_LIMITERS.get(provider)
+    if bucket is None or bucket.rate != requests_per_second:
+        bucket = _RATE_LIMITERS[provider] = _TokenBucket(requests_per_second)
+    return bucket
+
+
+def _is_rate_limited(exc):
+    """Whether exc is an HTTP 429 from any of the provider SDKs."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status == 429
+
+
+async def abatch_natural_language_to_cypher(
+    questions,
+    system_prompt,
+    provider="OpenAI",
+    model=None,
+    api_key=None,
+    temperature=0.0,
+    max_concurrency=8,
+    requests_per_second=None,
+    max_retries=5,
+    backoff=1.0,
+    use_cache=None,
+    return_stats=False,
+):
+    """
+    Convert many natural language questions to Cypher queries concurrently.
+
+    At most max_concurrency requests are in flight, and requests_per_second
+    (if given) caps the rate through a token bucket shared by every batch
+    sent to the same provider. Rate-limited (HTTP 429) requests are retried
+    up to max_retries times, after backoff * 2**attempt seconds with +/-50%
+    jitter. Results are returned in the order of questions; with return_stats,
+    a dict of wall time and per-request latencies is returned as well.
+
+    Use ``await`` in a notebook, or ``asyncio.run(...)`` from a script.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    bucket = (
+        _rate_limiter(provider, requests_per_second) if requests_per_second else None
+    )
+    latencies = [None] * len(questions)
+    retries = 0
+
+    async def convert(i, question):
+        nonlocal retries
+        async with semaphore:
+            for attempt in range(max_retries + 1):
+                if bucket is not None:
+                    await bucket.acquire()
+                start = time.perf_counter()
+                try:
+                    cypher_query = await aquery_llm(
+                        prompt=question,
+                        system_prompt=system_prompt,
+                        provider=provider,
+                        model=model,
+                        api_key=api_key,
+                        temperature=temperature,
+                        use_cache=use_cache,
+                    )
+                except Exception as e:
+                    if attempt == max_retries or not _is_rate_limited(e):
+                        raise
+                    retries += 1
+                    await asyncio.sleep(backoff * 2**attempt * random.uniform(0.5, 1.5))
+                    continue
+                latencies[i] = time.perf_counter() - start
+                return cypher_query.strip()
+
+    start_time = time.perf_counter()
+    results = await asyncio.gather(
+        *(convert(i, question) for i, question in enumerate(questions))
+    )
+    wall_time = time.perf_counter() - start_time
+
+    done = sorted(latency for latency in latencies if latency is not None)
+    stats = {
+        "requests": len(questions),
+        "retries": retries,
+        "wall_time": wall_time,
+        "latency_mean": sum(done) / len(done) if done else None,
+        "latency_p50": done[len(done) // 2] if done else None,
+        "latency_p95": (
+            done[min(len(done) - 1, int(len(done) * 0.95))] if done else None
+        ),
+        "latency_max": done[-1] if done else None,
+        "latencies": latencies,
+    }
+    print(
+        f"Converted {len(questions):,} questions in {wall_time:.2f}s"
+        + (
+            f" (p50 {stats['latency_p50']:.2f}s, p95 {stats['latency_p95']:.2f}s, "
+            f"{retries} retries)"
+            if done
+            else ""
+        )
+    )
+    if return_stats:
+        return results, stats
+    return results
@@ -0,0 +1,226 @@
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .tracing import span, traced
+
+
+@traced("load_chunks")
+def load_chunks(
+    chunks,
+    client_factory,
+    graph_name=None,
+    n_workers=4,
+    max_in_flight=None,
+    max_retries=3,
+    backoff=0.5,
+    checkpoint_path=None,
+    report_every=5.0,
+    retry_if=None,
+):
+    """
+    Run Cypher chunks against TuringDB concurrently, nodes before edges.
+
+    Parameters
+    ----------
+    chunks : iterable of (str, str) or dict
+        ("node" | "edge", query) pairs, as yielded by iter_cypher_chunks, or the
+        dict returned by split_cypher_commands. Chunks are numbered in iteration
+        order, which must be the same from one run to the next for resuming.
+    client_factory : callable
+        Returns a new connected client, e.g. ``lambda: TuringDB(host=url)``. Each
+        worker thread gets its own, and a fresh one after a failed attempt. It
+        must be ready to write (checked out on a change if the server needs it).
+    graph_name : str or None
+        If given, set_graph(graph_name) is called on every new client.
+    n_workers : int, default=4
+        Number of chunks sent at the same time.
+    max_in_flight : int or None
+        Maximum number of chunks taken from the iterator and not yet loaded.
+        Defaults to 2 * n_workers; bounds memory when chunks are generated lazily.
+    max_retries : int, default=3
+        Retries per chunk before the load is aborted. Only failures for which
+        retry_if is true are retried.
+    backoff : float, default=0.5
+        Base delay in seconds before a retry, doubled at every attempt and
+        jittered by +/-50%.
+    checkpoint_path : str or None
+        JSON file recording the indices of loaded chunks, saved whenever chunks
+        finish loading. Chunks already listed there are skipped, so an
+        interrupted load resumes where it stopped.
+    report_every : float or None, default=5.0
+        Seconds between progress lines. None only prints the final summary.
+    retry_if : callable or None
+        retry_if(exc) tells whether a chunk whose query raised exc is sent
+        again. Defaults to retrying only the errors raised before the query
+        reached the server (connection refused, connect timeout): the chunks
+        are CREATE queries, so sending again one the server may have run would
+        duplicate its nodes or edges. Errors from client_factory and set_graph
+        are always retried.
+
+    Returns
+    -------
+    dict
+        chunks, skipped, bytes, retries, seconds, chunks_per_s and bytes_per_s.
+
+    Notes
+    -----
+    Edge chunks only start once every node chunk is loaded, as their MATCH
+    clauses need the nodes. If a chunk still fails after max_retries, no new
+    chunks are started, the ones in flight are awaited, the checkpoint is saved
+    and the error is raised. A chunk that failed once sent may still have been
+    applied by the server; check it before resuming from the checkpoint.
+    """
+    if isinstance(chunks, dict):
+        chunks = _split_chunks_items(chunks)
+    if max_in_flight is None:
+        max_in_flight = 2 * n_workers
+    if retry_if is None:
+        retry_if = _not_sent
+
+    done = _read_checkpoint(checkpoint_path)
+    local = threading.local()
+
+    def get_client():
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = client_factory()
+            if graph_name is not None:
+                client.set_graph(graph_name)
+        return client
+
+    def run(chunk):
+        for attempt in range(max_retries + 1):
+            sending = False
+            try:
+                client = get_client()
+                sending = True
+                with span("turingdb.query", bytes=len(chunk), attempt=attempt):
+                    client.query(chunk)
+                return attempt
+            except Exception as exc:
+                if attempt == max_retries or (sending and not retry_if(exc)):
+                    raise
+                # Retry on a fresh connection after a jittered exponential delay
+                local.client = None
+                time.sleep(backoff * 2**attempt * random.uniform(0.5, 1.5))
+
+    stats = {"chunks": 0, "skipped": 0, "bytes": 0, "retries": 0}
+    start_time = time.perf_counter()
+    last_report = start_time
+    pending = {}
+
+    def collect(return_when):
+        nonlocal last_report
+        finished, _ = wait(list(pending), return_when=return_when)
+        n_done = len(done)
+        error = None
+        for future in finished:
+            index, n_bytes = pending.pop(future)
+            if future.cancelled():
+                continue
+            if future.exception() is not None:
+                error = error or future.exception()
+                continue
+            done.add(index)
+            stats["chunks"] += 1
+            stats["bytes"] += n_bytes
+            stats["retries"] += future.result()
+        if len(done) > n_done:
+            _write_checkpoint(checkpoint_path, done)
+
+        now = time.perf_counter()
+        if report_every is not None and now - last_report >= report_every:
+            last_report = now
+            _print_progress(stats, now - start_time)
+        if error is not None:
+            raise error
+
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        try:
+            in_edges = False
+            for index, (kind, chunk) in enumerate(chunks):
+                if index in done:
+                    stats["skipped"] += 1
+                    continue
+                if kind != "node" and not in_edges:
+                    in_edges = True
+                    while pending:
+                        collect(ALL_COMPLETED)
+                while len(pending) >= max_in_flight:
+                    collect(FIRST_COMPLETED)
+                pending[executor.submit(run, chunk)] = (index, len(chunk.encode()))
+            while pending:
+                collect(ALL_COMPLETED)
+        finally:
+            for future in pending:
+                future.cancel()
+            try:
+                while pending:
+                    collect(ALL_COMPLETED)
+            except Exception:
+                pass
+            _write_checkpoint(checkpoint_path, done)
+
+    elapsed = time.perf_counter() - start_time
+    _print_progress(stats, elapsed)
+    stats["seconds"] = elapsed
+    stats["chunks_per_s"] = stats["chunks"] / max(elapsed, 1e-9)
+    stats["bytes_per_s"] = stats["bytes"] / max(elapsed, 1e-9)
+    return stats
+
+
+# Errors of the connect phase, by class name so that no HTTP library is
+# imported: httpx, urllib3 and requests
+_CONNECT_ERRORS = {"ConnectError", "ConnectTimeout", "NewConnectionError"}
+
+
+def _not_sent(exc):
+    """Whether exc, or an error it was raised from, failed to connect."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, ConnectionRefusedError):
+            return True
+        if any(cls.__name__ in _CONNECT_ERRORS for cls in type(exc).__mro__):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def _split_chunks_items(split):
+    for chunk in split["node_chunks"]:
+        yield "node", chunk
+    for chunk in split["edge_chunks"]:
+        yield "edge", chunk
+
+
+def _print_progress(stats, elapsed):
+    elapsed = max(elapsed, 1e-9)
+    print(
+        f"Loaded {stats['chunks']:,} chunks ({stats['bytes'] / 1e6:,.1f} MB) "
+        f"in {elapsed:.1f}s: {stats['chunks'] / elapsed:,.1f} chunks/s, "
+        f"{stats['bytes'] / 1e6 / elapsed:,.2f} MB/s"
+        + (f", {stats['skipped']:,} skipped" if stats["skipped"] else "")
+        + (f", {stats['retries']:,} retries" if stats["retries"] else "")
+    )
+
+
+def _read_checkpoint(path):
+    if path is None or not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return set(json.load(f)["done"])
+
+
+def _write_checkpoint(path, done):
+    """Write the loaded chunk indices atomically."""
+    if path is None:
+        return
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"done": sorted(done)}, f)
+    os.replace(tmp_path, path)
@@ -0,0 +1,717 @@
+"""
+Streaming RDF to TuringDB LOAD JSONL conversion.
+
+rdf_to_jsonl reads RDF/XML or N-Triples incrementally, one triple at a time,
+and maps each triple on its own:
+
+- Subjects, and URI or blank-node objects other than those of rdf:type, are
+  nodes with id and uri (the IRI) and name (its local name) properties. Their labels are the local names of
+  their rdf:type objects, "Resource" when they have none: an OWL class is
+  labelled Class, an object property ObjectProperty, an individual by its
+  classes.
+- A triple with a URI object is a relationship from subject to object typed
+  by the predicate's local name (rdfs:subClassOf is subClassOf; rdfs:domain
+  and rdfs:range become hasDomain and hasRange, both from the property).
+- A triple with a literal object is a property of the subject, keyed by the
+  predicate's local name (rdfs:label is rdfs_label, and id, uri and name
+  become id_literal, uri_literal and name_literal so they do not replace the
+  node's own); xsd numbers and booleans keep their type, repeated values are
+  joined with ", ".
+
+This is not the class-level mapping of owlready_to_jsonl in
+integrate_rdf_file.ipynb, which needs the whole class hierarchy in memory. The
+notebook labels each class by its most generic parent class and each property
+Property, adds type, property_type and parents properties, and points
+hasDomain from the domain class to the property. Relationship type names and
+the rdfs_label and comment keys are the same.
+
+Labels, relationship types and property keys go through sanitize_identifier.
+Only the node IRI -> integer ID map is held in memory: node records are spilled
+to range-partitioned temporary files and merged one partition at a time, so a
+node described in several places of the file still gets one record.
+
+Reasoning is an opt-in pre-pass (reasoner="pellet" or "hermit") that needs
+owlready2 and Java; the inferred ontology is then streamed like any other file.
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from urllib.parse import urldefrag, urljoin
+
+from .tracing import count, span, traced
+
+RDF = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+RDFS = "http://www.w3.org/2000/01/rdf-schema#"
+XSD = "http://www.w3.org/2001/XMLSchema#"
+_XML = "http://www.w3.org/XML/1998/namespace"
+
+_RDF_TYPE = RDF + "type"
+# Predicates named as in owlready_to_jsonl rather than by their local name
+_RELATIONSHIP_NAMES = {RDFS + "domain": "hasDomain", RDFS + "range": "hasRange"}
+_PROPERTY_NAMES = {RDFS + "label": "rdfs_label"}
+# Keys of every node record, renamed when they come from a literal predicate
+_CORE_KEYS = frozenset(("id", "uri", "name"))
+
+_INT_TYPES = frozenset(
+    XSD + t
+    for t in (
+        "integer",
+        "int",
+        "long",
+        "short",
+        "byte",
+        "nonNegativeInteger",
+        "positiveInteger",
+        "nonPositiveInteger",
+        "negativeInteger",
+        "unsignedLong",
+        "unsignedInt",
+        "unsignedShort",
+        "unsignedByte",
+    )
+)
+_FLOAT_TYPES = frozenset(XSD + t for t in ("decimal", "double", "float"))
+
+_FORMATS = {
+    ".nt": "ntriples",
+    ".rdf": "rdfxml",
+    ".owl": "rdfxml",
+    ".xml": "rdfxml",
+}
+
+
+class Literal(tuple):
+    """An RDF literal: (lexical form, datatype IRI or None, language or None)."""
+
+    __slots__ = ()
+
+    def __new__(cls, value, datatype=None, lang=None):
+        return tuple.__new__(cls, (value, datatype, lang))
+
+    @property
+    def value(self):
+        """The literal as a Python value: int, float or bool for xsd types."""
+        text, datatype, _ = self
+        try:
+            if datatype in _INT_TYPES:
+                return int(text)
+            if datatype in _FLOAT_TYPES:
+                return float(text)
+            if datatype == XSD + "boolean":
+                return text.strip() in ("true", "1")
+        except ValueError:
+            pass
+        return text
+
+
+def sanitize_identifier(s):
+    """Sanitize identifiers (labels, relationship types, property names)"""
+    if not s:
+        return "ID_empty"
+    s = s.replace("#", "_").replace("-", "_").replace("/", "_").replace(".", "_")
+    if s[0].isdigit() or s[0] == "_":
+        s = "ID_" + s
+    return "".join(c if c.isalnum() or c == "_" else "_" for c in s)
+
+
+def local_name(iri):
+    """Part of an IRI after its last '#' or '/' (the whole IRI if neither)."""
+    for sep in ("#", "/"):
+        _, found, tail = iri.rpartition(sep)
+        if found and tail:
+            return tail
+    return iri
+
+
+def _is_blank(term):
+    return isinstance(term, str) and term.startswith("_:")
+
+
+# ---------------------------------------------------------------------------
+# N-Triples
+
+_NT_ESCAPE = re.compile(r"\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))")
+_NT_CHARS = {"t": "\t", "b": "\b", "n": "\n", "r": "\r", "f": "\f"}
+_NT_LINE = re.compile(
+    r"\s*(<[^>]*>|_:\S+)\s*(<[^>]*>)\s*"
+    r'(<[^>]*>|_:[^\s.]+(?:\.[^\s.]+)*|"((?:[^"\\]|\\.)*)"'
+    r"(?:@([A-Za-z0-9-]+)|\^\^<([^>]*)>)?)\s*\.\s*(?:#.*)?$"
+)
+
+
+def _nt_unescape(text):
+    if "\\" not in text:
+        return text
+
+    def replace(match):
+        short, long, char = match.groups()
+        if short or long:
+            return chr(int(short or long, 16))
+        return _NT_CHARS.get(char, char)
+
+    return _NT_ESCAPE.sub(replace, text)
+
+
+def _nt_term(token):
+    if token[0] == "<":
+        return _nt_unescape(token[1:-1])
+    return token
+
+
+def iter_ntriples(path):
+    """
+    Yield the (subject, predicate, object) triples of an N-Triples file.
+
+    IRIs and blank nodes ("_:b0") are str, literals Literal.
+    Raises ValueError on a line that is not a triple.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            stripped = line.strip()
+            if not stripped or stripped[0] == "#":
+                continue
+            match = _NT_LINE.match(line)
+            if match is None:
+                raise ValueError(f"Invalid N-Triples line {line_number}: {line!r}")
+            subject, predicate, obj, text, lang, datatype = match.groups()
+            if text is not None:
+                obj = Literal(_nt_unescape(text), datatype, lang)
+            else:
+                obj = _nt_term(obj)
+            yield _nt_term(subject), _nt_term(predicate), obj
+
+
+# ---------------------------------------------------------------------------
+# RDF/XML
+
+# Scheme followed by "//" (http://..., file://...) or an URN: nothing to resolve
+_ABSOLUTE_IRI = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*:(?://|[^/])")
+
+
+class _RDFXMLHandler:
+    """
+    Expat callbacks turning RDF/XML into triples, appended to self.triples.
+
+    Covers node elements (rdf:about, rdf:ID, rdf:nodeID, typed nodes, property
+    attributes), property elements (rdf:resource, rdf:nodeID, rdf:datatype,
+    xml:lang, rdf:li, nested nodes) and rdf:parseType Resource, Literal and
+    Collection. Reification (rdf:ID on property elements) is ignored.
+    """
+
+    _SYNTAX = frozenset(
+        RDF + name
+        for name in (
+            "about",
+            "ID",
+            "nodeID",
+            "resource",
+            "datatype",
+            "parseType",
+            "type",
+            "bagID",
+            "aboutEach",
+            "aboutEachPrefix",
+        )
+    )
+
+    def __init__(self, base):
+        self.triples = []
+        self.stack = []
+        self.bases = [base]
+        self.langs = [None]
+        self.blank_ids = 0
+
+    def new_blank(self):
+        self.blank_ids += 1
+        return f"_:genid{self.blank_ids}"
+
+    def resolve(self, iri):
+        if _ABSOLUTE_IRI.match(iri):
+            return iri
+        base = self.bases[-1]
+        if not iri:
+            return urldefrag(base)[0]
+        return urljoin(base, iri)
+
+    def node_id(self, attrs):
+        if RDF + "about" in attrs:
+            return self.resolve(attrs[RDF + "about"])
+        if RDF + "ID" in attrs:
+            return self.resolve("#" + attrs[RDF + "ID"])
+        if RDF + "nodeID" in attrs:
+            return "_:" + attrs[RDF + "nodeID"]
+        return self.new_blank()
+
+    def property_attributes(self, subject, attrs):
+        lang = self.langs[-1]
+        for name, value in attrs.items():
+            if name in self._SYNTAX or name.startswith(_XML) or ":" not in name:
+                continue
+            self.triples.append((subject, name, Literal(value, None, lang)))
+        if RDF + "type" in attrs:
+            self.triples.append((subject, _RDF_TYPE, self.resolve(attrs[RDF + "type"])))
+
+    def start(self, name, attrs):
+        parent = self.stack[-1] if self.stack else None
+        self.bases.append(
+            self.resolve(attrs[_XML + "base"])
+            if _XML + "base" in attrs
+            else self.bases[-1]
+        )
+        self.langs.append(attrs.get(_XML + "lang", self.langs[-1]))
+
+        if parent is not None and parent["kind"] == "literal":
+            parent["depth"] += 1
+            parent["text"].append(f"<{name.rpartition('#')[2]}>")
+            self.stack.append(parent)
+            return
+
+        if parent is None and name == RDF + "RDF":
+            self.stack.append({"kind": "root"})
+        elif parent is None or parent["kind"] in ("root", "property", "collection"):
+            self.start_node(name, attrs, parent)
+        else:
+            self.start_property(name, attrs, parent)
+
+    def start_node(self, name, attrs, parent):
+        subject = self.node_id(attrs)
+        if name != RDF + "Description":
+            self.triples.append((subject, _RDF_TYPE, name))
+        self.property_attributes(subject, attrs)
+        if parent is not None and parent["kind"] == "property":
+            self.triples.append((parent["subject"], parent["predicate"], subject))
+            parent["object"] = subject
+        elif parent is not None and parent["kind"] == "collection":
+            parent["items"].append(subject)
+        self.stack.append({"kind": "node", "subject": subject, "li": 0})
+
+    def start_property(self, name, attrs, parent):
+        subject = parent["subject"]
+        if name == RDF + "li":
+            parent["li"] += 1
+            name = f"{RDF}_{parent['li']}"
+        parse_type = attrs.get(RDF + "parseType")
+
+        if parse_type == "Resource":
+            obj = self.new_blank()
+            self.triples.append((subject, name, obj))
+            self.stack.append({"kind": "node", "subject": obj, "li": 0})
+        elif parse_type == "Literal":
+            self.stack.append(
+                {
+                    "kind": "literal",
+                    "subject": subject,
+                    "predicate": name,
+                    "depth": 0,
+                    "text": [],
+                }
+            )
+        elif parse_type == "Collection":
+            self.stack.append(
+                {
+                    "kind": "collection",
+                    "subject": subject,
+                    "predicate": name,
+                    "items": [],
+                }
+            )
+        elif RDF + "resource" in attrs or RDF + "nodeID" in attrs:
+            obj = (
+                self.resolve(attrs[RDF + "resource"])
+                if RDF + "resource" in attrs
+                else "_:" + attrs[RDF + "nodeID"]
+            )
+            self.triples.append((subject, name, obj))
+            self.property_attributes(obj, attrs)
+            self.stack.append({"kind": "empty"})
+        elif any(
+            a not in self._SYNTAX and not a.startswith(_XML) and ":" in a for a in attrs
+        ):
+            # Empty property element with property attributes: a blank node
+            obj = self.new_blank()
+            self.triples.append((subject, name, obj))
+            self.property_attributes(obj, attrs)
+            self.stack.append({"kind": "empty"})
+        else:
+            self.stack.append(
+                {
+                    "kind": "property",
+                    "subject": subject,
+                    "predicate": name,
+                    "datatype": (
+                        self.resolve(attrs[RDF + "datatype"])
+                        if RDF + "datatype" in attrs
+                        else None
+                    ),
+                    "lang": self.langs[-1],
+                    "object": None,
+                    "text": [],
+                }
+            )
+
+    def end(self, name):
+        frame = self.stack.pop()
+        self.bases.pop()
+        self.langs.pop()
+        kind = frame["kind"]
+        if kind == "literal" and frame["depth"]:
+            frame["depth"] -= 1
+            frame["text"].append(f"</{name.rpartition('#')[2]}>")
+        elif kind == "literal":
+            text = "".join(frame["text"])
+            self.triples.append(
+                (
+                    frame["subject"],
+                    frame["predicate"],
+                    Literal(text, RDF + "XMLLiteral", None),
+                )
+            )
+        elif kind == "property" and frame["object"] is None:
+            literal = Literal("".join(frame["text"]), frame["datatype"], frame["lang"])
+            self.triples.append((frame["subject"], frame["predicate"], literal))
+        elif kind == "collection":
+            self.end_collection(frame)
+
+    def end_collection(self, frame):
+        # rdf:first / rdf:rest list of blank nodes ending with rdf:nil
+        items = frame["items"]
+        if not items:
+            self.triples.append((frame["subject"], frame["predicate"], RDF + "nil"))
+            return
+        cells = [self.new_blank() for _ in items]
+        self.triples.append((frame["subject"], frame["predicate"], cells[0]))
+        for i, (cell, item) in enumerate(zip(cells, items)):
+            self.triples.append((cell, RDF + "first", item))
+            rest = cells[i + 1] if i + 1 < len(cells) else RDF + "nil"
+            self.triples.append((cell, RDF + "rest", rest))
+
+    def characters(self, data):
+        if self.stack and self.stack[-1]["kind"] in ("property", "literal"):
+            self.stack[-1]["text"].append(data)
+
+
+def iter_rdfxml(path, block_size=1 << 20):
+    """
+    Yield the (subject, predicate, object) triples of an RDF/XML file.
+
+    The file is fed to an expat parser block_size bytes at a time, and the
+    triples of each block are yielded before the next block is read. IRIs and
+    blank nodes ("_:b1") are str, literals Literal.
+    """
+    import xml.parsers.expat
+
+    handler = _RDFXMLHandler("file://" + os.path.abspath(path))
+    parser = xml.parsers.expat.ParserCreate(namespace_separator="")
+    parser.StartElementHandler = handler.start
+    parser.EndElementHandler = handler.end
+    parser.CharacterDataHandler = handler.characters
+    parser.buffer_text = True
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            parser.Parse(block, not block)
+            yield from handler.triples
+            handler.triples = []
+            if not block:
+                break
+
+
+def iter_triples(path, rdf_format=None):
+    """
+    Yield the triples of an RDF file.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+    rdf_format : {'rdfxml', 'ntriples'} or None
+        Guessed from the file extension (.rdf, .owl, .xml, .nt) when None.
+    """
+    if rdf_format is None:
+        rdf_format = _FORMATS.get(os.path.splitext(str(path))[1].lower())
+        if rdf_format is None:
+            raise ValueError(f"Cannot guess the RDF format of {path}; pass rdf_format")
+    if rdf_format == "rdfxml":
+        return iter_rdfxml(path)
+    if rdf_format == "ntriples":
+        return iter_ntriples(path)
+    raise ValueError(f"Unsupported rdf_format: {rdf_format}")
+
+
+# ---------------------------------------------------------------------------
+# Reasoning pre-pass
+
+
+def _reason(path, reasoner, out_path):
+    """
+    Load path with owlready2, run the reasoner and save the ontology with the
+    inferred facts as N-Triples to out_path.
+    """
+    from owlready2 import World, sync_reasoner_hermit, sync_reasoner_pellet
+
+    world = World()
+    onto = world.get_ontology(f"file://{os.path.abspath(path)}").load()
+    with onto:
+        if reasoner == "pellet":
+            sync_reasoner_pellet(
+                world, infer_property_values=True, infer_data_property_values=True
+            )
+        else:
+            sync_reasoner_hermit(world, infer_property_values=True)
+    world.save(file=out_path, format="ntriples")
+
+
+# ---------------------------------------------------------------------------
+# JSONL writer
+
+
+class _NodeSpill:
+    """
+    Node fragments (labels and properties seen for a node in one place of the
+    file) in temporary files, one per range of partition_size integer IDs.
+    """
+
+    def __init__(self, directory, partition_size, buffer_size):
+        self.directory = directory
+        self.partition_size = partition_size
+        self.buffer_size = buffer_size
+        self.buffers = {}
+        self.n_buffered = 0
+
+    def path(self, partition):
+        return os.path.join(self.directory, f"nodes_{partition}.jsonl")
+
+    def add(self, int_id, labels, properties):
+        line = json.dumps([int_id, labels, properties]) + "\n"
+        self.buffers.setdefault(int_id // self.partition_size, []).append(line)
+        self.n_buffered += 1
+        if self.n_buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        for partition, lines in self.buffers.items():
+            with open(self.path(partition), "a", encoding="utf-8") as f:
+                f.write("".join(lines))
+        self.buffers = {}
+        self.n_buffered = 0
+
+    def merged_records(self, nodes):
+        """
+        Yield one LOAD JSONL node line per node of nodes (the node terms, in
+        integer ID order).
+        """
+        self.flush()
+        for start in range(0, len(nodes), self.partition_size):
+            fragments = {}
+            path = self.path(start // self.partition_size)
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        int_id, labels, properties = json.loads(line)
+                        entry = fragments.get(int_id)
+                        if entry is None:
+                            fragments[int_id] = (labels, properties)
+                            continue
+                        entry[0].extend(label for label in labels if label not in entry[0])
+                        for key, value in properties.items():
+                            _add_property(entry[1], key, value)
+            stop = min(start + self.partition_size, len(nodes))
+            for int_id in range(start, stop):
+                labels, properties = fragments.get(int_id, ([], {}))
+                yield _node_record(int_id, nodes[int_id], labels, properties)
+
+
+def _add_property(properties, key, value):
+    if key not in properties:
+        properties[key] = value
+        return
+    current = properties[key]
+    if current == value:
+        return
+    values = str(current).split(", ")
+    if str(value) not in values:
+        properties[key] = f"{current}, {value}"
+
+
+def _node_properties(node):
+    if _is_blank(node):
+        return {"id": node, "name": node[2:]}
+    return {"id": node, "uri": node, "name": local_name(node)}
+
+
+def _node_record(int_id, node, labels, properties):
+    record = {
+        "type": "node",
+        "id": str(int_id),
+        "labels": labels or ["Resource"],
+        "properties": {**properties, **_node_properties(node)},
+    }
+    return json.dumps(record) + "\n"
+
+
+@traced("rdf_to_jsonl")
+def rdf_to_jsonl(
+    path,
+    graph_name,
+    *,
+    data_dir=None,
+    rdf_format=None,
+    include_blank_nodes=False,
+    reasoner=None,
+    chunk_size=100_000,
+):
+    """
+    Convert an RDF/XML or N-Triples file to TuringDB LOAD JSONL, streaming.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        RDF file to convert.
+    graph_name : str
+        Base name used for the output filename ({graph_name}.jsonl).
+    data_dir : str or None
+        Directory to write the file to. Defaults to ~/.turing/data.
+    rdf_format : {'rdfxml', 'ntriples'} or None
+        Guessed from the file extension when None.
+    include_blank_nodes : bool, default=False
+        Keep triples whose subject or object is a blank node (OWL restrictions,
+        lists, ...). Blank nodes get their blank node ID as id.
+    reasoner : {'pellet', 'hermit'} or None
+        Run this reasoner with owlready2 first and convert the ontology with the
+        inferred facts. Loads the whole ontology and starts a JVM, so it is only
+        suitable for ontologies that fit in memory.
+    chunk_size : int, default=100_000
+        Records buffered before being written, and nodes per temporary partition
+        when merging node records.
+
+    Returns
+    -------
+    str
+        The filename (without directory path) to pass to the LOAD JSONL command.
+    """
+    if reasoner not in (None, "pellet", "hermit"):
+        raise ValueError(f"Unsupported reasoner: {reasoner}")
+    if data_dir is None:
+        data_dir = os.path.expanduser("~/.turing/data")
+    os.makedirs(data_dir, exist_ok=True)
+    filename = f"{graph_name}.jsonl"
+    filepath = os.path.join(data_dir, filename)
+
+    start_time = time.perf_counter()
+    with tempfile.TemporaryDirectory(dir=data_dir) as tmp_dir:
+        if reasoner is not None:
+            # Raises ImportError without owlready2; only a failed run is skipped
+            from owlready2 import OwlReadyError
+
+            reasoned = os.path.join(tmp_dir, "reasoned.nt")
+            try:
+                with span("rdf.reason", reasoner=reasoner):
+                    _reason(path, reasoner, reasoned)
+            except (OwlReadyError, OSError) as e:
+                # Unparsable or inconsistent ontology, Java error or no Java
+                print(f"Reasoner failed: {e}, continuing without reasoning")
+            else:
+                path, rdf_format = reasoned, "ntriples"
+                print(
+                    f"Reasoner {reasoner} completed in "
+                    f"{time.perf_counter() - start_time:.2f}s"
+                )
+
+        convert_start = time.perf_counter()
+        triples = iter_triples(path, rdf_format)
+        node_ids = {}
+        spill = _NodeSpill(tmp_dir, chunk_size, chunk_size)
+        n_triples = n_rels = 0
+        rels_path = os.path.join(tmp_dir, "relationships.jsonl")
+        # Sanitized property keys and labels, and JSON-encoded relationship
+        # types, by IRI: vocabularies are small next to the number of triples
+        keys, type_labels, rel_types = {}, {}, {}
+
+        def int_id(node):
+            value = node_ids.get(node)
+            if value is None:
+                value = node_ids[node] = len(node_ids)
+            return value
+
+        # Labels and properties of the subject of the latest triples, written
+        # out as one fragment when the subject changes
+        current, labels, properties = None, [], {}
+
+        with (
+            open(rels_path, "w", encoding="utf-8") as rels,
+            span("rdf.convert") as convert,
+        ):
+            lines = []
+            for subject, predicate, obj in triples:
+                n_triples += 1
+                if not include_blank_nodes and (_is_blank(subject) or _is_blank(obj)):
+                    continue
+                if subject != current:
+                    if labels or properties:
+                        spill.add(node_ids[current], labels, properties)
+                    current, labels, properties = subject, [], {}
+                    subject_id = int_id(subject)
+
+                if isinstance(obj, Literal):
+                    key = keys.get(predicate)
+                    if key is None:
+                        key = _PROPERTY_NAMES.get(predicate) or sanitize_identifier(
+                            local_name(predicate)
+                        )
+                        if key in _CORE_KEYS:
+                            key = f"{key}_literal"
+                        keys[predicate] = key
+                    _add_property(properties, key, obj.value)
+                elif predicate == _RDF_TYPE:
+                    label = type_labels.get(obj)
+                    if label is None:
+                        label = type_labels[obj] = sanitize_identifier(local_name(obj))
+                    if label not in labels:
+                        labels.append(label)
+                else:
+                    rel_type = rel_types.get(predicate)
+                    if rel_type is None:
+                        rel_type = rel_types[predicate] = json.dumps(
+                            _RELATIONSHIP_NAMES.get(predicate)
+                            or sanitize_identifier(local_name(predicate))
+                        )
+                    # Same text as json.dumps of the record
+                    lines.append(
+                        f'{{"type": "relationship", "id": "{n_rels}", '
+                        f'"label": {rel_type}, "start": {{"id": "{subject_id}"}}, '
+                        f'"end": {{"id": "{int_id(obj)}"}}, "properties": {{}}}}\n'
+                    )
+                    n_rels += 1
+                    if len(lines) >= chunk_size:
+                        rels.write("".join(lines))
+                        lines = []
+            if labels or properties:
+                spill.add(node_ids[current], labels, properties)
+            rels.write("".join(lines))
+            convert.add("triples", n_triples)
+            count("relationships", n_rels)
+        convert_time = time.perf_counter() - convert_start
+
+        with span("file.write"), open(filepath, "w", encoding="utf-8") as f:
+            lines = []
+            # node_ids lists the nodes in integer ID order
+            for line in spill.merged_records(list(node_ids)):
+                lines.append(line)
+                if len(lines) >= chunk_size:
+                    f.write("".join(lines))
+                    lines = []
+            f.write("".join(lines))
+            with open(rels_path, encoding="utf-8") as rels:
+                shutil.copyfileobj(rels, f)
+
+    elapsed = time.perf_counter() - start_time
+    print(
+        f"Converted {n_triples:,} triples in {elapsed:.2f}s "
+        f"({n_triples / max(convert_time, 1e-9):,.0f} triples/s parsing and mapping)"
+    )
+    print(f"JSONL file written to: {filepath}")
+    print(f"Graph: {len(node_ids):,} nodes, {n_rels:,} edges")
+    return filename
@@ -0,0 +1,237 @@
+"""
+Property type inference and coercion for DataFrames, before graph export.
+
+CSV and Excel inputs often arrive with every value as a string, so numbers end
+up as string properties and queries need toInteger() / toFloat() on every row.
+infer_schema looks at whole columns at once (on their distinct values) and
+picks one of:
+
+- "int", "float", "bool"
+- "date" (YYYY-MM-DD), "datetime" (ISO 8601 date and time)
+- "string"
+
+coerce_types then converts each column once: int, float and bool columns to
+native dtypes, date and datetime columns to normalized ISO 8601 strings (which
+sort and compare correctly as strings), string columns to stripped strings.
+Empty strings and "nan", "None", "null", "NaT" or "<NA>" count as missing.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+TYPES = ("int", "float", "bool", "date", "datetime", "string")
+
+_MISSING_STRINGS = ("", "nan", "NaN", "None", "none", "null", "NULL", "NaT", "<NA>")
+# No leading zeros: "007" or "0123" are codes, not numbers
+_INT_PATTERN = re.compile(r"[+-]?(?:0|[1-9][0-9]*)")
+_LEADING_ZERO_PATTERN = re.compile(r"[+-]?0[0-9]")
+_DATE_PATTERN = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+_DATETIME_PATTERN = re.compile(
+    r"[0-9]{4}-[0-9]{2}-[0-9]{2}[T ][0-9]{2}:[0-9]{2}(?::[0-9]{2}(?:\.[0-9]+)?)?"
+)
+_DATE_FORMAT = "%Y-%m-%d"
+_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+_INT64_MAX = np.iinfo(np.int64).max
+
+
+def _present_strings(series):
+    """Stripped string values of series, and the mask of missing entries."""
+    strings = series.astype(str).str.strip()
+    missing = series.isna().to_numpy() | strings.isin(_MISSING_STRINGS).to_numpy()
+    return strings, missing
+
+
+def _infer_strings(values):
+    """Type of a Series of distinct, stripped, non-missing strings."""
+    if not len(values):
+        return "string"
+    if values.str.lower().isin(("true", "false")).all():
+        return "bool"
+    numbers = pd.to_numeric(values, errors="coerce")
+    if numbers.notna().all():
+        if values.str.fullmatch(_INT_PATTERN).all():
+            # Integers too large for int64 are identifiers, not quantities
+            return "int" if (numbers.abs() <= _INT64_MAX).all() else "string"
+        if values.str.match(_LEADING_ZERO_PATTERN).any():
+            return "string"
+        return "float"
+    if values.str.fullmatch(_DATE_PATTERN).all():
+        parsed = pd.to_datetime(values, format=_DATE_FORMAT, errors="coerce")
+        if parsed.notna().all():
+            return "date"
+    if values.str.fullmatch(_DATETIME_PATTERN).all():
+        parsed = pd.to_datetime(values, format="ISO8601", errors="coerce")
+        if parsed.notna().all():
+            return "datetime"
+    return "string"
+
+
+def infer_column_type(series):
+    """
+    Infer the property type of one column.
+
+    Parameters
+    ----------
+    series : pd.Series
+
+    Returns
+    -------
+    str
+        One of TYPES. Numeric dtypes map directly (floats holding only whole
+        numbers are "int"); object columns are inferred from their distinct
+        string values.
+    """
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return "bool"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "int"
+    if pd.api.types.is_float_dtype(dtype):
+        values = series.dropna().to_numpy()
+        finite = np.isfinite(values)
+        if (
+            len(values)
+            and finite.all()
+            and (values == np.round(values)).all()
+            and (np.abs(values) <= _INT64_MAX).all()
+        ):
+            return "int"
+        return "float"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        values = series.dropna()
+        if len(values) and (values == values.dt.normalize()).all():
+            return "date"
+        return "datetime"
+
+    strings, missing = _present_strings(series)
+    distinct = pd.Series(pd.unique(strings[~missing]), dtype=object)
+    return _infer_strings(distinct)
+
+
+def infer_schema(df, columns=None):
+    """
+    Infer the property type of every column (or of columns) of df.
+
+    Returns
+    -------
+    dict
+        Column name -> one of TYPES, in column order.
+    """
+    columns = df.columns if columns is None else columns
+    return {col: infer_column_type(df[col]) for col in columns}
+
+
+def coerce_column(series, column_type):
+    """
+    Convert one column to column_type (see the module docstring).
+
+    Values that do not parse as column_type (e.g. in a later chunk of a file
+    whose schema was inferred on the first one) are kept as stripped strings,
+    or as floats for fractional numbers in an int column, rather than lost;
+    the column is then of object dtype.
+    """
+    if column_type not in TYPES:
+        raise ValueError(f"Unsupported column type: {column_type}")
+    dtype = series.dtype
+
+    if column_type == "int" and pd.api.types.is_float_dtype(dtype):
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        whole = np.isfinite(values) & (values == np.round(values))
+        bad = ~np.isnan(values) & ~whole
+        if bad.any():
+            # Keep fractional and infinite values as floats, whole ones as ints
+            result = series.astype(object).where(series.notna(), None)
+            result[whole] = values[whole].astype(np.int64).tolist()
+            return result
+        if series.isna().any():
+            return series.astype("Int64")
+        return series.astype(np.int64)
+    if column_type in ("int", "float", "bool") and (
+        pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)
+    ):
+        target = {"int": "Int64", "float": np.float64, "bool": "boolean"}[column_type]
+        converted = series.astype(target)
+        if column_type != "float" and not converted.isna().any():
+            converted = converted.astype(np.int64 if column_type == "int" else bool)
+        return converted
+    if column_type in ("date", "datetime") and pd.api.types.is_datetime64_any_dtype(
+        dtype
+    ):
+        fmt = _DATE_FORMAT if column_type == "date" else _DATETIME_FORMAT
+        return series.dt.strftime(fmt).astype(object).where(series.notna(), None)
+
+    strings, missing = _present_strings(series)
+    present = ~missing
+    if column_type == "string":
+        result = strings.astype(object)
+        result[missing] = None
+        return result
+
+    if column_type == "bool":
+        lowered = strings.str.lower()
+        parsed = lowered.map({"true": True, "false": False})
+    elif column_type in ("int", "float"):
+        parsed = pd.to_numeric(strings.where(present), errors="coerce")
+        if column_type == "int":
+            is_int = strings.str.fullmatch(_INT_PATTERN).to_numpy()
+            parsed = parsed.where(is_int)
+    else:
+        fmt = _DATE_FORMAT if column_type == "date" else "ISO8601"
+        dates = pd.to_datetime(strings.where(present), format=fmt, errors="coerce")
+        out_format = _DATE_FORMAT if column_type == "date" else _DATETIME_FORMAT
+        parsed = dates.dt.strftime(out_format).where(dates.notna())
+
+    bad = present & parsed.isna().to_numpy()
+    if bad.any():
+        # Keep what does not parse as is, typed values elsewhere
+        typed = parsed.astype("Int64") if column_type == "int" else parsed
+        result = typed.astype(object).where(typed.notna(), None)
+        result[bad] = strings[bad]
+        return result
+    if column_type == "int":
+        return parsed.astype("Int64") if missing.any() else parsed.astype(np.int64)
+    if column_type == "bool":
+        return parsed.astype("boolean") if missing.any() else parsed.astype(bool)
+    if column_type == "float":
+        return parsed.astype(np.float64)
+    return parsed.astype(object).where(present, None)
+
+
+def coerce_types(df, schema):
+    """
+    Copy of df with the columns of schema converted to their type.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+    schema : dict
+        Column name -> type, e.g. from infer_schema. Other columns are kept.
+    """
+    df = df.copy()
+    for col, column_type in schema.items():
+        if col in df.columns:
+            df[col] = coerce_column(df[col], column_type)
+    return df
+
+
+def schema_report(df, schema):
+    """
+    One row per column of schema: its type, resulting dtype, missing count and
+    an example value, for checking the inference at a glance.
+    """
+    rows = []
+    for col, column_type in schema.items():
+        values = df[col]
+        present = values.dropna()
+        rows.append(
+            {
+                "column": col,
+                "type": column_type,
+                "dtype": str(values.dtype),
+                "missing": int(values.isna().sum()),
+                "example": present.iloc[0] if len(present) else None,
+            }
+        )
+    return pd.DataFrame(rows, columns=["column", "type", "dtype", "missing", "example"])
@@ -0,0 +1,299 @@
+"""
+Nested timing spans for the graph build, export, load and query paths.
+
+Tracing is off by default, and then span() returns a shared no-op object, so
+instrumented code pays one global lookup per span. Turn it on for a block with
+tracing(), or with start_tracing() / stop_tracing() across notebook cells:
+
+    >>> from turingdb_examples import tracing
+    >>> with tracing.tracing() as trace:
+    ...     G = create_graph_from_df(df, ...)
+    ...     networkx_to_jsonl(G, "graph")
+    >>> trace.summary()
+    >>> trace.to_chrome_trace("ingest.trace.json")  # chrome://tracing or Perfetto
+
+Spans nest per thread and per asyncio task. Counters (rows, bytes, cache hits,
+...) are added with span.add() or count(), which adds to the innermost open span.
+"""
+
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Trace collecting spans, None when tracing is off
+_TRACE = None
+_CURRENT = contextvars.ContextVar("turingdb_examples_span", default=None)
+_IDS = itertools.count(1)
+
+
+class Span:
+    """A timed phase with counters, nested in the span open when it started."""
+
+    __slots__ = (
+        "trace",
+        "name",
+        "id",
+        "parent_id",
+        "thread_id",
+        "start",
+        "end",
+        "counters",
+        "_token",
+    )
+
+    def __init__(self, trace, name, counters):
+        self.trace = trace
+        self.name = name
+        self.id = next(_IDS)
+        self.parent_id = None
+        self.thread_id = None
+        self.start = self.end = None
+        self.counters = counters
+        self._token = None
+
+    def add(self, key, value=1):
+        """Add value to the counter key."""
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    @property
+    def duration(self):
+        """Seconds between enter and exit (so far, if still open)."""
+        end = self.end if self.end is not None else time.perf_counter_ns()
+        return (end - self.start) / 1e9
+
+    def __enter__(self):
+        parent = _CURRENT.get()
+        self.parent_id = parent.id if parent is not None else None
+        self.thread_id = threading.get_ident()
+        self._token = _CURRENT.set(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter_ns()
+        try:
+            _CURRENT.reset(self._token)
+        except ValueError:
+            # Exited in another context than entered (e.g. a generator finalized
+            # elsewhere): there is nothing of ours to restore in this one
+            pass
+        if exc_type is not None:
+            self.counters["error"] = exc_type.__name__
+        self.trace._record(self)
+        return False
+
+
+class _NoSpan:
+    """Stands in for Span when tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def add(self, key, value=1):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name, **counters):
+    """
+    Context manager timing a phase.
+
+    Parameters
+    ----------
+    name : str
+        Phase name, e.g. "node_pass" or "turingdb.query". Spans with the same name
+        are aggregated in Trace.summary().
+    **counters
+        Initial counters, e.g. rows=len(df). More can be added with .add().
+
+    Returns
+    -------
+    Span or a no-op object with the same interface when tracing is off.
+    """
+    trace = _TRACE
+    if trace is None:
+        return _NO_SPAN
+    return Span(trace, name, counters)
+
+
+def count(key, value=1):
+    """Add value to the counter key of the innermost open span, if any."""
+    if _TRACE is None:
+        return
+    current = _CURRENT.get()
+    if current is not None:
+        current.add(key, value)
+
+
+def traced(name=None):
+    """Decorator running the function in a span (named after it by default)."""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _TRACE is None:
+                return func(*args, **kwargs)
+            with Span(_TRACE, span_name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def is_tracing():
+    """Whether spans are being recorded."""
+    return _TRACE is not None
+
+
+class Trace:
+    """Spans recorded between start_tracing() and stop_tracing()."""
+
+    def __init__(self):
+        self.spans = []
+        self.start = time.perf_counter_ns()
+        self.wall_start = time.time()
+        self._lock = threading.Lock()
+
+    def _record(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def records(self):
+        """Finished spans as dicts, ordered by start time (seconds from trace start)."""
+        return [
+            {
+                "name": s.name,
+                "id": s.id,
+                "parent_id": s.parent_id,
+                "thread_id": s.thread_id,
+                "start": (s.start - self.start) / 1e9,
+                "duration": (s.end - s.start) / 1e9,
+                "counters": dict(s.counters),
+            }
+            for s in sorted(self.spans, key=lambda s: s.start)
+        ]
+
+    def summary(self):
+        """
+        Spans aggregated by name.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per span name with calls, total_s, self_s (total minus time in
+            child spans), mean_ms and the sum of every numeric counter, sorted by
+            total_s.
+        """
+        import pandas as pd
+
+        records = self.records()
+        child_time = {}
+        for record in records:
+            if record["parent_id"] is not None:
+                child_time[record["parent_id"]] = (
+                    child_time.get(record["parent_id"], 0) + record["duration"]
+                )
+
+        rows = {}
+        for record in records:
+            row = rows.setdefault(
+                record["name"],
+                {"name": record["name"], "calls": 0, "total_s": 0.0, "self_s": 0.0},
+            )
+            row["calls"] += 1
+            row["total_s"] += record["duration"]
+            row["self_s"] += record["duration"] - child_time.get(record["id"], 0)
+            for key, value in record["counters"].items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    row[key] = row.get(key, 0) + value
+
+        summary = pd.DataFrame(list(rows.values()))
+        if summary.empty:
+            return summary
+        summary["mean_ms"] = summary["total_s"] / summary["calls"] * 1000
+        return summary.sort_values("total_s", ascending=False, ignore_index=True)
+
+    def to_json(self, path=None):
+        """Spans as a JSON document; written to path if given, else returned."""
+        document = {"wall_start": self.wall_start, "spans": self.records()}
+        return _dump(document, path)
+
+    def to_chrome_trace(self, path=None):
+        """
+        Spans in the Chrome trace event format (chrome://tracing, Perfetto).
+
+        Written to path if given, else returned as a string.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": s.name,
+                "cat": "turingdb_examples",
+                "ph": "X",
+                "ts": (s.start - self.start) / 1e3,
+                "dur": (s.end - s.start) / 1e3,
+                "pid": pid,
+                "tid": s.thread_id,
+                "args": {key: _jsonable(v) for key, v in s.counters.items()},
+            }
+            for s in sorted(self.spans, key=lambda s: s.start)
+        ]
+        return _dump({"traceEvents": events, "displayTimeUnit": "ms"}, path)
+
+
+def _jsonable(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _dump(document, path):
+    text = json.dumps(document, default=_jsonable)
+    if path is None:
+        return text
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+def start_tracing():
+    """Start recording spans into a new Trace, which is returned."""
+    global _TRACE
+    _TRACE = Trace()
+    return _TRACE
+
+
+def stop_tracing():
+    """Stop recording spans and return the Trace (None if tracing was off)."""
+    global _TRACE
+    trace, _TRACE = _TRACE, None
+    return trace
+
+
+@contextmanager
+def tracing():
+    """Record spans for the duration of the with block; yields the Trace."""
+    global _TRACE
+    previous = _TRACE
+    trace = _TRACE = Trace()
+    try:
+        yield trace
+    finally:
+        _TRACE = previous
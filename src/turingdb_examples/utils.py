@@ -1,6 +1,13 @@
+import hashlib
+import os
 import re
+import time
+
 import pandas as pd
 
+from .escaping import escape_series, escape_value
+from .tracing import span
+
 
 def create_ID_column(df_):
     df = df_.copy()
@@ -24,18 +31,252 @@ def get_return_statements(query):
 
 
 def escape_for_cypher(value):
-    if pd.isna(value):  # Handle NaN/None
-        return ""
-    if not isinstance(value, str):
-        return str(value)
-
-    # Escape backslashes first (most important!)
-    value = value.replace("\\", "\\\\")
-    # Escape double quotes
-    value = value.replace('"', '\\"')
-    # Escape newlines and other control characters
-    value = value.replace("\n", "\\n")
-    value = value.replace("\r", "\\r")
-    value = value.replace("\t", "\\t")
-
-    return value
+    """
+    Escape a value for use inside a double-quoted Cypher string.
+
+    Backslashes, double quotes, newlines, carriage returns and tabs are escaped;
+    NaN/None give "". A pd.Series is escaped element-wise, each distinct value
+    once. See turingdb_examples.escaping.
+    """
+    if isinstance(value, pd.Series):
+        return escape_series(value)
+    return escape_value(value)
+
+
+# Bumped when the layout of cached datasets changes
+_DATASET_CACHE_VERSION = 1
+_DATASET_SUFFIX = ".arrow"
+_READERS = {
+    ".csv": pd.read_csv,
+    ".tsv": lambda path, **kwargs: pd.read_csv(path, **{"sep": "\t", **kwargs}),
+    ".txt": pd.read_csv,
+    ".xlsx": pd.read_excel,
+    ".xls": pd.read_excel,
+    ".json": pd.read_json,
+    ".parquet": pd.read_parquet,
+}
+
+
+def _file_fingerprint(path, fingerprint):
+    """Identity of a source file: size and mtime, or a hash of its bytes."""
+    stat = os.stat(path)
+    if fingerprint == "mtime":
+        return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if fingerprint == "content":
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return (stat.st_size, digest.hexdigest())
+    raise ValueError(f"Unsupported fingerprint: {fingerprint}")
+
+
+def _function_identity(func, version=None):
+    """
+    Name of func and, unless version is given, a hash of its source code, so
+    that editing a cleaning function invalidates what it cached.
+    """
+    if func is None:
+        return None
+    name = f"{getattr(func, '__module__', None)}.{getattr(func, '__qualname__', func)}"
+    if version is not None:
+        return (name, version)
+    import inspect
+
+    try:
+        code = inspect.getsource(func)
+    except (OSError, TypeError):
+        code_object = getattr(func, "__code__", None)
+        if code_object is None:
+            return (name, None)
+        code = repr((code_object.co_code, code_object.co_consts))
+    return (name, hashlib.blake2b(code.encode("utf-8"), digest_size=16).hexdigest())
+
+
+def _dataset_entries(cache_dir):
+    """(path, size, mtime) of every cached dataset."""
+    if not os.path.isdir(cache_dir):
+        return []
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(_DATASET_SUFFIX):
+            stat = entry.stat()
+            entries.append((entry.path, stat.st_size, stat.st_mtime))
+    return entries
+
+
+def _evict_datasets(cache_dir, max_disk_mb):
+    """Remove the least recently used datasets until the cache fits max_disk_mb."""
+    entries = sorted(_dataset_entries(cache_dir), key=lambda entry: entry[2])
+    total = sum(size for _, size, _ in entries)
+    for path, size, _ in entries:
+        if total <= max_disk_mb * 1e6:
+            break
+        os.remove(path)
+        total -= size
+
+
+def _read_cached_dataset(path, dtype_backend):
+    """The frame cached at path, left memory-mapped with dtype_backend="pyarrow"."""
+    from pyarrow import feather
+
+    table = feather.read_table(path, memory_map=True)
+    if dtype_backend == "pyarrow":
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    return table.to_pandas()
+
+
+def load_dataset(
+    source,
+    clean=None,
+    *,
+    reader=None,
+    params=None,
+    version=None,
+    cache_dir="~/.turing/cache/datasets",
+    max_disk_mb=4096,
+    fingerprint="mtime",
+    dtype_backend="numpy",
+    **read_kwargs,
+):
+    """
+    Read and clean a source file, or load the cleaned frame cached by a
+    previous run.
+
+    The cleaned DataFrame is stored as an uncompressed Arrow IPC file (needs
+    pyarrow), keyed on the source files, the reader and its arguments, the
+    cleaning function and params. Later runs read it back instead of parsing
+    and cleaning again. The cache is capped at max_disk_mb, evicting the least
+    recently used datasets first.
+
+    Parameters
+    ----------
+    source : str or list of str
+        Source file, or several read one by one and all passed to clean.
+    clean : callable or None
+        clean(df, **params), or clean(df_1, ..., df_n, **params) for several
+        sources, returning the cleaned DataFrame. None caches the parsed frame.
+    reader : callable or None
+        reader(path, **read_kwargs) returning a DataFrame. Defaults to the pandas
+        reader of the file extension (.csv, .tsv, .txt, .xlsx, .xls, .json,
+        .parquet).
+    params : dict or None
+        Keyword arguments of clean.
+    version : str or None
+        Version of clean; bump it to invalidate the cache. If None, clean is
+        identified by its source code, so editing it invalidates the cache.
+    cache_dir : str, default="~/.turing/cache/datasets"
+        Cache directory, created if needed.
+    max_disk_mb : float, default=4096
+        Size cap of the cache.
+    fingerprint : {"mtime", "content"}, default="mtime"
+        Identify source files by path, size and modification time, or by a hash
+        of their bytes (reads them, but survives copies and re-downloads).
+    dtype_backend : {"numpy", "pyarrow"}, default="numpy"
+        "numpy" copies the cached columns into NumPy-backed ones, as large in
+        memory as a parsed frame. "pyarrow" returns pd.ArrowDtype columns that
+        stay in the memory-mapped cache file, so a cached frame loads in
+        constant time and only takes memory for the pages read; a cache miss
+        then returns the frame read back from the file it was cached to.
+    **read_kwargs
+        Passed to reader, e.g. decimal="," or sheet_name.
+
+    Returns
+    -------
+    pd.DataFrame
+
+    Notes
+    -----
+    Frames Arrow cannot store (columns of mixed Python objects) and frames with
+    non-string column labels, which would come back from the cache as strings,
+    are returned without being cached. Parameters and reader arguments are part of the key
+    through their repr(), so they should have a stable one.
+
+    Examples
+    --------
+    >>> df = load_dataset(
+    ...     f"{path_data}/TfL_london_transport_tube.csv", clean_tfl, decimal=","
+    ... )
+    """
+    import pyarrow as pa
+    from pyarrow import feather
+
+    if dtype_backend not in ("numpy", "pyarrow"):
+        raise ValueError(f"Unsupported dtype_backend: {dtype_backend!r}")
+    start_time = time.perf_counter()
+    sources = [source] if isinstance(source, (str, os.PathLike)) else list(source)
+    params = params or {}
+    cache_dir = os.path.expanduser(cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    key = (
+        _DATASET_CACHE_VERSION,
+        [_file_fingerprint(path, fingerprint) for path in sources],
+        _function_identity(reader),
+        sorted(read_kwargs.items()),
+        _function_identity(clean, version),
+        sorted(params.items()),
+    )
+    digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+    path = os.path.join(cache_dir, digest + _DATASET_SUFFIX)
+    name = os.path.basename(os.fspath(sources[0])) if sources else "dataset"
+
+    if os.path.exists(path):
+        with span("dataset.cache_read", cache_hits=1) as read_span:
+            df = _read_cached_dataset(path, dtype_backend)
+            read_span.add("rows", len(df))
+        # Touch the file so eviction drops the least recently used
+        os.utime(path)
+        print(
+            f"Loaded {name} from cache in {time.perf_counter() - start_time:.2f}s "
+            f"({len(df):,} rows)"
+        )
+        return df
+
+    with span("dataset.read", files=len(sources)) as read_span:
+        frames = []
+        for source_path in sources:
+            if reader is not None:
+                read = reader
+            else:
+                extension = os.path.splitext(os.fspath(source_path))[1].lower()
+                if extension not in _READERS:
+                    raise ValueError(f"No reader for {extension!r} files")
+                read = _READERS[extension]
+            frames.append(read(source_path, **read_kwargs))
+        read_span.add("rows", sum(len(frame) for frame in frames))
+    if clean is not None:
+        with span("dataset.clean"):
+            df = clean(*frames, **params)
+    elif len(frames) == 1:
+        df = frames[0]
+    else:
+        raise ValueError("Several sources need a clean function to combine them")
+    parse_time = time.perf_counter() - start_time
+
+    if not all(isinstance(column, str) for column in df.columns):
+        # Arrow stores column names as strings: a hit would return "0" for 0
+        print(f"Parsed {name} in {parse_time:.2f}s, not cached: non-string columns")
+        return df
+
+    tmp_path = path + ".tmp"
+    try:
+        with span("dataset.cache_write", rows=len(df)):
+            feather.write_feather(df, tmp_path, compression="uncompressed")
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as exc:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        print(f"Parsed {name} in {parse_time:.2f}s, not cached: {exc}")
+        return df
+    os.replace(tmp_path, path)
+    if dtype_backend == "pyarrow":
+        df = _read_cached_dataset(path, dtype_backend)
+    _evict_datasets(cache_dir, max_disk_mb)
+    print(f"Parsed {name} in {parse_time:.2f}s ({len(df):,} rows), cached to {path}")
+    return df
+
+
+def clear_dataset_cache(cache_dir="~/.turing/cache/datasets"):
+    """Remove every dataset cached by load_dataset in cache_dir."""
+    for path, _, _ in _dataset_entries(os.path.expanduser(cache_dir)):
+        os.remove(path)
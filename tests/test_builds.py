@@ -0,0 +1,100 @@
+import sys
+import types
+
+import pandas as pd
+import pytest
+
+from turingdb_examples.builds import build_graph_from_df, build_key, next_graph_name
+
+
+class TuringDBException(Exception):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def turingdb(monkeypatch):
+    # ensure_graph only needs the exception type of the client package
+    module = types.ModuleType("turingdb")
+    module.TuringDBException = TuringDBException
+    monkeypatch.setitem(sys.modules, "turingdb", module)
+
+
+class Client:
+    """Client of one server, keeping the graphs loaded with LOAD JSONL."""
+
+    def __init__(self, host, graphs=()):
+        self.host = host
+        self.graphs = list(graphs)
+        self.loads = 0
+
+    def list_available_graphs(self):
+        return list(self.graphs)
+
+    def load_graph(self, graph_name, raise_if_loaded=True):
+        pass
+
+    def set_graph(self, graph_name):
+        self.graph = graph_name
+
+    def query(self, query):
+        self.loads += 1
+        self.graphs.append(query.split(" AS ")[1])
+
+
+SPEC = dict(
+    source_node_col={"id": "patient", "type": "Patient"},
+    target_node_col={"id": "doctor", "type": "Doctor"},
+    node_type_key="type",
+)
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"patient": ["a", "b"], "doctor": ["x", "y"]})
+
+
+def build(client, df, data_dir):
+    return build_graph_from_df(client, "healthcare", df, data_dir=data_dir, **SPEC)
+
+
+def test_unchanged_build_is_reused(df, tmp_path):
+    client = Client("http://localhost:6666", ["healthcare1"])
+
+    assert build(client, df, str(tmp_path)) == "healthcare2"
+    assert build(client, df, str(tmp_path)) == "healthcare2"
+    assert client.loads == 1
+    assert client.graph == "healthcare2"
+
+    changed = df.assign(doctor=["x", "z"])
+    assert build(client, changed, str(tmp_path)) == "healthcare3"
+    assert client.loads == 2
+
+
+def test_builds_are_per_server(df, tmp_path):
+    first = Client("http://localhost:6666")
+    second = Client("http://db.example.com:6666", ["healthcare1"])
+
+    assert build(first, df, str(tmp_path)) == "healthcare1"
+    # Same graph name on another server is not the same build
+    assert build(second, df, str(tmp_path)) == "healthcare2"
+    assert build(first, df, str(tmp_path)) == "healthcare1"
+    assert build(second, df, str(tmp_path)) == "healthcare2"
+    assert first.loads == second.loads == 1
+
+
+def test_missing_graph_is_rebuilt(df, tmp_path):
+    client = Client("http://localhost:6666")
+    build(client, df, str(tmp_path))
+    client.graphs.clear()
+
+    assert build(client, df, str(tmp_path)) == "healthcare1"
+    assert client.loads == 2
+
+
+def test_build_key_covers_arguments(df):
+    assert build_key(df, a=1) == build_key(df.copy(), a=1)
+    assert build_key(df, a=1) != build_key(df, a=2)
+
+
+def test_next_graph_name():
+    assert next_graph_name("my-graph", ["my-graph7", "my-graphs"]) == "my_graph8"
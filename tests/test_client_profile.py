@@ -0,0 +1,219 @@
+import json
+import re
+import threading
+import urllib.request
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from turingdb_examples.client import TuringDBPool, graph_profile
+
+NODES = {
+    0: (["Person"], {"name": "a", "age": 3}),
+    1: (["Person", "Employee"], {"name": "b"}),
+    2: (["Company"], {"name": "c", "Billing Amount": 1.0}),
+    3: (["Company"], {}),
+    4: (["Employee"], {"name": "e"}),
+}
+EDGES = [
+    (0, 2, "WORKS_AT", {"since": 1}),
+    (1, 2, "WORKS_AT", {}),
+    (0, 1, "KNOWS", {}),
+]
+PROPERTY = r"`?([^`)]+)`?"
+
+
+def grouped(items, key, props):
+    """Rows of key, count and property counts, one per distinct key."""
+    rows = {}
+    for group, attrs in items:
+        row = rows.setdefault(json.dumps(group), [group, 0] + [0] * len(props))
+        row[1] += 1
+        for i, prop in enumerate(props):
+            row[2 + i] += prop in attrs
+    return [f"{key}"] + [f"c{i}" for i in range(len(props) + 1)], list(rows.values())
+
+
+def answer(query, grouping):
+    """Columns and rows of query on the graph of NODES and EDGES."""
+    if query == "CALL db.history()":
+        return ["commit"], [["0a1b(HEAD)"]]
+    if query == "CALL db.labels()":
+        return ["id", "label"], [[0, "Person"], [1, "Employee"], [2, "Company"]]
+    if query == "CALL db.edgeTypes()":
+        return ["id", "edgeType"], [[0, "WORKS_AT"], [1, "KNOWS"]]
+    if query == "CALL db.propertyTypes()":
+        # Not in the order of the notebooks: columns are found by name
+        types = ["String", "Int64", "Double", "Int64"]
+        names = ["name", "age", "Billing Amount", "since"]
+        return ["valueType", "id", "propertyType"], [
+            [t, i, name] for i, (t, name) in enumerate(zip(types, names))
+        ]
+    if query == "MATCH (n) RETURN count(n)":
+        return ["count(n)"], [[len(NODES)]]
+
+    match = re.fullmatch(r"MATCH \(n\) RETURN labels\(n\), count\(n\)(.*)", query)
+    if match and grouping:
+        props = re.findall(r"count\(n\.%s\)" % PROPERTY, match.group(1))
+        return grouped(NODES.values(), "labels(n)", props)
+    match = re.fullmatch(
+        r"MATCH \(n\)-\[e\]->\(m\) RETURN type\(e\), count\(e\)(.*)", query
+    )
+    if match and grouping:
+        props = re.findall(r"count\(e\.%s\)" % PROPERTY, match.group(1))
+        return grouped([(t, attrs) for _, _, t, attrs in EDGES], "type(e)", props)
+    match = re.fullmatch(
+        r"MATCH \(n\)-\[e\]->\(m\) RETURN id\(([nm])\), count\(e\)", query
+    )
+    if match and grouping:
+        degrees = Counter(e[0] if match.group(1) == "n" else e[1] for e in EDGES)
+        return ["id", "count(e)"], [list(item) for item in degrees.items()]
+
+    match = re.fullmatch(
+        r"MATCH \(n:(\w+)\)(?: WHERE n\.%s IS NOT NULL)? RETURN count\(n\)" % PROPERTY,
+        query,
+    )
+    if match:
+        label, prop = match.groups()
+        n = sum(
+            label in labels and (prop is None or prop in attrs)
+            for labels, attrs in NODES.values()
+        )
+        return ["count(n)"], [[n]]
+    match = re.fullmatch(
+        r"MATCH \(n\)-\[e:(\w+)\]->\(m\)(?: WHERE e\.%s IS NOT NULL)? "
+        r"RETURN count\(e\)" % PROPERTY,
+        query,
+    )
+    if match:
+        edge_type, prop = match.groups()
+        n = sum(
+            t == edge_type and (prop is None or prop in attrs)
+            for _, _, t, attrs in EDGES
+        )
+        return ["count(e)"], [[n]]
+    return None
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        query = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        with self.server.lock:
+            self.server.queries.append(query)
+        result = answer(query, self.server.grouping)
+        if result is None:
+            status, payload = 400, {"error": f"Unsupported query: {query}"}
+        else:
+            status, payload = 200, {"columns": result[0], "data": result[1]}
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(params=[True, False], ids=["grouping", "no-grouping"])
+def server(request):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), QueryHandler)
+    server.lock = threading.Lock()
+    server.queries = []
+    server.grouping = request.param
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class HTTPClient:
+    """Minimal client of the stub server, returning DataFrames like TuringDB."""
+
+    def __init__(self, port):
+        self.url = f"http://127.0.0.1:{port}/query"
+        self.current_graph = "people"
+        self.current_commit = "HEAD"
+
+    def warmup(self):
+        pass
+
+    def set_graph(self, graph_name):
+        self.current_graph = graph_name
+
+    def query(self, query):
+        request = urllib.request.Request(self.url, data=query.encode(), method="POST")
+        with urllib.request.urlopen(request, timeout=5) as response:
+            result = json.load(response)
+        return pd.DataFrame(result["data"], columns=result["columns"])
+
+
+def records(df):
+    return sorted(map(tuple, df.to_numpy().tolist()))
+
+
+def test_profile_counts(server):
+    profile = graph_profile(HTTPClient(server.server_port), refresh=True)
+
+    assert profile["nodes"] == 5
+    assert profile["edges"] == 3
+    assert records(profile["labels"]) == [
+        ("Company", 2),
+        ("Employee", 2),
+        ("Person", 2),
+    ]
+    assert records(profile["edge_types"]) == [("KNOWS", 1), ("WORKS_AT", 2)]
+    assert records(profile["properties"]) == [
+        ("node", "Company", "Billing Amount", "Double", 1, 0.5),
+        ("node", "Company", "name", "String", 1, 0.5),
+        ("node", "Employee", "name", "String", 2, 1.0),
+        ("node", "Person", "age", "Int64", 1, 0.5),
+        ("node", "Person", "name", "String", 2, 1.0),
+        ("relationship", "WORKS_AT", "since", "Int64", 1, 0.5),
+    ]
+
+
+def test_degree_summary(server):
+    profile = graph_profile(HTTPClient(server.server_port), refresh=True)
+
+    degree = profile["degree"]
+    assert degree.loc["out", "mean"] == pytest.approx(3 / 5)
+    if server.grouping:
+        assert degree.loc["out", ["min", "max", "zero"]].tolist() == [0, 2, 3]
+        assert degree.loc["in", ["min", "max", "zero"]].tolist() == [0, 2, 3]
+    else:
+        assert degree.loc["out", ["max"]].isna().all()
+
+
+def test_grouped_queries_do_not_grow_with_labels(server):
+    profile = graph_profile(HTTPClient(server.server_port), refresh=True)
+
+    if server.grouping:
+        assert profile["queries"] == 9
+    else:
+        # db.* and totals, rejected grouped queries, then one per label/property
+        assert profile["queries"] > 9 + 3 * 5
+
+
+def test_profile_is_cached_per_commit(server):
+    client = HTTPClient(server.server_port)
+    first = graph_profile(client, refresh=True)
+    n_queries = len(server.queries)
+
+    assert graph_profile(client) is first
+    assert server.queries[n_queries:] == ["CALL db.history()"]
+
+
+def test_pool_runs_looped_counts(server):
+    port = server.server_port
+    with TuringDBPool(lambda: HTTPClient(port), size=4, graph_name="people") as pool:
+        profile = graph_profile(pool, refresh=True)
+
+    assert records(profile["labels"]) == [
+        ("Company", 2),
+        ("Employee", 2),
+        ("Person", 2),
+    ]
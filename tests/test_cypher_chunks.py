@@ -0,0 +1,129 @@
+import re
+
+import networkx as nx
+
+from turingdb_examples import tracing
+from turingdb_examples.escaping import cypher_string
+from turingdb_examples.graph import (
+    build_create_command_from_networkx,
+    iter_cypher_chunks,
+    split_cypher_commands,
+)
+
+
+def sample_graph():
+    G = nx.DiGraph()
+    for i in range(50):
+        G.add_node(i, type="Person" if i % 2 else "City", name=f"node {i} (x), (y)")
+    for i in range(49):
+        G.add_edge(i, i + 1, type="KNOWS", weight=i / 10)
+    return G
+
+
+def test_split_matches_iter_cypher_chunks():
+    G = sample_graph()
+    command = build_create_command_from_networkx(
+        G, node_type_key="type", edge_type_key="type"
+    )
+    split = split_cypher_commands(command, max_size_mb=0.001)
+    chunks = list(
+        iter_cypher_chunks(
+            G, node_type_key="type", edge_type_key="type", max_size_mb=0.001
+        )
+    )
+
+    assert len(split["node_chunks"]) > 1
+    assert [("node", c) for c in split["node_chunks"]] + [
+        ("edge", c) for c in split["edge_chunks"]
+    ] == chunks
+
+
+def test_splits_several_patterns_on_one_line():
+    nodes = [f'(:A {{id: {i}, name: "n{i}"}})' for i in range(100)]
+    command = (
+        "CREATE "
+        + ", ".join(nodes)
+        + "\nMATCH (a {id: 0}), (b {id: 1}) CREATE (a)-[:E]->(b)"
+    )
+
+    split = split_cypher_commands(command, max_size_mb=0.0005)
+
+    assert len(split["node_chunks"]) > 1
+    assert all(len(c.encode()) <= 500 for c in split["node_chunks"])
+    patterns = ",\n".join(c[len("CREATE ") :] for c in split["node_chunks"])
+    assert patterns.split(",\n") == nodes
+    assert split["edge_chunks"] == [command.splitlines()[1]]
+
+
+def test_splits_patterns_spanning_lines():
+    command = "CREATE (:A {id: 1,\n  name: 'a'}),\n(:B {id: 2})"
+
+    split = split_cypher_commands(command)
+
+    assert split["node_chunks"] == ["CREATE (:A {id: 1, name: 'a'}),\n(:B {id: 2})"]
+
+
+def test_split_is_traced_once():
+    command = "CREATE (:A {id: 1}),\n(:A {id: 2}),\n(:B {id: 3})"
+    with tracing.tracing() as trace:
+        split_cypher_commands(command)
+
+    summary = trace.summary().set_index("name")
+    assert summary.loc["split_cypher_commands", "calls"] == 1
+
+
+MATCH_NODE = re.compile(r'\((n\d+):(\w+) \{id: ("(?:[^"\\]|\\.)*")\}\)')
+BULK_EDGE = re.compile(r"\((n\d+)\)-\[:(\w+)((?: \{[^}]*\})?)\]->\((n\d+)\)")
+SINGLE_EDGE = re.compile(
+    r'^MATCH \(source \{id: ("(?:[^"\\]|\\.)*")\}\), '
+    r'\(target \{id: ("(?:[^"\\]|\\.)*")\}\) '
+    r"CREATE \(source\)-\[:(\w+)((?: \{[^}]*\})?)\]->\(target\)$"
+)
+
+
+def test_bulk_edges_match_per_edge_statements():
+    G = nx.DiGraph()
+    for i in range(60):
+        G.add_node(i, type="Person" if i % 3 else "City")
+    for i in range(59):
+        G.add_edge(i, i + 1, type="KNOWS" if i % 2 else "LIKES", weight=i / 4)
+        G.add_edge(i + 1, 0, type="KNOWS")
+    labels = {cypher_string(n): t for n, t in G.nodes(data="type")}
+    max_size_mb = 0.002
+
+    per_edge = set()
+    command = build_create_command_from_networkx(G, "type", "type")
+    for line in command.split("\n"):
+        if line.startswith("MATCH"):
+            source, target, rel_type, props = SINGLE_EDGE.match(line).groups()
+            per_edge.add((source, rel_type, target, props))
+
+    bulk = build_create_command_from_networkx(
+        G, "type", "type", bulk_edges=True, max_size_mb=max_size_mb
+    )
+    statements = [line for line in bulk.split("\n") if line.startswith("MATCH ")]
+    created = []
+    groups = set()
+    for statement in statements:
+        assert len(statement.encode()) <= max_size_mb * 1e6
+        match, create = statement[len("MATCH ") :].split(" CREATE ")
+        # Each endpoint is looked up once, by label and id
+        nodes = {}
+        for variable, label, node_id in MATCH_NODE.findall(match):
+            assert variable not in nodes
+            assert labels[node_id] == label
+            nodes[variable] = (label, node_id)
+        assert MATCH_NODE.sub("", match).strip(", ") == ""
+        edges = BULK_EDGE.findall(create)
+        assert BULK_EDGE.sub("", create).strip(", ") == ""
+        # One (source label, type, target label) group per statement
+        (group,) = {(nodes[s][0], t, nodes[e][0]) for s, t, _, e in edges}
+        groups.add(group)
+        created.extend(
+            (nodes[s][1], rel_type, nodes[e][1], props)
+            for s, rel_type, props, e in edges
+        )
+
+    assert len(statements) > len(groups)
+    assert len(created) == G.number_of_edges()
+    assert set(created) == per_edge
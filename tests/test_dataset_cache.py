@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from turingdb_examples.utils import load_dataset
+
+pytest.importorskip("pyarrow")
+
+
+def clean(df, scale=1):
+    df = df.copy()
+    df["amount"] = df["amount"] * scale
+    return df
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"name": ["a", "b", "c"], "amount": [1.5, 2.0, 3.5]}).to_csv(
+        path, index=False
+    )
+    return str(path)
+
+
+def test_cache_hit_returns_the_cleaned_frame(source, tmp_path, capsys):
+    cache_dir = str(tmp_path / "cache")
+    parsed = load_dataset(source, clean, params={"scale": 2}, cache_dir=cache_dir)
+    cached = load_dataset(source, clean, params={"scale": 2}, cache_dir=cache_dir)
+
+    assert "from cache" in capsys.readouterr().out
+    pd.testing.assert_frame_equal(cached, parsed)
+    assert cached["amount"].tolist() == [3.0, 4.0, 7.0]
+
+
+def test_params_are_part_of_the_key(source, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    load_dataset(source, clean, params={"scale": 2}, cache_dir=cache_dir)
+    df = load_dataset(source, clean, params={"scale": 3}, cache_dir=cache_dir)
+
+    assert df["amount"].tolist() == [4.5, 6.0, 10.5]
+
+
+def test_pyarrow_backend_on_miss_and_hit(source, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    frames = [
+        load_dataset(source, clean, cache_dir=cache_dir, dtype_backend="pyarrow")
+        for _ in range(2)
+    ]
+
+    for df in frames:
+        assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+        assert df["amount"].tolist() == [1.5, 2.0, 3.5]
+
+
+def test_unknown_dtype_backend(source, tmp_path):
+    with pytest.raises(ValueError):
+        load_dataset(source, cache_dir=str(tmp_path), dtype_backend="arrow")
+
+
+def test_non_string_columns_are_not_cached(source, tmp_path, capsys):
+    cache_dir = str(tmp_path / "cache")
+
+    def positional(df):
+        return df.set_axis(range(df.shape[1]), axis=1)
+
+    frames = [load_dataset(source, positional, cache_dir=cache_dir) for _ in range(2)]
+
+    assert "not cached" in capsys.readouterr().out
+    for df in frames:
+        assert df.columns.tolist() == [0, 1]
@@ -0,0 +1,165 @@
+import contextlib
+import io
+import json
+
+import networkx as nx
+import pytest
+
+from turingdb_examples.graph import gml_to_jsonl, networkx_to_jsonl
+
+# Quoted strings with brackets, XML escapes and a line break, repeated keys,
+# nested blocks, INF, and an edge before its endpoints' node blocks
+DIRECTED = """\
+Creator "test [v1]"
+graph [
+  directed 1
+  name "quoted [brackets] &amp; more"
+  # a comment ]
+  edge [
+    source 2
+    target 0
+    weight 0.5
+  ]
+  node [
+    id 0
+    label "a [x]"
+    kind "Person"
+    note "caf&#233; &quot;quoted&quot; ]"
+    tags "red"
+    tags "blue"
+    pos [
+      x 1.5
+      y -2
+      inner [ z "deep" ]
+    ]
+  ]
+  node [
+    id 1
+    label "b"
+    kind "Org"
+    empty "[]"
+    score INF
+  ]
+  node [ id 2 label "c" ]
+  edge [
+    source 0
+    target 1
+    rel "WORKS_AT"
+    since 2010
+    text "multi
+    line"
+  ]
+  edge [ source 1 target 2 ]
+]
+"""
+
+UNDIRECTED = """\
+graph [
+  directed 0
+  node [ id 0 label "a" ]
+  node [ id 1 label "b" ]
+  node [ id 2 label "c" ]
+  node [ id 3 label "d" ]
+  edge [ source 2 target 3 rel "R" ]
+  edge [ source 1 target 0 ]
+  edge [ source 3 target 0 w 1 ]
+]
+"""
+
+
+def convert(tmp_path, text, label="label", chunk_size=100_000, **type_keys):
+    """JSONL of the streaming converter and of nx.read_gml + networkx_to_jsonl."""
+    path = tmp_path / "graph.gml"
+    path.write_text(text, encoding="utf-8")
+    with contextlib.redirect_stdout(io.StringIO()):
+        streamed = gml_to_jsonl(
+            path,
+            "streamed",
+            label=label,
+            data_dir=str(tmp_path),
+            chunk_size=chunk_size,
+            **type_keys,
+        )
+        G = nx.read_gml(path, label=label)
+        expected = networkx_to_jsonl(G, "nx", data_dir=str(tmp_path), **type_keys)
+    return (tmp_path / streamed).read_text(), (tmp_path / expected).read_text()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 100_000])
+def test_directed_matches_networkx(tmp_path, chunk_size):
+    streamed, expected = convert(
+        tmp_path,
+        DIRECTED,
+        node_type_key="kind",
+        edge_type_key="rel",
+        chunk_size=chunk_size,
+    )
+
+    assert streamed == expected
+    first = json.loads(streamed.splitlines()[0])
+    assert first["properties"]["id"] == "a [x]"
+    assert first["properties"]["note"] == 'café "quoted" ]'
+    assert first["properties"]["tags"] == ["red", "blue"]
+    assert first["properties"]["pos"] == {"x": 1.5, "y": -2, "inner": {"z": "deep"}}
+
+
+@pytest.mark.parametrize("label", [None, "id"])
+def test_gml_ids_as_node_ids(tmp_path, label):
+    streamed, expected = convert(tmp_path, DIRECTED, label=label)
+
+    assert streamed == expected
+
+
+def test_undirected_matches_networkx(tmp_path):
+    streamed, expected = convert(tmp_path, UNDIRECTED, edge_type_key="rel")
+
+    def records(text):
+        nodes, edges = [], set()
+        for line in text.splitlines():
+            record = json.loads(line)
+            if record["type"] == "node":
+                nodes.append(line)
+            else:
+                # networkx_to_jsonl lists an undirected edge from either end
+                ends = frozenset((record["start"]["id"], record["end"]["id"]))
+                edges.add((ends, record["label"], json.dumps(record["properties"])))
+        return nodes, edges
+
+    assert records(streamed) == records(expected)
+    assert len(records(streamed)[1]) == 3
+
+
+def test_lists_written_by_networkx(tmp_path):
+    G = nx.DiGraph()
+    G.add_node("a", tags=["x"], sizes=[1, 2, 3])
+    G.add_node("b", tags=[])
+    G.add_edge("a", "b", path=["a", "b"])
+    buffer = io.BytesIO()
+    nx.write_gml(G, buffer)
+
+    streamed, expected = convert(tmp_path, buffer.getvalue().decode())
+
+    assert streamed == expected
+    assert json.loads(streamed.splitlines()[0])["properties"]["tags"] == ["x"]
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ('graph [\n  node [ id 0 label "a" ]\n', "Unexpected end"),
+        (
+            'graph [\n  node [ id 0 label "a" ]\n  edge [ source 0 target 1 ]\n]\n',
+            "undefined",
+        ),
+        (
+            'graph [\n  node [ id 0 label "a" ]\n  node [ id 0 label "b" ]\n]\n',
+            "duplicated",
+        ),
+    ],
+)
+def test_malformed_gml(tmp_path, text, message):
+    path = tmp_path / "graph.gml"
+    path.write_text(text, encoding="utf-8")
+
+    with pytest.raises(ValueError, match=message):
+        gml_to_jsonl(path, "g", data_dir=str(tmp_path))
@@ -0,0 +1,156 @@
+import contextlib
+import io
+import json
+import os
+
+import networkx as nx
+import pytest
+
+from turingdb_examples.graph import apply_graph_delta, networkx_to_jsonl
+
+
+class Client:
+    """Records the statements of each change, like a TuringDB client would run them."""
+
+    def __init__(self, fail_on=None):
+        self.queries = []
+        self.graph = None
+        self.changes = 0
+        self.checked_out = False
+        self.fail_on = fail_on
+
+    def set_graph(self, graph_name):
+        self.graph = graph_name
+
+    def new_change(self):
+        # The server hands out change IDs as hex strings
+        self.changes += 1
+        return f"{self.changes:x}"
+
+    def query(self, query):
+        if self.fail_on is not None and query.startswith(self.fail_on):
+            raise RuntimeError(f"rejected: {query}")
+        self.queries.append(query)
+
+    def checkout(self, change="main"):
+        self.checked_out = True
+
+
+def make_graph():
+    G = nx.DiGraph()
+    G.add_node("a", kind="Person", age=30)
+    G.add_node("b", kind="Person", age=40)
+    G.add_node("c", kind="Company", city="Paris")
+    G.add_edge("a", "b", rel="KNOWS", since=2010)
+    G.add_edge("a", "c", rel="WORKS_AT")
+    G.add_edge("b", "c", rel="WORKS_AT")
+    return G
+
+
+def export(G, data_dir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        networkx_to_jsonl(G, "g", "kind", "rel", data_dir=str(data_dir), manifest=True)
+
+
+def apply(client, G, data_dir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return apply_graph_delta(client, G, "g", "kind", "rel", data_dir=str(data_dir))
+
+
+def read_manifest(data_dir):
+    with open(os.path.join(data_dir, "g.manifest.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_apply_delta(tmp_path):
+    G = make_graph()
+    export(G, tmp_path)
+
+    G.nodes["a"]["age"] = 31
+    G.remove_node("c")
+    G.add_node("d", kind="Person", age=25)
+    G.add_edge("d", "a", rel="KNOWS")
+    G.edges["a", "b"]["since"] = 2011
+
+    client = Client()
+    stats = apply(client, G, tmp_path)
+
+    assert stats == {
+        "nodes_created": 1,
+        "nodes_updated": 1,
+        "nodes_deleted": 1,
+        "edges_created": 1,
+        "edges_updated": 1,
+        "edges_deleted": 2,
+    }
+    assert client.graph == "g"
+    assert client.checked_out
+    # Deletes first, then creates, then updates, in one change
+    assert client.queries == [
+        'MATCH (a0:Person {id: "a"})-[r0:WORKS_AT]->(b0:Company {id: "c"}), '
+        '(a1:Person {id: "b"})-[r1:WORKS_AT]->(b1:Company {id: "c"}) DELETE r0, r1',
+        'MATCH (n0:Company {id: "c"}) DELETE n0',
+        'CREATE (:Person {id: "d", kind: "Person", age: 25})',
+        'MATCH (n0:Person {id: "a"}) SET n0.kind = "Person", n0.age = 31',
+        'MATCH (a0:Person {id: "d"}), (b0:Person {id: "a"}) '
+        "CREATE (a0)-[:KNOWS]->(b0)",
+        'MATCH (a0:Person {id: "a"})-[r0:KNOWS]->(b0:Person {id: "b"}) '
+        "SET r0.since = 2011",
+        "COMMIT",
+        "CHANGE SUBMIT",
+    ]
+
+    manifest = read_manifest(tmp_path)
+    assert set(manifest["nodes"]) == {"a", "b", "d"}
+    assert manifest["nodes"]["d"][0] == 3
+    assert sorted((s, t, r) for s, t, r, *_ in manifest["edges"]) == [
+        ("a", "b", "KNOWS"),
+        ("d", "a", "KNOWS"),
+    ]
+
+
+def test_applied_delta_is_not_applied_again(tmp_path):
+    G = make_graph()
+    export(G, tmp_path)
+    G.nodes["b"]["age"] = 41
+
+    apply(Client(), G, tmp_path)
+    client = Client()
+    stats = apply(client, G, tmp_path)
+
+    assert not any(stats.values())
+    assert client.queries == []
+    assert client.graph is None
+
+
+def test_no_changes_means_no_queries(tmp_path):
+    G = make_graph()
+    export(G, tmp_path)
+    before = read_manifest(tmp_path)
+
+    client = Client()
+    stats = apply(client, G, tmp_path)
+
+    assert not any(stats.values())
+    assert client.queries == []
+    assert client.changes == 0
+    assert read_manifest(tmp_path) == before
+
+
+def test_failed_change_keeps_manifest(tmp_path):
+    G = make_graph()
+    export(G, tmp_path)
+    before = read_manifest(tmp_path)
+    G.add_node("d", kind="Person")
+
+    client = Client(fail_on="CHANGE SUBMIT")
+    with pytest.raises(RuntimeError):
+        apply(client, G, tmp_path)
+
+    assert client.checked_out
+    assert read_manifest(tmp_path) == before
+
+
+def test_missing_manifest(tmp_path):
+    with pytest.raises(ValueError, match="No manifest"):
+        apply(Client(), make_graph(), tmp_path)
@@ -0,0 +1,129 @@
+import contextlib
+import io
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+from turingdb_examples.graph import (
+    ArrayGraph,
+    _bulk_add,
+    create_graph_from_df,
+    networkx_to_jsonl,
+)
+
+
+def random_frame(n_rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    amount = rng.normal(100, 30, n_rows)
+    amount[rng.random(n_rows) < 0.1] = np.nan
+    return pd.DataFrame(
+        {
+            "src": rng.integers(0, 40, n_rows).astype(str),
+            "dst": rng.integers(20, 60, n_rows).astype(str),
+            "src_name": rng.choice(["a", "b", None], n_rows),
+            "kind": rng.choice(["Account", "Merchant"], n_rows),
+            "amount": amount,
+            "step": rng.integers(0, 10, n_rows),
+            "city": rng.choice(["Paris", "Lyon", None], n_rows),
+            "edge_type": rng.choice(["PAYS", "OWES"], n_rows),
+        }
+    )
+
+
+def graph_items(G):
+    return list(G.nodes(data=True)), list(G.edges(data=True))
+
+
+@pytest.mark.parametrize("directed", [True, False])
+def test_engines_build_the_same_graph(directed):
+    df = random_frame()
+    spec = dict(
+        directed=directed,
+        source_node_col={"id": "src", "displayName": "src_name", "type": "kind"},
+        target_node_col={"id": "dst", "type": "Account"},
+        attributes_source_node_cols=["step"],
+        optional_nodes_cols={
+            "City": {"id": "city", "link_to_source": True, "link_to_target": True}
+        },
+        attributes_edges=["amount"],
+        edge_col="edge_type",
+    )
+    rows = create_graph_from_df(df, engine="rows", **spec)
+    columnar = create_graph_from_df(df, engine="columnar", **spec)
+
+    assert type(rows) is type(columnar)
+    assert graph_items(rows) == graph_items(columnar)
+
+
+class TaggedDiGraph(nx.DiGraph):
+    pass
+
+
+@pytest.mark.parametrize("graph_class", [nx.DiGraph, nx.Graph, TaggedDiGraph])
+def test_bulk_add_matches_public_api(graph_class):
+    nodes = (["a", "b", "c"], [{"x": 1}, {}, {"y": "z"}])
+    edges = (["a", "b", "a"], ["b", "c", "b"], [{"w": 1}, {}, {"w": 2, "v": 3}])
+
+    G = graph_class()
+    _bulk_add(G, nodes, edges)
+    expected = graph_class()
+    expected.add_nodes_from(zip(*nodes))
+    expected.add_edges_from(zip(*edges))
+
+    assert graph_items(G) == graph_items(expected)
+    if G.is_directed():
+        assert list(G.predecessors("b")) == list(expected.predecessors("b"))
+
+
+def test_bulk_add_on_non_empty_graph_uses_public_api():
+    G = nx.DiGraph()
+    G.add_node("a", kept=True)
+    _bulk_add(G, (["b"], [{}]), (["a"], ["b"], [{"w": 1}]))
+
+    assert G.nodes["a"] == {"kept": True}
+    assert G.edges["a", "b"] == {"w": 1}
+
+
+def jsonl_bytes(G, name, data_dir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        filename = networkx_to_jsonl(G, name, "type", "edge_type", str(data_dir))
+    return (data_dir / filename).read_bytes()
+
+
+@pytest.mark.parametrize("directed", [True, False])
+def test_array_graph_exports_like_networkx(tmp_path, directed):
+    df = random_frame()
+    spec = dict(
+        directed=directed,
+        source_node_col={"id": "src", "displayName": "src_name", "type": "kind"},
+        target_node_col={"id": "dst", "type": "Account"},
+        attributes_source_node_cols=["step"],
+        optional_nodes_cols={
+            "City": {"id": "city", "link_to_source": True, "link_to_target": True}
+        },
+        attributes_edges=["amount"],
+        edge_col="edge_type",
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        G = create_graph_from_df(df, **spec)
+        graph = ArrayGraph.from_dataframe(df, chunksize=64, **spec)
+
+    assert jsonl_bytes(graph, "arrays", tmp_path) == jsonl_bytes(G, "nx", tmp_path)
+
+
+def test_array_graph_neighbors_match_networkx():
+    df = random_frame()
+    spec = dict(source_node_col="src", target_node_col="dst")
+    G = create_graph_from_df(df, **spec)
+    graph = ArrayGraph.from_dataframe(df, chunksize=64, **spec)
+
+    assert graph.out_degree().tolist() == [G.out_degree(n) for n in graph.nodes()]
+    assert graph.in_degree().tolist() == [G.in_degree(n) for n in graph.nodes()]
+    for node in G:
+        assert graph.successors(node) == list(G.successors(node))
+        # NetworkX lists predecessors in edge insertion order
+        assert sorted(graph.predecessors(node)) == sorted(G.predecessors(node))
+    with pytest.raises(KeyError):
+        graph.successors("missing")
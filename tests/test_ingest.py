@@ -0,0 +1,87 @@
+import contextlib
+import io
+
+import networkx as nx
+import pandas as pd
+import pytest
+
+from turingdb_examples.graph import create_graph_from_df, networkx_to_jsonl
+from turingdb_examples.ingest import ingest_tables
+
+
+def make_jobs(tmp_path):
+    supplies = pd.DataFrame(
+        {
+            "supplier": ["s1", "s2", "s1", "s3", "s2"],
+            "product": ["p1", "p1", "p2", "p3", "p2"],
+            "country": ["FR", "DE", "FR", "IT", "DE"],
+            "volume": [10, 20, 30, 40, 50],
+        }
+    )
+    provision = tmp_path / "provision.csv"
+    pd.DataFrame(
+        {
+            "product": ["p1", "p4", "p2"],
+            "store": ["t1", "t1", "t2"],
+            "price": [1.5, 2.0, 3.25],
+        }
+    ).to_csv(provision, index=False)
+    return [
+        (
+            supplies,
+            {
+                "source_node_col": {"id": "supplier"},
+                "target_node_col": {"id": "product"},
+                "attributes_source_node_cols": "country",
+                "attributes_edges": "volume",
+                "property_types": "infer",
+            },
+        ),
+        (
+            str(provision),
+            {
+                "source_node_col": "product",
+                "target_node_col": "store",
+                "attributes_edges": "price",
+            },
+        ),
+    ]
+
+
+def sequential_build(jobs):
+    """One create_graph_from_df per table, merged in job order."""
+    G = nx.DiGraph()
+    for data, spec in jobs:
+        if not isinstance(data, pd.DataFrame):
+            data = pd.read_csv(data)
+        with contextlib.redirect_stdout(io.StringIO()):
+            H = create_graph_from_df(data, **spec)
+        for node, attrs in H.nodes(data=True):
+            if node not in G:
+                G.add_node(node, **attrs)
+        for source, target, attrs in H.edges(data=True):
+            G.add_edge(source, target, **attrs)
+    return G
+
+
+def export(G, name, data_dir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        filename = networkx_to_jsonl(G, name, data_dir=str(data_dir))
+    return (data_dir / filename).read_bytes()
+
+
+@pytest.mark.parametrize("n_workers,chunksize", [(1, None), (2, 2)])
+def test_matches_sequential_build(tmp_path, n_workers, chunksize):
+    jobs = make_jobs(tmp_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        graph = ingest_tables(jobs, n_workers=n_workers, chunksize=chunksize)
+
+    expected = export(sequential_build(jobs), "sequential", tmp_path)
+    assert export(graph, "ingested", tmp_path) == expected
+
+
+@pytest.mark.parametrize("chunksize", [None, 2])
+def test_inferred_types_printed_once(tmp_path, capsys, chunksize):
+    ingest_tables(make_jobs(tmp_path), n_workers=1, chunksize=chunksize)
+
+    assert capsys.readouterr().out.count("Inferred property types") == 1
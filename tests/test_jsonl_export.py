@@ -0,0 +1,98 @@
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from turingdb_examples.graph import (
+    create_graph_from_df,
+    dataframe_to_jsonl,
+    networkx_to_jsonl,
+)
+
+SPEC = dict(
+    source_node_col={"id": "src", "type": "kind"},
+    target_node_col="dst",
+    attributes_source_node_cols="age",
+    optional_nodes_cols={"City": {"id": "city", "link_to_source": True}},
+    attributes_edges="weight",
+)
+
+
+def small_frame():
+    # Rows grouped by source, in order of first appearance: dataframe_to_jsonl
+    # writes relationships in row order and NetworkX in adjacency order
+    return pd.DataFrame(
+        {
+            "src": ["a", "a", "b", "b", "c"],
+            "dst": ["b", "c", "c", "e", "d"],
+            "kind": ["Person", "Person", None, "Person", "Org"],
+            "age": [30, 30, np.nan, 41, None],
+            "city": ["Paris", None, "Lyon", None, "Paris"],
+            "weight": [1.5, np.nan, 2.0, None, 3.0],
+        }
+    )
+
+
+def read_jsonl(data_dir, export, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        filename = export(*args, data_dir=str(data_dir), **kwargs)
+    return (data_dir / filename).read_bytes()
+
+
+@pytest.mark.parametrize("source", ["frame", "csv"])
+def test_dataframe_export_matches_networkx_export(tmp_path, source):
+    df = small_frame()
+    data = df
+    if source == "csv":
+        data = str(tmp_path / "rows.csv")
+        df.to_csv(data, index=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        G = create_graph_from_df(df, **SPEC)
+
+    expected = read_jsonl(tmp_path, networkx_to_jsonl, G, "nx", node_type_key="type")
+    streamed = read_jsonl(
+        tmp_path,
+        dataframe_to_jsonl,
+        data,
+        "df",
+        node_type_key="type",
+        chunksize=2,
+        **SPEC,
+    )
+
+    assert streamed == expected
+
+
+def test_parallel_export_is_identical(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "src": rng.integers(0, 50, 200).astype(str),
+            "dst": rng.integers(25, 75, 200).astype(str),
+            "kind": rng.choice(["Person", "Org", None], 200),
+            "age": np.where(rng.random(200) < 0.2, np.nan, rng.integers(0, 90, 200)),
+            "city": rng.choice(["Paris", "Lyon", None], 200),
+            "weight": rng.normal(size=200),
+        }
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        G = create_graph_from_df(df, **SPEC)
+
+    sequential = read_jsonl(
+        tmp_path, networkx_to_jsonl, G, "seq", node_type_key="type", shard_size=16
+    )
+    parallel = read_jsonl(
+        tmp_path,
+        networkx_to_jsonl,
+        G,
+        "par",
+        node_type_key="type",
+        n_jobs=3,
+        shard_size=16,
+    )
+
+    # Shards are written back in order, records and IDs included
+    assert parallel == sequential
+    assert sequential.count(b"\n") == G.number_of_nodes() + G.number_of_edges()
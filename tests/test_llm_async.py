@@ -0,0 +1,148 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from turingdb_examples import llm
+
+openai = pytest.importorskip("openai")
+
+
+class ChatCompletionsHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible /v1/chat/completions answering "MATCH ... // <prompt>"."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["messages"][-1]["content"]
+        server = self.server
+        with server.lock:
+            server.arrivals.append(time.monotonic())
+            status = server.statuses.pop(0) if server.statuses else 200
+        if status != 200:
+            return self.reply(status, {"error": {"message": "stub", "type": "stub"}})
+
+        # Later questions are answered first, so completion order differs
+        time.sleep(server.delays.get(prompt, 0.0))
+        self.reply(
+            200,
+            {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {
+                            "role": "assistant",
+                            "content": f" MATCH (n) RETURN n // {prompt}\n",
+                        },
+                        "finish_reason": "stop",
+                    }
+                ],
+            },
+        )
+
+    def reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        # Keep the SDK from retrying on its own
+        self.send_header("x-should-retry", "false")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ChatCompletionsHandler)
+    server.lock = threading.Lock()
+    server.arrivals = []
+    server.statuses = []
+    server.delays = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    monkeypatch.setattr(llm, "_RATE_LIMITERS", {})
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def convert(questions, **kwargs):
+    kwargs.setdefault("use_cache", False)
+    return asyncio.run(
+        llm.abatch_natural_language_to_cypher(
+            questions, "Answer in Cypher", api_key="test", return_stats=True, **kwargs
+        )
+    )
+
+
+def test_results_follow_question_order(server):
+    questions = [f"question {i}" for i in range(8)]
+    server.delays = {q: 0.02 * (len(questions) - i) for i, q in enumerate(questions)}
+
+    results, stats = convert(questions, max_concurrency=8)
+
+    assert results == [f"MATCH (n) RETURN n // {q}" for q in questions]
+    assert stats["requests"] == 8
+    assert stats["retries"] == 0
+    assert all(latency is not None for latency in stats["latencies"])
+    assert stats["latency_p50"] <= stats["latency_p95"] <= stats["latency_max"]
+    assert stats["latency_max"] <= stats["wall_time"]
+
+
+def test_rate_limited_requests_are_retried(server):
+    server.statuses = [429, 429]
+
+    results, stats = convert(["a", "b", "c"], max_concurrency=1, backoff=0.01)
+
+    assert results == [f"MATCH (n) RETURN n // {q}" for q in "abc"]
+    assert stats["retries"] == 2
+    assert len(server.arrivals) == 5
+
+
+def test_retries_are_bounded(server):
+    server.statuses = [429] * 3
+
+    with pytest.raises(openai.RateLimitError):
+        convert(["a"], max_retries=2, backoff=0.01)
+    assert len(server.arrivals) == 3
+
+
+def test_other_errors_are_not_retried(server):
+    server.statuses = [500]
+
+    with pytest.raises(openai.InternalServerError):
+        convert(["a"], backoff=0.01)
+    assert len(server.arrivals) == 1
+
+
+def test_token_bucket_caps_the_request_rate(server):
+    # Burst of 5, then one request every 1/5 s
+    results, stats = convert([str(i) for i in range(10)], requests_per_second=5)
+
+    assert len(results) == 10
+    arrivals = sorted(server.arrivals)
+    assert arrivals[4] - arrivals[0] < 0.15
+    assert arrivals[-1] - arrivals[0] >= 0.9
+    assert stats["wall_time"] >= 0.9
+
+
+def test_cached_replies_skip_the_endpoint(server, tmp_path):
+    llm.configure_response_cache(str(tmp_path))
+    try:
+        first, _ = convert(["a", "b"], use_cache=None)
+        second, _ = convert(["a", "b"], use_cache=None)
+    finally:
+        llm.configure_response_cache()
+
+    assert first == second
+    assert len(server.arrivals) == 2
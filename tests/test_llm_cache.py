@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from turingdb_examples import llm
+
+
+@pytest.fixture
+def calls(monkeypatch, tmp_path):
+    llm.configure_response_cache(str(tmp_path))
+    calls = []
+
+    def fake_provider(prompt, system_prompt, provider, model, api_key, temperature):
+        calls.append(prompt)
+        return f"MATCH (n) RETURN n // {len(calls)}"
+
+    monkeypatch.setattr(llm, "_query_provider", fake_provider)
+    yield calls
+    llm.configure_response_cache()
+
+
+def test_caches_deterministic_replies_by_default(calls):
+    first = llm.query_llm("people", temperature=0.0)
+    assert llm.query_llm("people", temperature=0.0) == first
+    assert len(calls) == 1
+
+
+def test_sampled_replies_are_cached_only_on_request(calls):
+    llm.query_llm("people", temperature=0.7)
+    llm.query_llm("people", temperature=0.7)
+    assert len(calls) == 2
+
+    first = llm.query_llm("people", temperature=0.7, use_cache=True)
+    assert llm.query_llm("people", temperature=0.7, use_cache=True) == first
+    assert len(calls) == 3
+
+
+def test_use_cache_false_skips_the_cache(calls):
+    llm.query_llm("people", use_cache=False)
+    llm.query_llm("people", use_cache=False)
+    assert len(calls) == 2
+    assert llm.response_cache_stats()["writes"] == 0
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = llm._ResponseCache(str(tmp_path), max_age_days=1)
+    key = cache.key("OpenAI", "model", None, "people", 0.0)
+    cache.put(key, "MATCH (n) RETURN n")
+    assert cache.get(key) == "MATCH (n) RETURN n"
+
+    os.utime(cache._path(key), (0, 0))
+    assert cache.get(key) is None
+    assert not os.path.exists(cache._path(key))
+    assert cache.stats == {"hits": 1, "misses": 1, "writes": 1, "evictions": 1}
@@ -0,0 +1,162 @@
+import json
+import socket
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+
+import pytest
+
+from turingdb_examples.loader import load_chunks
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        server = self.server
+        with server.lock:
+            server.received.append(body)
+            fail = server.fail_next > 0
+            server.fail_next -= fail
+        self.send_response(500 if fail else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.lock = threading.Lock()
+    server.received = []
+    server.fail_next = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class HTTPClient:
+    """Minimal client posting each query to the stub server."""
+
+    def __init__(self, port):
+        self.url = f"http://127.0.0.1:{port}/query"
+        self.graph = None
+
+    def set_graph(self, graph_name):
+        self.graph = graph_name
+
+    def query(self, query):
+        request = urllib.request.Request(self.url, data=query.encode(), method="POST")
+        with urllib.request.urlopen(request, timeout=5) as response:
+            response.read()
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def chunks(n_nodes=6, n_edges=4):
+    return [("node", f"CREATE (:N {{id: {i}}})") for i in range(n_nodes)] + [
+        ("edge", f"MATCH (a {{id: {i}}}), (b {{id: {i + 1}}}) CREATE (a)-[:E]->(b)")
+        for i in range(n_edges)
+    ]
+
+
+def test_loads_every_chunk_once_nodes_first(server):
+    port = server.server_address[1]
+    stats = load_chunks(chunks(), lambda: HTTPClient(port), graph_name="g", n_workers=3)
+
+    assert stats["chunks"] == 10
+    assert stats["retries"] == 0
+    assert sorted(server.received) == sorted(query for _, query in chunks())
+    kinds = ["edge" if q.startswith("MATCH") else "node" for q in server.received]
+    assert kinds == ["node"] * 6 + ["edge"] * 4
+
+
+def test_server_error_is_not_retried(server):
+    port = server.server_address[1]
+    server.fail_next = 1
+
+    with pytest.raises(HTTPError):
+        load_chunks(chunks(1, 0), lambda: HTTPClient(port), backoff=0)
+
+    # The server received the chunk: sending it again could duplicate it
+    assert server.received == ["CREATE (:N {id: 0})"]
+
+
+def test_connection_refused_is_retried(server):
+    ports = iter([closed_port(), server.server_address[1]])
+
+    stats = load_chunks(chunks(1, 0), lambda: HTTPClient(next(ports)), backoff=0)
+
+    assert stats["retries"] == 1
+    assert server.received == ["CREATE (:N {id: 0})"]
+
+
+def test_retry_if_overrides_the_default(server):
+    port = server.server_address[1]
+    server.fail_next = 1
+
+    stats = load_chunks(
+        chunks(1, 0), lambda: HTTPClient(port), backoff=0, retry_if=lambda exc: True
+    )
+
+    assert stats["retries"] == 1
+    assert len(server.received) == 2
+
+
+def test_resumes_from_checkpoint(server, tmp_path):
+    port = server.server_address[1]
+    checkpoint = str(tmp_path / "checkpoint.json")
+    server.fail_next = 1
+
+    with pytest.raises(HTTPError):
+        load_chunks(
+            chunks(),
+            lambda: HTTPClient(port),
+            n_workers=1,
+            max_in_flight=1,
+            checkpoint_path=checkpoint,
+        )
+    with open(checkpoint, encoding="utf-8") as f:
+        assert json.load(f)["done"] == []
+
+    server.received.clear()
+    load_chunks(chunks(), lambda: HTTPClient(port), checkpoint_path=checkpoint)
+    stats = load_chunks(chunks(), lambda: HTTPClient(port), checkpoint_path=checkpoint)
+
+    assert len(server.received) == 10
+    assert stats["skipped"] == 10
+
+
+def test_checkpoint_saved_as_chunks_load(server, tmp_path):
+    port = server.server_address[1]
+    checkpoint = str(tmp_path / "checkpoint.json")
+    seen = []
+
+    class CheckpointReader(HTTPClient):
+        # Reads the checkpoint before sending each chunk
+        def query(self, query):
+            try:
+                with open(checkpoint, encoding="utf-8") as f:
+                    seen.append(json.load(f)["done"])
+            except FileNotFoundError:
+                seen.append(None)
+            super().query(query)
+
+    load_chunks(
+        chunks(3, 0),
+        lambda: CheckpointReader(port),
+        n_workers=1,
+        max_in_flight=1,
+        checkpoint_path=checkpoint,
+        report_every=None,
+    )
+
+    assert seen == [None, [0], [0, 1]]
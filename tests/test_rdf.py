@@ -0,0 +1,105 @@
+import json
+import sys
+import types
+
+import pytest
+
+from turingdb_examples.rdf import rdf_to_jsonl
+
+EX = "http://example.org/wine#"
+OWL = "http://www.w3.org/2002/07/owl#"
+RDF = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+RDFS = "http://www.w3.org/2000/01/rdf-schema#"
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+TRIPLES = f"""\
+<{EX}Wine> <{RDF}type> <{OWL}Class> .
+<{EX}RedWine> <{RDF}type> <{OWL}Class> .
+<{EX}RedWine> <{RDFS}subClassOf> <{EX}Wine> .
+<{EX}RedWine> <{RDFS}label> "Red wine"@en .
+<{EX}Margaux> <{RDF}type> <{EX}RedWine> .
+<{EX}Margaux> <{EX}name> "Chateau Margaux" .
+<{EX}Margaux> <{EX}id> "M-1" .
+<{EX}Margaux> <{EX}vintage> "1990"^^<{XSD}integer> .
+<{EX}hasMaker> <{RDFS}domain> <{EX}Wine> .
+"""
+
+
+def convert(tmp_path, **kwargs):
+    path = tmp_path / "wine.nt"
+    path.write_text(TRIPLES, encoding="utf-8")
+    filename = rdf_to_jsonl(path, "wine", data_dir=str(tmp_path), **kwargs)
+    with open(tmp_path / filename, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    nodes = {r["properties"]["name"]: r for r in records if r["type"] == "node"}
+    names = {r["id"]: name for name, r in nodes.items()}
+    edges = [
+        (names[r["start"]["id"]], r["label"], names[r["end"]["id"]])
+        for r in records
+        if r["type"] == "relationship"
+    ]
+    return nodes, edges
+
+
+def test_maps_types_to_labels_and_uris_to_relationships(tmp_path):
+    nodes, edges = convert(tmp_path)
+
+    assert nodes["RedWine"]["labels"] == ["Class"]
+    assert nodes["RedWine"]["properties"]["rdfs_label"] == "Red wine"
+    assert nodes["Margaux"]["labels"] == ["RedWine"]
+    assert "Class" not in nodes
+    assert sorted(edges) == [
+        ("RedWine", "subClassOf", "Wine"),
+        ("hasMaker", "hasDomain", "Wine"),
+    ]
+
+
+def test_literals_do_not_replace_core_keys(tmp_path):
+    nodes, _ = convert(tmp_path)
+
+    properties = nodes["Margaux"]["properties"]
+    assert properties["id"] == properties["uri"] == EX + "Margaux"
+    assert properties["name"] == "Margaux"
+    assert properties["name_literal"] == "Chateau Margaux"
+    assert properties["id_literal"] == "M-1"
+    assert properties["vintage"] == 1990
+
+
+class OwlReadyError(Exception):
+    pass
+
+
+def fake_owlready2(monkeypatch, error):
+    """owlready2 whose ontologies fail to load with error."""
+
+    class World:
+        def get_ontology(self, iri):
+            return self
+
+        def load(self):
+            raise error
+
+    module = types.ModuleType("owlready2")
+    module.OwlReadyError = OwlReadyError
+    module.World = World
+    module.sync_reasoner_pellet = module.sync_reasoner_hermit = None
+    monkeypatch.setitem(sys.modules, "owlready2", module)
+
+
+@pytest.mark.parametrize(
+    "error", [OwlReadyError("inconsistent"), FileNotFoundError("java")]
+)
+def test_failed_reasoner_is_skipped(tmp_path, monkeypatch, error):
+    fake_owlready2(monkeypatch, error)
+
+    nodes, edges = convert(tmp_path, reasoner="pellet")
+
+    assert nodes["Margaux"]["labels"] == ["RedWine"]
+    assert len(edges) == 2
+
+
+def test_reasoner_bugs_are_raised(tmp_path, monkeypatch):
+    fake_owlready2(monkeypatch, TypeError("bug"))
+
+    with pytest.raises(TypeError):
+        convert(tmp_path, reasoner="pellet")
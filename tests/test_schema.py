@@ -0,0 +1,58 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from turingdb_examples.graph import dataframe_to_jsonl
+from turingdb_examples.schema import coerce_column, infer_schema
+
+
+def test_infer_schema_from_strings():
+    df = pd.DataFrame(
+        {
+            "count": ["1", "2", ""],
+            "price": ["1.5", "2", None],
+            "flag": ["true", "False", "true"],
+            "code": ["007", "012", "100"],
+            "day": ["2024-01-31", "2024-02-01", "nan"],
+            "when": ["2024-01-31T10:00", "2024-01-31 11:30:05", None],
+        }
+    )
+
+    assert infer_schema(df) == {
+        "count": "int",
+        "price": "float",
+        "flag": "bool",
+        "code": "string",
+        "day": "date",
+        "when": "datetime",
+    }
+
+
+def test_int_coercion_keeps_fractional_floats():
+    assert coerce_column(pd.Series([1.0, 2.0]), "int").tolist() == [1, 2]
+    assert coerce_column(pd.Series([1.0, np.nan]), "int").dtype == "Int64"
+
+    mixed = coerce_column(pd.Series([1.5, 2.0, np.nan]), "int")
+    assert mixed.tolist() == [1.5, 2, None]
+    assert type(mixed[1]) is int
+
+
+def test_chunks_use_the_types_of_the_first_one(tmp_path):
+    chunks = [
+        pd.DataFrame({"source": ["a", "b"], "score": [1.0, 2.0]}),
+        pd.DataFrame({"source": ["c", "d"], "score": [2.5, 3.0]}),
+    ]
+
+    filename = dataframe_to_jsonl(
+        chunks,
+        "scores",
+        attributes_source_node_cols=["score"],
+        data_dir=str(tmp_path),
+        property_types="infer",
+    )
+
+    with open(tmp_path / filename, encoding="utf-8") as f:
+        scores = [json.loads(line)["properties"]["score"] for line in f]
+    # Inferred as int on the first chunk; 2.5 is kept rather than truncated
+    assert scores == [1, 2, 2.5, 3]
@@ -0,0 +1,165 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from turingdb_examples import tracing
+from turingdb_examples.tracing import count, span, traced
+
+
+def by_name(trace):
+    records = {}
+    for record in trace.records():
+        records.setdefault(record["name"], []).append(record)
+    return records
+
+
+def test_spans_nest():
+    with tracing.tracing() as trace:
+        with span("outer"):
+            with span("inner"):
+                pass
+            with span("inner"):
+                pass
+
+    records = by_name(trace)
+    outer = records["outer"][0]
+    assert outer["parent_id"] is None
+    assert [r["parent_id"] for r in records["inner"]] == [outer["id"]] * 2
+    for inner in records["inner"]:
+        assert outer["start"] <= inner["start"]
+        assert inner["start"] + inner["duration"] <= outer["start"] + outer["duration"]
+
+
+def test_threads_nest_separately():
+    barrier = threading.Barrier(2)
+
+    def work(name):
+        with span(name):
+            # Both threads have their span open at once
+            barrier.wait(timeout=5)
+            with span(name + ".inner"):
+                pass
+
+    with tracing.tracing() as trace:
+        with span("main"):
+            threads = [threading.Thread(target=work, args=(n,)) for n in "ab"]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+    records = {name: spans[0] for name, spans in by_name(trace).items()}
+    # A thread starts with no open span, whatever the thread that started it has
+    assert records["a"]["parent_id"] is None
+    assert records["b"]["parent_id"] is None
+    assert records["a.inner"]["parent_id"] == records["a"]["id"]
+    assert records["b.inner"]["parent_id"] == records["b"]["id"]
+    assert records["a"]["thread_id"] != records["b"]["thread_id"]
+    assert records["a"]["thread_id"] != records["main"]["thread_id"]
+
+
+def test_asyncio_tasks_nest_under_their_creator():
+    async def task(name):
+        with span(name):
+            # Both tasks have their span open at once
+            await asyncio.sleep(0.01)
+            with span(name + ".inner"):
+                await asyncio.sleep(0)
+
+    async def main():
+        with span("main"):
+            await asyncio.gather(task("a"), task("b"))
+
+    with tracing.tracing() as trace:
+        asyncio.run(main())
+
+    records = {name: spans[0] for name, spans in by_name(trace).items()}
+    assert records["a"]["parent_id"] == records["main"]["id"]
+    assert records["b"]["parent_id"] == records["main"]["id"]
+    assert records["a.inner"]["parent_id"] == records["a"]["id"]
+    assert records["b.inner"]["parent_id"] == records["b"]["id"]
+
+
+def test_counters_aggregate_by_name():
+    @traced("step")
+    def step(rows):
+        count("rows", rows)
+        count("hits")
+
+    with tracing.tracing() as trace:
+        with span("load", bytes=100) as load:
+            for rows in (1, 2, 3):
+                step(rows)
+            load.add("bytes", 20)
+        with pytest.raises(KeyError):
+            with span("load"):
+                raise KeyError("x")
+
+    summary = trace.summary().set_index("name")
+    assert summary.loc["step", "calls"] == 3
+    assert summary.loc["step", "rows"] == 6
+    assert summary.loc["step", "hits"] == 3
+    assert summary.loc["load", "calls"] == 2
+    assert summary.loc["load", "bytes"] == 120
+    # String counters such as the error name are not summed
+    assert "error" not in summary.columns
+    assert [r["counters"].get("error") for r in by_name(trace)["load"]] == [
+        None,
+        "KeyError",
+    ]
+    load_total = summary.loc["load", "total_s"]
+    assert summary.loc["load", "self_s"] == pytest.approx(
+        load_total - summary.loc["step", "total_s"]
+    )
+
+
+def test_chrome_trace_events(tmp_path):
+    with tracing.tracing() as trace:
+        with span("outer", rows=3):
+            with span("inner"):
+                pass
+
+    path = trace.to_chrome_trace(str(tmp_path / "trace.json"))
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+
+    assert document["displayTimeUnit"] == "ms"
+    events = document["traceEvents"]
+    assert [event["name"] for event in events] == ["outer", "inner"]
+    for event in events:
+        assert set(event) == {"name", "cat", "ph", "ts", "dur", "pid", "tid", "args"}
+        assert event["cat"] == "turingdb_examples"
+        assert event["ph"] == "X"
+        assert event["ts"] >= 0 and event["dur"] >= 0
+        assert event["tid"] == threading.get_ident()
+    outer, inner = events
+    assert outer["args"] == {"rows": 3}
+    # Microseconds, the inner event within the outer one
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert json.loads(trace.to_chrome_trace()) == document
+
+
+def test_no_op_when_tracing_is_off():
+    @traced()
+    def double(x):
+        count("hits")
+        return 2 * x
+
+    assert not tracing.is_tracing()
+    with span("phase", rows=1) as phase:
+        phase.add("rows")
+        assert double(2) == 4
+    assert phase is span("other")
+
+    trace = tracing.start_tracing()
+    try:
+        assert tracing.is_tracing()
+        assert double(3) == 6
+    finally:
+        assert tracing.stop_tracing() is trace
+    assert not tracing.is_tracing()
+    assert double(4) == 8
+    assert [r["name"] for r in trace.records()] == [double.__qualname__]